@@ -1,12 +1,31 @@
-from flask import Flask, jsonify, request
+import os
+import time
+import click
+from flask import Flask, Response, g, jsonify, request
 from flask_cors import CORS
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from config import Config
 from database.mongo import mongo
+from database.indexes import bootstrap_indexes, ensure_indexes, check_query_plans, IndexPlanError
+from models.authority_model import AuthorityModel, authority_profile_cache
+from models.report_event_model import ReportEventModel
+from models.hotspot_model import HotspotModel
+from models.report_model import ReportModel
 from routes.authority_routes import authority_bp
 from routes.user_routes import auth_bp
 from routes.report_routes import report_bp
+from routes.analytics_routes import analytics_bp
+from services.weather_service import weather_cache
+from services.notification_dispatcher import dispatcher
+from services.prediction_refresh import refresher, refresh_active_predictions
+from services.detection_cache import detection_cache
+from services.report_pipeline import add_stage_listener
+from services.realtime import start_feed
+from utils.metrics import REQUEST_LATENCY, observe_stage
+from utils.uploads import SpooledUploadRequest, invalid_upload_fields
+from utils.ops_token import ops_token_required
 
 bcrypt = Bcrypt()
 jwt = JWTManager()
@@ -15,12 +34,105 @@ def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    # Large file parts are spooled to disk (UPLOAD_SPOOL_DIR) rather than held in memory
+    app.request_class = SpooledUploadRequest
+    os.makedirs(Config.UPLOAD_SPOOL_DIR, exist_ok=True)
+
     # Initialize extensions
     CORS(app)
     bcrypt.init_app(app)
     jwt.init_app(app)
     mongo.init_app(app)
 
+    # Create declared MongoDB indexes and report drift
+    if app.config.get("MONGO_ENSURE_INDEXES"):
+        with app.app_context():
+            # each step on its own so one failing backfill can't skip index creation
+            for step in (AuthorityModel.backfill_locations, ReportModel.backfill_geo):
+                try:
+                    step()
+                except Exception as e:
+                    print(f"⚠️ {step.__qualname__} failed:", e)
+            try:
+                bootstrap_indexes(mongo.db)
+            except Exception as e:
+                print("⚠️ Index bootstrap failed:", e)
+
+    # Live report feed: change streams when available, else in-process pub/sub
+    with app.app_context():
+        try:
+            print("🔹 Live report feed source:", start_feed())
+        except Exception as e:
+            print("⚠️ Live report feed setup failed:", e)
+
+    # Background sender for the notification outbox
+    if app.config.get("NOTIFY_DISPATCHER_ENABLED"):
+        dispatcher.start()
+
+    # Periodic refresh of predicted paths for open reports
+    if app.config.get("PREDICTION_REFRESH_ENABLED"):
+        refresher.start()
+
+    # `flask --app app migrate-history`: one-off move of embedded report history into report_events
+    @app.cli.command("migrate-history")
+    def migrate_history_command():
+        click.echo(f"{ReportEventModel.backfill_from_reports()} reports migrated")
+
+    # `flask --app app refresh-predictions`: one refresh pass now, ignoring the lease
+    @app.cli.command("refresh-predictions")
+    def refresh_predictions_command():
+        click.echo(refresh_active_predictions())
+
+    # `flask --app app rebuild-hotspots`: build (first deploy) or recount the hotspot rollups from reports
+    @app.cli.command("rebuild-hotspots")
+    def rebuild_hotspots_command():
+        click.echo(f"{HotspotModel.rebuild_from_reports()} rollups rebuilt")
+
+    # `flask --app app check-indexes`: create indexes, then fail on any COLLSCAN
+    @app.cli.command("check-indexes")
+    def check_indexes_command():
+        report = ensure_indexes(mongo.db)
+        for key, value in report.items():
+            click.echo(f"{key}: {value}")
+        try:
+            plans = check_query_plans(mongo.db)
+        except IndexPlanError as e:
+            click.echo(f"❌ {e}", err=True)
+            raise SystemExit(1)
+        for name, stages in plans.items():
+            click.echo(f"✅ {name}: {' <- '.join(stages)}")
+
+    # 📈 Request and pipeline-stage timings for Prometheus
+    add_stage_listener(observe_stage)
+
+    @app.before_request
+    def start_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def record_latency(response):
+        start = g.pop("request_start", None)
+        if start is not None:
+            # route template, not the raw path, keeps label cardinality bounded
+            endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+            REQUEST_LATENCY.labels(request.method, endpoint, response.status_code).observe(time.perf_counter() - start)
+        return response
+
+    # Reject oversized bodies from Content-Length alone, before anything is read
+    @app.before_request
+    def limit_upload_size():
+        if request.endpoint == "report_bp.bulk_create_reports":
+            request.max_content_length = Config.BULK_MAX_CONTENT_LENGTH
+        limit = request.max_content_length
+        if limit and request.content_length and request.content_length > limit:
+            return jsonify({"error": f"Upload too large (limit {limit // (1024 * 1024)} MB)"}), 413
+
+    @app.errorhandler(413)
+    def upload_too_large(e):
+        # bodies without Content-Length are cut off while streaming
+        limit = request.max_content_length
+        return jsonify({"error": f"Upload too large (limit {limit // (1024 * 1024)} MB)" if limit else "Upload too large"}), 413
+
     # Middleware for parsing request data
     @app.before_request
     def parse_data():
@@ -30,6 +142,10 @@ def create_app():
                 request.data_dict = request.get_json()
             elif request.content_type and 'multipart/form-data' in request.content_type:
                 # ✅ Form-data (for image uploads or file + text)
+                # reject non-image files by their leading bytes, before any decoding
+                invalid = invalid_upload_fields(request.files)
+                if invalid:
+                    return jsonify({"error": f"Unsupported file type for: {', '.join(invalid)}"}), 415
                 form_data = request.form.to_dict()
                 file_data = {key: file for key, file in request.files.items()}
                 form_data.update(file_data)
@@ -45,6 +161,7 @@ def create_app():
     app.register_blueprint(auth_bp, url_prefix="/api/user")
     app.register_blueprint(authority_bp, url_prefix="/api/authority")
     app.register_blueprint(report_bp, url_prefix="/api/report")
+    app.register_blueprint(analytics_bp, url_prefix="/api/analytics")
 
 
 
@@ -52,6 +169,22 @@ def create_app():
     def home():
         return jsonify({"message": "OceanGuard backend running..."})
 
+    # Cache hit/miss counters (internal: OPS_API_TOKEN)
+    @app.route('/api/cache/stats')
+    @ops_token_required
+    def cache_stats():
+        return jsonify({"caches": [
+            weather_cache.stats(),
+            authority_profile_cache.stats(),
+            detection_cache.stats(),
+        ]})
+
+    # Prometheus scrape endpoint (internal: OPS_API_TOKEN)
+    @app.route('/metrics')
+    @ops_token_required
+    def metrics():
+        return Response(generate_latest(), mimetype=CONTENT_TYPE_LATEST)
+
     return app
 
 if __name__ == "__main__":
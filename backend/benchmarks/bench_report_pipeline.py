@@ -0,0 +1,384 @@
+"""
+End-to-end benchmark for POST /api/report/create.
+
+Drives the real Flask app from create_app() with local stand-ins:
+  * Open-Meteo  - a local HTTP server returning canned hourly data
+  * Cloudinary  - cloudinary.uploader.upload replaced by a fixed-latency fake
+  * MongoDB     - a local mongod (--mongo-uri, database name must contain "bench")
+                  or mongomock (--mongo mock; $geoNear is emulated in Python).
+                  mongomock is not an app dependency: pip install -r requirements-dev.txt
+Detection uses the real models (--image <photo with a detectable slick>) or a
+fixed-latency stub (--detector stub).
+
+Per-stage timings come from the report pipeline's stage listeners. Results for
+each concurrency level are written as JSON. The run exits non-zero if any
+request fails; --baseline compares against an earlier run and also exits
+non-zero on a higher error rate or a p95 regression.
+
+    cd backend
+    python -m benchmarks.bench_report_pipeline --image spill.jpg --output bench.json
+    python -m benchmarks.bench_report_pipeline --detector stub --mongo mock
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+import types
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+STAGE_ORDER = ["detection", "upload", "weather", "prediction", "authorities", "insert", "notify"]
+
+
+# ---------------------------------------------------------------------
+# Stand-ins
+# ---------------------------------------------------------------------
+class OpenMeteoHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        query = parse_qs(urlparse(self.path).query)
+        start = datetime.strptime(query["start_hour"][0], "%Y-%m-%dT%H:%M")
+        end = datetime.strptime(query["end_hour"][0], "%Y-%m-%dT%H:%M")
+        hours = int((end - start).total_seconds() // 3600) + 1
+        hourly = {"time": [(start + timedelta(hours=i)).strftime("%Y-%m-%dT%H:00") for i in range(hours)]}
+        for field in query["hourly"][0].split(","):
+            base = 180.0 if "direction" in field else 4.0
+            hourly[field] = [base + random.uniform(-10, 10) if "direction" in field else base * random.uniform(0.5, 1.5)
+                             for _ in range(hours)]
+        body = json.dumps({"hourly": hourly}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_open_meteo_standin(latency_ms):
+    OpenMeteoHandler.latency = latency_ms / 1000.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OpenMeteoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def install_cloudinary_standin(latency_ms):
+    import cloudinary.uploader
+
+    def fake_upload(file_obj, **kwargs):
+        file_obj.read()
+        time.sleep(latency_ms / 1000.0)
+        return {"secure_url": f"https://res.cloudinary.invalid/bench/{random.getrandbits(64):x}.jpg"}
+
+    cloudinary.uploader.upload = fake_upload
+
+
+def install_stub_detector(latency_ms):
+    """Replace services.detection_service before anything imports the real models."""
+    stub = types.ModuleType("services.detection_service")
+
+    def decode_image(image_file):
+        return image_file if isinstance(image_file, (bytes, bytearray)) else image_file.read()
+
+    def detect_images(images):
+        time.sleep(latency_ms / 1000.0)
+        return [(bytes(img[:1024]), "oil_spill", {"oil": 0.9, "debris": 0.0}) for img in images]
+
+    stub.decode_image = decode_image
+    stub.detect_images = detect_images
+    stub.run_detection = lambda image_file: detect_images([decode_image(image_file)])[0]
+    sys.modules["services.detection_service"] = stub
+
+
+def _accept_pymongo_bulk_kwargs(mongomock):
+    """
+    pymongo >= 4.11 passes sort= when UpdateOne/ReplaceOne add themselves to a bulk,
+    which mongomock's BulkOperationBuilder does not accept (the rollups use bulk_write).
+    Drop it while unset, as the app never sorts bulk updates.
+    """
+    builder = mongomock.collection.BulkOperationBuilder
+
+    def drop_unset_sort(method):
+        def wrapper(self, *args, sort=None, **kwargs):
+            if sort is not None:
+                raise NotImplementedError("mongomock bulk updates cannot sort")
+            return method(self, *args, **kwargs)
+        return wrapper
+
+    for name in ("add_update", "add_replace"):
+        method = getattr(builder, name)
+        if not getattr(method, "_drops_sort", False):
+            wrapper = drop_unset_sort(method)
+            wrapper._drops_sort = True
+            setattr(builder, name, wrapper)
+
+
+def install_mongomock(mongo):
+    try:
+        import mongomock
+    except ImportError:
+        raise SystemExit("--mongo mock needs mongomock: pip install -r requirements-dev.txt")
+    from models.authority_model import AuthorityModel, haversine_km
+
+    _accept_pymongo_bulk_kwargs(mongomock)
+    mongo.cx = mongomock.MongoClient()
+    mongo.db = mongo.cx["oceanguard_bench"]
+
+    # mongomock has no $geoNear; emulate it with a scan
+    def nearby(lat, lng, radius_km=10):
+        found = []
+        for a in AuthorityModel.get_collection().find({"is_available": True}, {"password": 0}):
+            dist = haversine_km(lat, lng, a["area"]["lat"], a["area"]["lng"])
+            if dist <= radius_km:
+                a["_distance_km"] = dist
+                found.append(a)
+        return sorted(found, key=lambda a: a["_distance_km"])
+
+    AuthorityModel.get_nearby_authorities = staticmethod(nearby)
+
+
+# ---------------------------------------------------------------------
+# Stats
+# ---------------------------------------------------------------------
+def summarize(samples_seconds):
+    values = sorted(v * 1000.0 for v in samples_seconds)
+    if not values:
+        return {"count": 0}
+
+    def pct(p):
+        return values[min(len(values) - 1, max(0, int(round(p / 100.0 * len(values) + 0.5)) - 1))]
+
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p50": pct(50),
+        "p95": pct(95),
+        "p99": pct(99),
+        "max": values[-1],
+    }
+
+
+def error_rate(level):
+    return level["errors"] / level["requests"] if level.get("requests") else 0.0
+
+
+def compare_to_baseline(results, baseline, max_regression):
+    """
+    Return human-readable regressions: a higher error rate than the baseline, or
+    p95 growth beyond max_regression (fraction). Failing requests are often fast,
+    so latency alone can make a broken run look like an improvement.
+    """
+    regressions = []
+    base_levels = {lvl["concurrency"]: lvl for lvl in baseline.get("levels", [])}
+    for lvl in results["levels"]:
+        base = base_levels.get(lvl["concurrency"])
+        if not base:
+            continue
+        if error_rate(lvl) > error_rate(base):
+            regressions.append(
+                f"c={lvl['concurrency']} errors: {error_rate(base):.1%} -> {error_rate(lvl):.1%}"
+            )
+        pairs = [("request", lvl["latency_ms"], base["latency_ms"])]
+        pairs += [(s, lvl["stages_ms"].get(s, {}), base["stages_ms"].get(s, {})) for s in STAGE_ORDER]
+        for name, cur, old in pairs:
+            if cur.get("p95") and old.get("p95") and cur["p95"] > old["p95"] * (1 + max_regression):
+                regressions.append(f"c={lvl['concurrency']} {name}: p95 {old['p95']:.1f}ms -> {cur['p95']:.1f}ms")
+    return regressions
+
+
+# ---------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the report creation pipeline")
+    parser.add_argument("--image", help="image with a detectable oil spill (required for --detector real)")
+    parser.add_argument("--detector", choices=["real", "stub"], default="real")
+    parser.add_argument("--stub-detect-ms", type=float, default=150.0)
+    parser.add_argument("--mongo", choices=["uri", "mock"], default="uri")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017/oceanguard_bench")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated client counts")
+    parser.add_argument("--requests", type=int, default=64, help="requests per concurrency level")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--weather-latency-ms", type=float, default=80.0)
+    parser.add_argument("--upload-latency-ms", type=float, default=120.0)
+    parser.add_argument("--authorities", type=int, default=200)
+    parser.add_argument("--lat", type=float, default=19.0)
+    parser.add_argument("--lng", type=float, default=72.8)
+    parser.add_argument("--spread-deg", type=float, default=0.5, help="report locations are drawn from this box")
+    parser.add_argument("--allow-cache-hits", action="store_true",
+                        help="re-send identical bytes (otherwise every upload is made unique)")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed p95 growth vs baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.detector == "real" and not args.image:
+        sys.exit("--image is required with --detector real")
+    if args.mongo == "uri" and "bench" not in urlparse(args.mongo_uri).path:
+        sys.exit("refusing to use a Mongo database whose name does not contain 'bench'")
+
+    # Stand-ins must be in place before config/services are imported
+    server, base_url = start_open_meteo_standin(args.weather_latency_ms)
+    os.environ["OPEN_METEO_URL"] = f"{base_url}/v1/forecast"
+    os.environ["OPEN_METEO_MARINE_URL"] = f"{base_url}/v1/marine"
+    os.environ["NOTIFY_DISPATCHER_ENABLED"] = "false"
+    os.environ["REPORT_ASYNC_INGESTION"] = "false"
+    os.environ["MONGO_ENSURE_INDEXES"] = "true" if args.mongo == "uri" else "false"
+    if args.mongo == "uri":
+        os.environ["MONGO_URI"] = args.mongo_uri
+    if args.detector == "stub":
+        install_stub_detector(args.stub_detect_ms)
+    install_cloudinary_standin(args.upload_latency_ms)
+
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from database.mongo import mongo
+    from models.authority_model import AuthorityModel
+    from models.user_model import UserModel
+    from services.detection_cache import detection_cache
+    from services.report_pipeline import add_stage_listener
+    from services.weather_service import weather_cache
+
+    if args.mongo == "uri":
+        # start clean, then let create_app() provision indexes
+        from pymongo import MongoClient
+        client = MongoClient(args.mongo_uri)
+        client.drop_database(client.get_default_database().name)
+
+    app = create_app()
+    if args.mongo == "mock":
+        install_mongomock(mongo)
+
+    rng = random.Random(42)
+    with app.app_context():
+        user_id = UserModel.create_user("Bench User", f"bench-{time.time_ns()}@example.com", "bench")
+        for i in range(args.authorities):
+            AuthorityModel.create_authority(
+                f"Station {i}", f"station-{i}-{time.time_ns()}@example.com", "bench", f"Station {i}",
+                args.lat + rng.uniform(-args.spread_deg, args.spread_deg),
+                args.lng + rng.uniform(-args.spread_deg, args.spread_deg),
+            )
+        token = create_access_token(identity=str(user_id), additional_claims={"role": "user"})
+
+    if args.image:
+        with open(args.image, "rb") as f:
+            image_bytes = f.read()
+    else:
+        # JPEG magic bytes so the upload type check passes; the stub detector never decodes it
+        image_bytes = b"\xff\xd8\xff\xe0" + os.urandom(64 * 1024)
+
+    samples = defaultdict(list)
+    samples_lock = threading.Lock()
+
+    def on_stage(stage, state, elapsed):
+        if elapsed is not None:
+            with samples_lock:
+                samples[stage].append(elapsed)
+
+    add_stage_listener(on_stage)
+    local = threading.local()
+
+    def one_request():
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+        payload = image_bytes if args.allow_cache_hits else image_bytes + os.urandom(16)
+        data = {
+            "image": (io.BytesIO(payload), "bench.jpg"),
+            "lat": str(args.lat + random.uniform(-args.spread_deg, args.spread_deg)),
+            "lng": str(args.lng + random.uniform(-args.spread_deg, args.spread_deg)),
+        }
+        start = time.perf_counter()
+        resp = local.client.post(
+            "/api/report/create", data=data, content_type="multipart/form-data",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        return resp.status_code, time.perf_counter() - start
+
+    for _ in range(args.warmup):
+        one_request()
+
+    levels = []
+    for concurrency in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+        weather_cache.clear()
+        detection_cache.results.clear()
+        with samples_lock:
+            samples.clear()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(lambda _: one_request(), range(args.requests)))
+        wall = time.perf_counter() - started
+
+        status_counts = defaultdict(int)
+        for status, _ in outcomes:
+            status_counts[str(status)] += 1
+        with samples_lock:
+            stages = {s: summarize(samples[s]) for s in STAGE_ORDER if samples.get(s)}
+
+        level = {
+            "concurrency": concurrency,
+            "requests": len(outcomes),
+            "errors": sum(1 for status, _ in outcomes if status >= 400),
+            "status_counts": dict(status_counts),
+            "wall_seconds": wall,
+            "throughput_rps": len(outcomes) / wall if wall else None,
+            "latency_ms": summarize([latency for _, latency in outcomes]),
+            "stages_ms": stages,
+        }
+        levels.append(level)
+        print(f"c={concurrency:<3} {level['throughput_rps']:.2f} req/s  "
+              f"p50={level['latency_ms']['p50']:.1f}ms p95={level['latency_ms']['p95']:.1f}ms  "
+              f"errors={level['errors']}")
+        for s, st in stages.items():
+            print(f"    {s:<12} p50={st['p50']:.1f}ms p95={st['p95']:.1f}ms")
+
+    results = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "detector": args.detector,
+            "mongo": args.mongo,
+            "weather_latency_ms": args.weather_latency_ms,
+            "upload_latency_ms": args.upload_latency_ms,
+            "authorities": args.authorities,
+            "requests_per_level": args.requests,
+            "unique_uploads": not args.allow_cache_hits,
+        },
+        "levels": levels,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+    server.shutdown()
+
+    failed_levels = [lvl for lvl in levels if lvl["errors"]]
+    for lvl in failed_levels:
+        print(f"❌ c={lvl['concurrency']}: {lvl['errors']}/{lvl['requests']} requests failed "
+              f"(status counts {lvl['status_counts']})")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(results, json.load(f), args.max_regression)
+        if regressions:
+            print("❌ Regressions against baseline:")
+            for line in regressions:
+                print("   ", line)
+            return 1
+        print("✅ No regressions against baseline")
+    return 1 if failed_levels else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
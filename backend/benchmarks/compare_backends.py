@@ -0,0 +1,158 @@
+"""
+Accuracy / latency comparison of the detection inference backends.
+
+Runs every requested variant of a model (native, ONNX Runtime, OpenVINO, each
+optionally int8) over a directory of sample images, measures single-image
+latency and batched throughput, and compares confidences with the native
+backend. The fastest variant whose confidences stay within --tolerance of the
+native ones (and that makes the same detect / no-detect decision on every
+image) is recommended.
+
+    cd backend
+    python -m services.model_export --model oil --backend all --int8 --calibration-dir samples/
+    python -m benchmarks.compare_backends --model oil --images samples/ --output backends.json
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import cv2
+
+from config import Config
+from services.model_registry import NATIVE_BACKENDS, load_debris_model, load_oil_model
+from benchmarks.bench_report_pipeline import summarize
+
+LOADERS = {"oil": load_oil_model, "debris": load_debris_model}
+THRESHOLDS = {"oil": Config.OIL_CONFIDENCE_THRESHOLD, "debris": Config.DEBRIS_CONFIDENCE_THRESHOLD}
+IMAGE_PATTERNS = ("*.jpg", "*.jpeg", "*.png", "*.bmp", "*.webp")
+
+
+def parse_variant(variant):
+    """'openvino-int8' -> ('openvino', True)"""
+    backend, _, suffix = variant.partition("-")
+    return backend, suffix == "int8"
+
+
+def scores_of(model_name, outputs):
+    """One confidence per image: best oil box, or debris probability."""
+    if model_name == "oil":
+        return [max(o["confidences"], default=0.0) for o in outputs]
+    return [float(o) for o in outputs]
+
+
+def load_images(directory, limit):
+    paths = sorted(p for pattern in IMAGE_PATTERNS for p in glob.glob(os.path.join(directory, pattern)))
+    images = []
+    for path in paths[:limit]:
+        image = cv2.imread(path)
+        if image is not None:
+            images.append((os.path.basename(path), image))
+    return images
+
+
+def run_variant(model_name, variant, images, batch_size, repeat, threads):
+    backend, int8 = parse_variant(variant)
+    model = LOADERS[model_name](backend=backend, int8=int8, threads=threads)
+    pixels = [img for _, img in images]
+
+    model.predict_batch(pixels[:1])  # warm-up (graph compilation, allocator)
+
+    single = []
+    scores = None
+    for _ in range(repeat):
+        run_scores = []
+        for img in pixels:
+            start = time.perf_counter()
+            out = model.predict_batch([img])
+            single.append(time.perf_counter() - start)
+            run_scores.extend(scores_of(model_name, out))
+        scores = run_scores
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for i in range(0, len(pixels), batch_size):
+            model.predict_batch(pixels[i:i + batch_size])
+    batched_wall = time.perf_counter() - start
+
+    return {
+        "variant": variant,
+        "single_image_ms": summarize(single),
+        "batch_size": batch_size,
+        "batched_images_per_second": len(pixels) * repeat / batched_wall if batched_wall else None,
+        "scores": scores,
+    }
+
+
+def compare(result, baseline, threshold, tolerance):
+    diffs = [abs(a - b) for a, b in zip(result["scores"], baseline["scores"])]
+    agreement = sum((a > threshold) == (b > threshold) for a, b in zip(result["scores"], baseline["scores"]))
+    result["max_abs_diff"] = max(diffs, default=0.0)
+    result["mean_abs_diff"] = sum(diffs) / len(diffs) if diffs else 0.0
+    result["decision_agreement"] = agreement / len(diffs) if diffs else 1.0
+    result["within_tolerance"] = result["max_abs_diff"] <= tolerance and result["decision_agreement"] == 1.0
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare detection inference backends")
+    parser.add_argument("--model", choices=["oil", "debris"], default="oil")
+    parser.add_argument("--images", required=True, help="directory of representative images")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--variants", default="onnx,onnx-int8,openvino,openvino-int8",
+                        help="comma-separated; the native backend is always run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="max |confidence - native confidence|")
+    parser.add_argument("--batch-size", type=int, default=Config.INFERENCE_MAX_BATCH_SIZE)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threads", type=int, help="intra-op threads (defaults to the model's Config value)")
+    parser.add_argument("--output", default="backend_comparison.json")
+    args = parser.parse_args(argv)
+
+    images = load_images(args.images, args.limit)
+    if not images:
+        sys.exit(f"No readable images in {args.images}")
+
+    native = NATIVE_BACKENDS[args.model]
+    variants = [native] + [v.strip() for v in args.variants.split(",") if v.strip() and v.strip() != native]
+    results = []
+    for variant in variants:
+        print(f"🔹 {args.model} / {variant} ...")
+        try:
+            results.append(run_variant(args.model, variant, images, args.batch_size, args.repeat, args.threads))
+        except Exception as e:
+            if variant == native:
+                sys.exit(f"Native backend failed, nothing to compare against: {e}")
+            print(f"⚠️ {variant} unavailable:", e)
+            results.append({"variant": variant, "error": str(e)})
+
+    baseline = results[0]
+    for result in results:
+        if "error" not in result:
+            compare(result, baseline, THRESHOLDS[args.model], args.tolerance)
+            lat = result["single_image_ms"]
+            print(f"    {result['variant']:<14} p50={lat['p50']:.1f}ms p95={lat['p95']:.1f}ms "
+                  f"batch={result['batched_images_per_second']:.1f} img/s "
+                  f"max|Δconf|={result['max_abs_diff']:.3f} agree={result['decision_agreement']:.0%}")
+
+    eligible = [r for r in results if r.get("within_tolerance")]
+    best = min(eligible, key=lambda r: r["single_image_ms"]["p50"]) if eligible else baseline
+    backend, int8 = parse_variant(best["variant"])
+    print(f"✅ Recommended: {best['variant']} "
+          f"({args.model.upper()}_MODEL_BACKEND={backend}, INFERENCE_INT8={'true' if int8 else 'false'})")
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "model": args.model,
+            "images": [name for name, _ in images],
+            "tolerance": args.tolerance,
+            "recommended": best["variant"],
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
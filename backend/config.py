@@ -3,8 +3,138 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "user123")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "user123")
+    # Only /api/report/feed also reads ?jwt= (EventSource can't send headers)
+    JWT_TOKEN_LOCATION = ["headers"]
     MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/oceanguard")
-    
+    MONGO_ENSURE_INDEXES = os.getenv("MONGO_ENSURE_INDEXES", "true").lower() in ["true", "1", "yes"]
+
+    # Report ingestion (async mode hands the pipeline to a worker pool)
+    REPORT_ASYNC_INGESTION = os.getenv("REPORT_ASYNC_INGESTION", "false").lower() in ["true", "1", "yes"]
+    INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", 4))
+    UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR", os.path.join(BASE_DIR, "instance", "uploads"))
+
+    # Upload limits: requests above these are rejected (413) before the body is read;
+    # file parts above UPLOAD_SPOOL_MEMORY_BYTES are spooled to UPLOAD_SPOOL_DIR
+    MAX_CONTENT_LENGTH = int(os.getenv("MAX_UPLOAD_MB", 20)) * 1024 * 1024
+    BULK_MAX_CONTENT_LENGTH = int(os.getenv("BULK_MAX_UPLOAD_MB", 1024)) * 1024 * 1024
+    UPLOAD_SPOOL_MEMORY_BYTES = int(os.getenv("UPLOAD_SPOOL_MEMORY_BYTES", 1024 * 1024))
+
+    # Upload, weather and authority lookup run side by side after detection, each with its own timeout
+    PIPELINE_IO_WORKERS = int(os.getenv("PIPELINE_IO_WORKERS", 16))
+    UPLOAD_STAGE_TIMEOUT_SECONDS = float(os.getenv("UPLOAD_STAGE_TIMEOUT_SECONDS", 30))
+    WEATHER_STAGE_TIMEOUT_SECONDS = float(os.getenv("WEATHER_STAGE_TIMEOUT_SECONDS", 12))
+    AUTHORITY_STAGE_TIMEOUT_SECONDS = float(os.getenv("AUTHORITY_STAGE_TIMEOUT_SECONDS", 5))
+
+    # Detection inference batching
+    INFERENCE_MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", 8))
+    INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", 15))
+
+    # Detection models (thread pools are pinned so both models can run side by side)
+    OIL_MODEL_THREADS = int(os.getenv("OIL_MODEL_THREADS", 2))
+    DEBRIS_MODEL_THREADS = int(os.getenv("DEBRIS_MODEL_THREADS", 2))
+    DEBRIS_CLASS_INDEX = int(os.getenv("DEBRIS_CLASS_INDEX", 1))
+    OIL_CONFIDENCE_THRESHOLD = float(os.getenv("OIL_CONFIDENCE_THRESHOLD", 0.5))
+    DEBRIS_CONFIDENCE_THRESHOLD = float(os.getenv("DEBRIS_CONFIDENCE_THRESHOLD", 0.5))
+
+    # Tiled oil detection for large aerial frames: off | auto (frames above TILE_MIN_PIXELS) | always.
+    # Tiles above TILE_MAX_TILES are avoided by downscaling the frame first.
+    TILED_DETECTION = os.getenv("TILED_DETECTION", "off").lower()
+    TILE_SIZE = int(os.getenv("TILE_SIZE", 640))
+    TILE_OVERLAP = float(os.getenv("TILE_OVERLAP", 0.2))
+    TILE_MIN_PIXELS = int(os.getenv("TILE_MIN_PIXELS", 8_000_000))
+    TILE_MAX_TILES = max(1, int(os.getenv("TILE_MAX_TILES", 64)))  # a frame always needs at least one tile
+    TILE_MERGE_IOU = float(os.getenv("TILE_MERGE_IOU", 0.5))
+    # Larger uploads are decoded at 1/2, 1/4 or 1/8 scale (JPEG DCT scaling)
+    MAX_DECODE_PIXELS = int(os.getenv("MAX_DECODE_PIXELS", 40_000_000))
+    # Untiled frames are downscaled to this longest side before inference and upload
+    INFERENCE_MAX_IMAGE_SIDE = int(os.getenv("INFERENCE_MAX_IMAGE_SIDE", 1280))
+
+    # Inference backends: oil pytorch | onnx | openvino, debris tensorflow | onnx | openvino.
+    # Non-native backends load exports made by `python -m services.model_export` and need
+    # requirements-inference.txt
+    OIL_MODEL_BACKEND = os.getenv("OIL_MODEL_BACKEND", "pytorch").lower()
+    DEBRIS_MODEL_BACKEND = os.getenv("DEBRIS_MODEL_BACKEND", "tensorflow").lower()
+    INFERENCE_INT8 = os.getenv("INFERENCE_INT8", "false").lower() in ["true", "1", "yes"]
+    INFERENCE_INTER_OP_THREADS = int(os.getenv("INFERENCE_INTER_OP_THREADS", 1))
+    EXPORTED_MODELS_DIR = os.getenv("EXPORTED_MODELS_DIR", os.path.join(BASE_DIR, "ml_Models", "exported"))
+    OIL_MODEL_IMGSZ = int(os.getenv("OIL_MODEL_IMGSZ", 640))
+    OIL_DETECTION_MIN_CONFIDENCE = float(os.getenv("OIL_DETECTION_MIN_CONFIDENCE", 0.25))
+    OIL_NMS_IOU = float(os.getenv("OIL_NMS_IOU", 0.7))
+
+    # Weather (Open-Meteo endpoints are overridable for local stand-ins)
+    OPEN_METEO_URL = os.getenv("OPEN_METEO_URL", "https://api.open-meteo.com/v1/forecast")
+    OPEN_METEO_MARINE_URL = os.getenv("OPEN_METEO_MARINE_URL", "https://marine-api.open-meteo.com/v1/marine")
+
+    # Weather cache (grid cell + forecast hour); shared tier lives in Mongo
+    WEATHER_CACHE_GRID_DEG = float(os.getenv("WEATHER_CACHE_GRID_DEG", 0.05))
+    WEATHER_CACHE_TTL_SECONDS = int(os.getenv("WEATHER_CACHE_TTL_SECONDS", 1800))
+    WEATHER_CACHE_SIZE = int(os.getenv("WEATHER_CACHE_SIZE", 2048))
+    WEATHER_CACHE_SHARED = os.getenv("WEATHER_CACHE_SHARED", "false").lower() in ["true", "1", "yes"]
+    WEATHER_TIMEOUT_SECONDS = float(os.getenv("WEATHER_TIMEOUT_SECONDS", 10))
+    WEATHER_HTTP_POOL_SIZE = int(os.getenv("WEATHER_HTTP_POOL_SIZE", 8))
+    WEATHER_FORECAST_HOURS = int(os.getenv("WEATHER_FORECAST_HOURS", 4))
+
+    # Drift prediction (0 particles disables the ensemble)
+    PREDICTION_ENSEMBLE_SIZE = int(os.getenv("PREDICTION_ENSEMBLE_SIZE", 1000))
+    # Periodic refresh of predicted paths for open reports (opt-in; one worker holds the lease)
+    PREDICTION_REFRESH_ENABLED = os.getenv("PREDICTION_REFRESH_ENABLED", "false").lower() in ["true", "1", "yes"]
+    PREDICTION_REFRESH_MINUTES = int(os.getenv("PREDICTION_REFRESH_MINUTES", 30))
+    PREDICTION_REFRESH_BATCH = int(os.getenv("PREDICTION_REFRESH_BATCH", 5000))
+
+    # Hotspot rollups: report counts per geohash tile (5 ≈ 4.9 km) and day
+    HOTSPOT_GEOHASH_PRECISION = int(os.getenv("HOTSPOT_GEOHASH_PRECISION", 5))
+    HOTSPOT_DEFAULT_DAYS = int(os.getenv("HOTSPOT_DEFAULT_DAYS", 30))
+    HOTSPOT_MAX_TILES = int(os.getenv("HOTSPOT_MAX_TILES", 2000))
+
+    # Map GeoJSON: clusters from the hotspot rollups up to this zoom, points beyond
+    GEOJSON_CLUSTER_MAX_ZOOM = int(os.getenv("GEOJSON_CLUSTER_MAX_ZOOM", 11))
+    GEOJSON_MAX_FEATURES = int(os.getenv("GEOJSON_MAX_FEATURES", 2000))
+    GEOJSON_GZIP_MIN_BYTES = int(os.getenv("GEOJSON_GZIP_MIN_BYTES", 1024))
+
+    # Notification outbox + SMTP dispatcher (no SMTP_HOST = print messages).
+    # Opt-in so CLI commands and test apps don't start the polling thread: set
+    # NOTIFY_DISPATCHER_ENABLED=true on one serving worker (claims are leased, so extra
+    # dispatchers are safe but only add polling). Until one runs, emails stay queued.
+    NOTIFY_DISPATCHER_ENABLED = os.getenv("NOTIFY_DISPATCHER_ENABLED", "false").lower() in ["true", "1", "yes"]
+    NOTIFY_BATCH_SIZE = int(os.getenv("NOTIFY_BATCH_SIZE", 50))
+    NOTIFY_POLL_SECONDS = float(os.getenv("NOTIFY_POLL_SECONDS", 5))
+    NOTIFY_MAX_ATTEMPTS = int(os.getenv("NOTIFY_MAX_ATTEMPTS", 5))
+    NOTIFY_RETRY_BASE_SECONDS = int(os.getenv("NOTIFY_RETRY_BASE_SECONDS", 30))
+    SMTP_HOST = os.getenv("SMTP_HOST")
+    SMTP_PORT = int(os.getenv("SMTP_PORT", 25))
+    SMTP_USERNAME = os.getenv("SMTP_USERNAME")
+    SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+    SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "false").lower() in ["true", "1", "yes"]
+    SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", 10))
+    MAIL_FROM = os.getenv("MAIL_FROM", "alerts@oceanguard.local")
+
+    # Authority profile cache (per process)
+    AUTHORITY_CACHE_TTL_SECONDS = int(os.getenv("AUTHORITY_CACHE_TTL_SECONDS", 300))
+    AUTHORITY_CACHE_SIZE = int(os.getenv("AUTHORITY_CACHE_SIZE", 1024))
+
+    # Bulk survey uploads
+    BULK_MAX_IMAGES = int(os.getenv("BULK_MAX_IMAGES", 500))
+    BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", 16))
+    BULK_IO_WORKERS = int(os.getenv("BULK_IO_WORKERS", 8))
+
+    # Detection result cache (content hash + optional perceptual hash)
+    DETECTION_CACHE_SIZE = int(os.getenv("DETECTION_CACHE_SIZE", 4096))
+    DETECTION_CACHE_TTL_SECONDS = int(os.getenv("DETECTION_CACHE_TTL_SECONDS", 86400))
+    DETECTION_CACHE_PERCEPTUAL = os.getenv("DETECTION_CACHE_PERCEPTUAL", "false").lower() in ["true", "1", "yes"]
+    DETECTION_CACHE_MAX_DISTANCE = int(os.getenv("DETECTION_CACHE_MAX_DISTANCE", 4))
+    DETECTION_CACHE_SHARED = os.getenv("DETECTION_CACHE_SHARED", "false").lower() in ["true", "1", "yes"]
+
+    # Live report feed (SSE): inprocess | changestream | auto (change streams need a replica set;
+    # inprocess only reaches clients connected to the same worker process)
+    REALTIME_SOURCE = os.getenv("REALTIME_SOURCE", "inprocess").lower()
+    REALTIME_QUEUE_SIZE = int(os.getenv("REALTIME_QUEUE_SIZE", 256))
+    REALTIME_HEARTBEAT_SECONDS = float(os.getenv("REALTIME_HEARTBEAT_SECONDS", 15))
+
+    # /metrics and /api/cache/stats expose internals: served only with this bearer token
+    # (e.g. Prometheus `authorization: {credentials: ...}`), 404 while unset
+    OPS_API_TOKEN = os.getenv("OPS_API_TOKEN")
@@ -0,0 +1 @@
+# Tests import modules the way app.py does (`from config import Config`), so backend/ is the root.
@@ -0,0 +1,188 @@
+# backend/database/indexes.py
+from datetime import datetime
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE
+from pymongo.errors import OperationFailure
+
+# ---------------------------------------------------------------------
+# Declared indexes, per collection. Names are explicit so drift is easy to spot.
+# ---------------------------------------------------------------------
+INDEX_SPECS = {
+    "users": [
+        {"name": "email_unique", "keys": [("email", ASCENDING)], "unique": True},
+    ],
+    "authorities": [
+        {"name": "email_unique", "keys": [("email", ASCENDING)], "unique": True},
+        {"name": "location_2dsphere", "keys": [("location", GEOSPHERE)]},
+    ],
+    "reports": [
+        # ReportModel.find_by_user
+        {"name": "user_created_id", "keys": [
+            ("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING),
+        ]},
+        # ReportModel.get_pending_for_authority
+        {"name": "notified_pending_id", "keys": [
+            ("notified_authorities", ASCENDING), ("status", ASCENDING),
+            ("assigned_authority", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING),
+        ]},
+        # ReportModel.get_completed_by_authority / update_status
+        {"name": "assigned_status_updated_id", "keys": [
+            ("assigned_authority", ASCENDING), ("status", ASCENDING),
+            ("updated_at", DESCENDING), ("_id", DESCENDING),
+        ]},
+        # ReportModel.find_active (prediction refresh)
+        {"name": "status_id", "keys": [("status", ASCENDING), ("_id", ASCENDING)]},
+        # NotificationModel.fan_out_pending
+        {"name": "notifications_pending", "keys": [("notifications_pending", ASCENDING)]},
+        # ReportModel.find_in_bbox
+        {"name": "geo_2dsphere", "keys": [("geo", GEOSPHERE)]},
+    ],
+    "report_events": [
+        # ReportEventModel.find_for_report
+        {"name": "report_timestamp_id", "keys": [
+            ("report_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING),
+        ]},
+    ],
+    "report_rollups": [
+        # HotspotModel.find_hotspots
+        {"name": "day_center", "keys": [("day", ASCENDING), ("center.lat", ASCENDING), ("center.lng", ASCENDING)]},
+        # HotspotModel.find_clusters (no day filter)
+        {"name": "center", "keys": [("center.lat", ASCENDING), ("center.lng", ASCENDING)]},
+    ],
+    "notification_outbox": [
+        # NotificationModel.claim_batch
+        {"name": "status_next_attempt", "keys": [("status", ASCENDING), ("next_attempt_at", ASCENDING)]},
+        {"name": "status_lease", "keys": [("status", ASCENDING), ("lease_expires_at", ASCENDING)]},
+    ],
+}
+
+# ---------------------------------------------------------------------
+# Hot queries that must be served by an index: (name, collection, filter, sort)
+# ---------------------------------------------------------------------
+_SAMPLE_ID = ObjectId()
+
+HOT_QUERIES = [
+    ("users.find_by_email", "users", {"email": "probe@example.com"}, None),
+    ("authorities.find_by_email", "authorities", {"email": "probe@example.com"}, None),
+    ("reports.find_by_user", "reports", {"user_id": _SAMPLE_ID},
+     [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("reports.get_pending_for_authority", "reports", {
+        "status": "pending",
+        "notified_authorities": {"$in": [_SAMPLE_ID]},
+        "assigned_authority": None,
+    }, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("reports.get_completed_by_authority", "reports", {
+        "assigned_authority": _SAMPLE_ID,
+        "status": "completed",
+    }, [("updated_at", DESCENDING), ("_id", DESCENDING)]),
+    ("reports.find_active", "reports", {"status": {"$in": ["pending", "accepted", "in_progress"]}}, None),
+    ("reports.fan_out_pending", "reports", {"notifications_pending": True}, None),
+    ("reports.find_in_bbox", "reports", {"geo": {"$geoWithin": {"$geometry": {
+        "type": "Polygon",
+        "coordinates": [[[72.0, 18.0], [73.0, 18.0], [73.0, 19.0], [72.0, 19.0], [72.0, 18.0]]],
+    }}}}, None),
+    ("report_events.find_for_report", "report_events", {"report_id": _SAMPLE_ID},
+     [("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    ("report_rollups.find_hotspots", "report_rollups", {
+        "count": {"$gt": 0},
+        "day": {"$gte": datetime(2020, 1, 1)},
+        "center.lat": {"$gte": -10.0, "$lte": 10.0},
+        "center.lng": {"$gte": 60.0, "$lte": 80.0},
+    }, None),
+    ("report_rollups.find_clusters", "report_rollups", {
+        "count": {"$gt": 0},
+        "center.lat": {"$gte": -10.0, "$lte": 10.0},
+        "center.lng": {"$gte": 60.0, "$lte": 80.0},
+    }, None),
+]
+
+
+class IndexPlanError(Exception):
+    """Raised when a hot query is planned as a collection scan."""
+
+
+def _key_list(index_info):
+    return [(k, v) for k, v in index_info["key"]]
+
+
+def ensure_indexes(db):
+    """
+    Create every declared index that is missing and report drift.
+    Existing indexes with the same name but different keys/options are never
+    dropped automatically; they are reported under "conflicts".
+    """
+    report = {"created": [], "existing": [], "conflicts": [], "undeclared": [], "failed": []}
+
+    for collection_name, specs in INDEX_SPECS.items():
+        col = db[collection_name]
+        existing = col.index_information()
+        declared_names = {spec["name"] for spec in specs}
+
+        for spec in specs:
+            name = spec["name"]
+            full_name = f"{collection_name}.{name}"
+            current = existing.get(name)
+            if current is not None:
+                same_keys = _key_list(current) == list(spec["keys"])
+                same_unique = bool(current.get("unique")) == bool(spec.get("unique"))
+                if same_keys and same_unique:
+                    report["existing"].append(full_name)
+                else:
+                    report["conflicts"].append(full_name)
+                continue
+            try:
+                col.create_index(spec["keys"], name=name, unique=spec.get("unique", False))
+                report["created"].append(full_name)
+            except OperationFailure as e:
+                report["failed"].append({"index": full_name, "error": str(e)})
+
+        for name in existing:
+            if name != "_id_" and name not in declared_names:
+                report["undeclared"].append(f"{collection_name}.{name}")
+
+    return report
+
+
+def bootstrap_indexes(db):
+    """ensure_indexes() for app startup: logs what was created and any drift."""
+    report = ensure_indexes(db)
+    if report["created"]:
+        print("🔹 Created indexes:", ", ".join(report["created"]))
+    for key in ["conflicts", "undeclared", "failed"]:
+        if report[key]:
+            print(f"⚠️ Index drift ({key}):", report[key])
+    return report
+
+
+def _plan_stages(plan):
+    """Yield every stage name in an explain() plan tree."""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+
+def check_query_plans(db, raise_on_collscan=True):
+    """
+    explain() each hot query and return {query_name: [stages]}.
+    Raises IndexPlanError if any of them falls back to COLLSCAN.
+    """
+    plans = {}
+    offenders = []
+    for name, collection_name, query, sort in HOT_QUERIES:
+        cursor = db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explained = cursor.explain()
+        stages = list(_plan_stages(explained.get("queryPlanner", {}).get("winningPlan", {})))
+        plans[name] = stages
+        if "COLLSCAN" in stages:
+            offenders.append(name)
+
+    if offenders and raise_on_collscan:
+        raise IndexPlanError(f"Queries planned as COLLSCAN: {', '.join(offenders)}")
+    return plans
@@ -1,5 +1,8 @@
 from database.mongo import mongo
+from bson import ObjectId
 from flask_bcrypt import generate_password_hash, check_password_hash
+from config import Config
+from utils.ttl_cache import TTLCache
 import math
 
 def haversine_km(lat1, lon1, lat2, lon2):
@@ -8,6 +11,19 @@ def haversine_km(lat1, lon1, lat2, lon2):
     dphi = math.radians(lat2 - lat1); dlambda = math.radians(lon2 - lon1)
     a = math.sin(dphi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dlambda/2)**2
     return 2*R*math.asin(math.sqrt(a))
+
+def geo_point(lat, lng):
+    """GeoJSON point (note: coordinates are [lng, lat])."""
+    return {"type": "Point", "coordinates": [float(lng), float(lat)]}
+
+# Stable authority metadata (no password) used on hot paths; invalidated on profile changes
+PROFILE_FIELDS = {"name": 1, "email": 1, "station": 1, "area": 1, "is_available": 1, "role": 1}
+authority_profile_cache = TTLCache(
+    maxsize=Config.AUTHORITY_CACHE_SIZE,
+    ttl=Config.AUTHORITY_CACHE_TTL_SECONDS,
+    name="authority_profile",
+)
+
 class AuthorityModel:
 
     @staticmethod
@@ -26,6 +42,7 @@ class AuthorityModel:
             "role": "authority",
             "station": station,
             "area": {"lat": lat, "lng": lng},
+            "location": geo_point(lat, lng),
             "is_available": True
         }).inserted_id
 
@@ -35,30 +52,88 @@ class AuthorityModel:
     def find_by_email(email):
         return AuthorityModel.get_collection().find_one({"email": email})
 
+    @staticmethod
+    def find_by_id(authority_id):
+        return AuthorityModel.get_collection().find_one({"_id": ObjectId(authority_id)}, PROFILE_FIELDS)
+
+    @staticmethod
+    def get_profile(authority_id):
+        """Cached find_by_id. Returns a copy of the profile dict or None."""
+        key = str(authority_id)
+        profile = authority_profile_cache.get(key)
+        if profile is None:
+            profile = AuthorityModel.find_by_id(authority_id)
+            if profile is None:
+                return None
+            authority_profile_cache.set(key, profile)
+        return dict(profile)
+
+    @staticmethod
+    def invalidate_profile(authority_id):
+        authority_profile_cache.invalidate(str(authority_id))
+
     @staticmethod
     def verify_password(hashed_password, password):
         return check_password_hash(hashed_password, password)
 
     @staticmethod
-    def get_nearby_authorities(lat, lng, radius_km=10):
-        """
-        Returns list of authority documents within radius_km (based on area.lat/area.lng).
-        Naive approach: fetch active authorities and filter by distance.
-        """
+    def update_profile(authority_id, update_data):
+        """Update profile fields; keeps the GeoJSON location in sync with area."""
+        update_data = dict(update_data)
+        area = update_data.get("area")
+        if area:
+            update_data["location"] = geo_point(area["lat"], area["lng"])
+        result = AuthorityModel.get_collection().update_one(
+            {"_id": ObjectId(authority_id)},
+            {"$set": update_data}
+        )
+        AuthorityModel.invalidate_profile(authority_id)
+        return result
+
+    @staticmethod
+    def update_availability(authority_id, is_available):
+        result = AuthorityModel.get_collection().update_one(
+            {"_id": ObjectId(authority_id)},
+            {"$set": {"is_available": is_available}}
+        )
+        AuthorityModel.invalidate_profile(authority_id)
+        return result
+
+    @staticmethod
+    def backfill_locations():
+        """Set the GeoJSON location on documents created before it existed."""
         col = AuthorityModel.get_collection()
-        # only pull available authorities to reduce load
-        candidates = list(col.find({"is_available": True}))
-        nearby = []
-        for a in candidates:
+        backfilled = 0
+        for a in col.find({"location": {"$exists": False}, "area.lat": {"$ne": None}, "area.lng": {"$ne": None}},
+                          {"area": 1}):
             area = a.get("area") or {}
-            a_lat = area.get("lat")
-            a_lng = area.get("lng")
-            if a_lat is None or a_lng is None:
+            try:
+                point = geo_point(area["lat"], area["lng"])
+            except (KeyError, TypeError, ValueError):
                 continue
-            dist = haversine_km(lat, lng, float(a_lat), float(a_lng))
-            if dist <= radius_km:
-                a["_distance_km"] = dist
-                nearby.append(a)
-        # sort by distance ascending
-        nearby.sort(key=lambda x: x["_distance_km"])
+            col.update_one({"_id": a["_id"]}, {"$set": {"location": point}})
+            backfilled += 1
+        return backfilled
+
+    @staticmethod
+    def get_nearby_authorities(lat, lng, radius_km=10):
+        """
+        Returns list of available authority documents within radius_km, nearest first.
+        Served by the 2dsphere index on location via $geoNear.
+        """
+        pipeline = [
+            {
+                "$geoNear": {
+                    "near": geo_point(lat, lng),
+                    "distanceField": "_distance_m",
+                    "maxDistance": radius_km * 1000.0,
+                    "query": {"is_available": True},
+                    "spherical": True,
+                }
+            },
+            {"$project": {"password": 0}},
+        ]
+        nearby = list(AuthorityModel.get_collection().aggregate(pipeline))
+        for a in nearby:
+            a["_distance_km"] = a.pop("_distance_m") / 1000.0
         return nearby
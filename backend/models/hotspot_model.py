@@ -0,0 +1,163 @@
+# backend/models/hotspot_model.py
+from database.mongo import mongo
+from datetime import datetime, time
+from pymongo import UpdateOne
+from config import Config
+from utils import geohash
+
+# Report fields a rollup is keyed on
+ROLLUP_FIELDS = {"location": 1, "type": 1, "status": 1, "created_at": 1}
+
+
+def _day(value):
+    return datetime.combine((value or datetime.utcnow()).date(), time.min)
+
+
+class HotspotModel:
+    """
+    Report counts per (geohash tile, creation day, type, current status).
+    Kept up to date incrementally by ReportModel, so map queries read tiles, not reports.
+    """
+
+    @staticmethod
+    def get_collection():
+        return mongo.db.report_rollups
+
+    @staticmethod
+    def _rollup(report, status):
+        """(_id, key fields) of the rollup the report falls in under `status`."""
+        loc = report["location"]
+        tile = geohash.encode(loc["lat"], loc["lng"], Config.HOTSPOT_GEOHASH_PRECISION)
+        day = _day(report.get("created_at"))
+        report_type = report.get("type") or "unknown"
+        lat, lng = geohash.center(tile)
+        fields = {
+            "tile": tile, "day": day, "type": report_type, "status": status,
+            "center": {"lat": lat, "lng": lng},
+        }
+        return f"{tile}|{day:%Y-%m-%d}|{report_type}|{status}", fields
+
+    @staticmethod
+    def _bump(report, status, delta):
+        rollup_id, fields = HotspotModel._rollup(report, status)
+        return UpdateOne(
+            {"_id": rollup_id},
+            {"$inc": {"count": delta}, "$setOnInsert": fields},
+            upsert=True,
+        )
+
+    @staticmethod
+    def record_created(reports):
+        """Count newly inserted reports."""
+        ops = [HotspotModel._bump(r, r.get("status", "pending"), 1) for r in reports if r.get("location")]
+        if ops:
+            HotspotModel.get_collection().bulk_write(ops, ordered=False)
+
+    @staticmethod
+    def record_transition(before, new_status):
+        """Move one report from its previous status bucket to new_status (before: report prior to the update)."""
+        old_status = before.get("status", "pending")
+        if old_status == new_status or not before.get("location"):
+            return
+        HotspotModel.get_collection().bulk_write([
+            HotspotModel._bump(before, old_status, -1),
+            HotspotModel._bump(before, new_status, 1),
+        ], ordered=False)
+
+    @staticmethod
+    def _match(bbox=None, since=None, until=None, types=None, statuses=None):
+        match = {"count": {"$gt": 0}}
+        if since or until:
+            match["day"] = {}
+            if since:
+                match["day"]["$gte"] = _day(since)
+            if until:
+                match["day"]["$lte"] = _day(until)
+        if bbox:
+            min_lat, min_lng, max_lat, max_lng = bbox
+            match["center.lat"] = {"$gte": min_lat, "$lte": max_lat}
+            match["center.lng"] = {"$gte": min_lng, "$lte": max_lng}
+        if types:
+            match["type"] = {"$in": list(types)}
+        if statuses:
+            match["status"] = {"$in": list(statuses)}
+        return match
+
+    @staticmethod
+    def _tile_expr(precision=None):
+        """Group key for tiles; precision below the stored one merges tiles into their geohash prefix."""
+        stored = Config.HOTSPOT_GEOHASH_PRECISION
+        if not precision or precision >= stored:
+            return "$tile"
+        return {"$substrCP": ["$tile", 0, precision]}
+
+    @staticmethod
+    def find_hotspots(bbox=None, since=None, until=None, types=None, statuses=None, precision=None, limit=None):
+        """
+        Tiles with report counts, largest first.
+        bbox: (min_lat, min_lng, max_lat, max_lng) matched on tile centres; since/until: creation days.
+        Returns [{"tile", "count", "by_type": {...}, "by_status": {...}}].
+        """
+        tile = HotspotModel._tile_expr(precision)
+        pipeline = [
+            {"$match": HotspotModel._match(bbox, since, until, types, statuses)},
+            {"$group": {"_id": {"tile": tile, "type": "$type", "status": "$status"}, "count": {"$sum": "$count"}}},
+        ]
+
+        tiles = {}
+        for row in HotspotModel.get_collection().aggregate(pipeline):
+            key = row["_id"]
+            entry = tiles.setdefault(key["tile"], {"tile": key["tile"], "count": 0, "by_type": {}, "by_status": {}})
+            entry["count"] += row["count"]
+            entry["by_type"][key["type"]] = entry["by_type"].get(key["type"], 0) + row["count"]
+            entry["by_status"][key["status"]] = entry["by_status"].get(key["status"], 0) + row["count"]
+
+        hotspots = sorted(tiles.values(), key=lambda t: -t["count"])
+        return hotspots[:limit] if limit else hotspots
+
+    @staticmethod
+    def find_clusters(bbox=None, precision=None, types=None, statuses=None, limit=None):
+        """
+        Map clusters: one per geohash prefix of `precision`, positioned at the
+        count-weighted centre of its tiles. Returns [{"tile", "count", "lat", "lng"}].
+        """
+        pipeline = [
+            {"$match": HotspotModel._match(bbox, types=types, statuses=statuses)},
+            {"$group": {
+                "_id": HotspotModel._tile_expr(precision),
+                "count": {"$sum": "$count"},
+                "lat_sum": {"$sum": {"$multiply": ["$count", "$center.lat"]}},
+                "lng_sum": {"$sum": {"$multiply": ["$count", "$center.lng"]}},
+            }},
+            {"$sort": {"count": -1}},
+        ]
+        if limit:
+            pipeline.append({"$limit": limit})
+        return [
+            {"tile": row["_id"], "count": row["count"],
+             "lat": row["lat_sum"] / row["count"], "lng": row["lng_sum"] / row["count"]}
+            for row in HotspotModel.get_collection().aggregate(pipeline)
+        ]
+
+    @staticmethod
+    def rebuild_from_reports(batch_size=1000):
+        """
+        Recount every rollup from the reports collection (initial backfill / repair).
+        Replaces the collection, so run it once, from the rebuild-hotspots CLI,
+        while no reports are being written.
+        """
+        counts = {}
+        for report in mongo.db.reports.find({}, ROLLUP_FIELDS).batch_size(batch_size):
+            if not report.get("location"):
+                continue
+            rollup_id, fields = HotspotModel._rollup(report, report.get("status", "pending"))
+            if rollup_id in counts:
+                counts[rollup_id]["count"] += 1
+            else:
+                counts[rollup_id] = {"_id": rollup_id, "count": 1, **fields}
+
+        collection = HotspotModel.get_collection()
+        collection.delete_many({})
+        if counts:
+            collection.insert_many(list(counts.values()), ordered=False)
+        return len(counts)
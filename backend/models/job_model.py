@@ -0,0 +1,58 @@
+# backend/models/job_model.py
+from database.mongo import mongo
+from datetime import datetime
+from bson import ObjectId
+
+class JobModel:
+
+    @staticmethod
+    def get_collection():
+        return mongo.db.report_jobs
+
+    @staticmethod
+    def create_job(user_id, lat, lng, stages):
+        now = datetime.utcnow()
+        job = {
+            "user_id": ObjectId(user_id) if isinstance(user_id, str) else user_id,
+            "location": {"lat": float(lat), "lng": float(lng)},
+            "status": "queued",  # queued | running | completed | failed
+            "stages": {s: {"status": "pending", "started_at": None, "finished_at": None} for s in stages},
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        return JobModel.get_collection().insert_one(job).inserted_id
+
+    @staticmethod
+    def update_stage(job_id, stage, state):
+        """Record progress of a single pipeline stage ("running" | "done" | "failed")."""
+        now = datetime.utcnow()
+        update = {f"stages.{stage}.status": state, "updated_at": now}
+        if state == "running":
+            update[f"stages.{stage}.started_at"] = now
+            update["status"] = "running"
+        else:
+            update[f"stages.{stage}.finished_at"] = now
+        return JobModel.get_collection().update_one({"_id": ObjectId(job_id)}, {"$set": update})
+
+    @staticmethod
+    def complete(job_id, result):
+        return JobModel.get_collection().update_one(
+            {"_id": ObjectId(job_id)},
+            {"$set": {"status": "completed", "result": result, "updated_at": datetime.utcnow()}},
+        )
+
+    @staticmethod
+    def fail(job_id, error):
+        return JobModel.get_collection().update_one(
+            {"_id": ObjectId(job_id)},
+            {"$set": {"status": "failed", "error": error, "updated_at": datetime.utcnow()}},
+        )
+
+    @staticmethod
+    def find_for_user(job_id, user_id):
+        return JobModel.get_collection().find_one({
+            "_id": ObjectId(job_id),
+            "user_id": ObjectId(user_id),
+        })
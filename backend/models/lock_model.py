@@ -0,0 +1,33 @@
+# backend/models/lock_model.py
+from database.mongo import mongo
+from datetime import datetime, timedelta
+from pymongo.errors import DuplicateKeyError
+
+class LockModel:
+    """Named leases so a periodic job runs in one worker process at a time."""
+
+    @staticmethod
+    def get_collection():
+        return mongo.db.job_locks
+
+    @staticmethod
+    def acquire(name, owner, lease_seconds):
+        """Take (or renew) the lease on `name`; False while another owner holds it."""
+        now = datetime.utcnow()
+        try:
+            # matches only a free/expired lease or our own; otherwise the upsert collides on _id
+            LockModel.get_collection().find_one_and_update(
+                {"_id": name, "$or": [{"lease_expires_at": {"$lt": now}}, {"owner": owner}]},
+                {"$set": {"owner": owner, "lease_expires_at": now + timedelta(seconds=lease_seconds)}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    @staticmethod
+    def release(name, owner):
+        LockModel.get_collection().update_one(
+            {"_id": name, "owner": owner},
+            {"$set": {"lease_expires_at": datetime.utcnow()}},
+        )
@@ -0,0 +1,145 @@
+# backend/models/notification_model.py
+from database.mongo import mongo
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+
+class NotificationModel:
+    """Outbox of pending notification emails, drained by the dispatcher."""
+
+    @staticmethod
+    def get_collection():
+        return mongo.db.notification_outbox
+
+    @staticmethod
+    def build_messages(recipients, subject, body):
+        """
+        recipients: list of {"authority_id", "email"}.
+        Outbox documents (without report_id) with their _id already assigned, so they
+        can be stored on the report at insert time and fanned out later exactly once.
+        """
+        now = datetime.utcnow()
+        return [
+            {
+                "_id": ObjectId(),
+                "authority_id": r.get("authority_id"),
+                "to": r.get("email"),
+                "subject": subject,
+                "body": body,
+                "status": "pending",  # pending | sending | sent | failed
+                "attempts": 0,
+                "next_attempt_at": now,
+                "lease_expires_at": None,
+                "last_error": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for r in recipients if r.get("email")
+        ]
+
+    @staticmethod
+    def fan_out(report_id, messages):
+        """
+        Copy the messages stored on a report into the outbox and clear them from the report.
+        Already-copied messages are skipped, so repeating a partial fan-out is safe.
+        Returns number of messages newly queued.
+        """
+        report_id = ObjectId(report_id) if isinstance(report_id, str) else report_id
+        queued = 0
+        if messages:
+            docs = [{**m, "report_id": report_id} for m in messages]
+            try:
+                queued = len(NotificationModel.get_collection().insert_many(docs, ordered=False).inserted_ids)
+            except BulkWriteError as e:
+                if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                    raise
+                queued = e.details.get("nInserted", 0)
+        mongo.db.reports.update_one(
+            {"_id": report_id},
+            {"$unset": {"pending_notifications": "", "notifications_pending": ""}},
+        )
+        return queued
+
+    @staticmethod
+    def fan_out_pending(limit=100):
+        """Fan out reports whose messages were never copied to the outbox (e.g. the request failed mid-way)."""
+        queued = 0
+        for report in mongo.db.reports.find(
+            {"notifications_pending": True}, {"pending_notifications": 1}
+        ).limit(limit):
+            queued += NotificationModel.fan_out(report["_id"], report.get("pending_notifications") or [])
+        return queued
+
+    @staticmethod
+    def claim_batch(limit, lease_seconds=120):
+        """
+        Atomically move up to `limit` due messages to "sending" under a lease, so
+        several dispatchers (one per worker process) never send the same message.
+        """
+        col = NotificationModel.get_collection()
+        now = datetime.utcnow()
+        claimed = []
+        for _ in range(limit):
+            doc = col.find_one_and_update(
+                {"status": "pending", "next_attempt_at": {"$lte": now}},
+                {"$set": {
+                    "status": "sending",
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now,
+                }},
+                sort=[("next_attempt_at", 1)],
+                return_document=ReturnDocument.AFTER,
+            )
+            if not doc:
+                break
+            claimed.append(doc)
+        return claimed
+
+    @staticmethod
+    def expire_leases(max_attempts, retry_base_seconds):
+        """
+        Messages whose lease ran out (dispatcher died mid-send) count as a failed
+        attempt: they are rescheduled with backoff, or failed after max_attempts.
+        """
+        now = datetime.utcnow()
+        expired = NotificationModel.get_collection().find({"status": "sending", "lease_expires_at": {"$lt": now}})
+        released = 0
+        for message in expired:
+            res = NotificationModel.mark_failed(
+                message, "lease expired before send completed", max_attempts, retry_base_seconds,
+            )
+            released += res.modified_count
+        return released
+
+    @staticmethod
+    def mark_sent(message_ids):
+        if not message_ids:
+            return None
+        return NotificationModel.get_collection().update_many(
+            {"_id": {"$in": list(message_ids)}},
+            {"$set": {"status": "sent", "sent_at": datetime.utcnow(), "updated_at": datetime.utcnow(),
+                      "lease_expires_at": None}},
+        )
+
+    @staticmethod
+    def mark_failed(message, error, max_attempts, retry_base_seconds):
+        """Schedule a retry with exponential backoff, or give up after max_attempts."""
+        attempts = message.get("attempts", 0) + 1
+        now = datetime.utcnow()
+        update = {
+            "attempts": attempts,
+            "last_error": str(error),
+            "lease_expires_at": None,
+            "updated_at": now,
+        }
+        if attempts >= max_attempts:
+            update["status"] = "failed"
+        else:
+            update["status"] = "pending"
+            update["next_attempt_at"] = now + timedelta(seconds=retry_base_seconds * (2 ** (attempts - 1)))
+        # only the holder of this claim's lease may settle it
+        return NotificationModel.get_collection().update_one(
+            {"_id": message["_id"], "status": "sending", "lease_expires_at": message.get("lease_expires_at")},
+            {"$set": update},
+        )
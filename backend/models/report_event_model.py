@@ -0,0 +1,129 @@
+# backend/models/report_event_model.py
+import calendar
+import hashlib
+import struct
+from database.mongo import mongo
+from datetime import datetime
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from utils.pagination import keyset_filter
+
+# Scope of an event that concerns a single authority and leaves the report's status
+# unchanged (a notified authority declining a report others can still accept)
+AUTHORITY_SCOPE = "authority"
+
+# Observers of newly recorded events: listener(list of event documents)
+EVENT_LISTENERS = []
+
+
+def add_event_listener(listener):
+    if listener not in EVENT_LISTENERS:
+        EVENT_LISTENERS.append(listener)
+
+
+def remove_event_listener(listener):
+    if listener in EVENT_LISTENERS:
+        EVENT_LISTENERS.remove(listener)
+
+
+def _notify(events):
+    for listener in EVENT_LISTENERS:
+        try:
+            listener(events)
+        except Exception as e:
+            print("Report event listener failed:", e)
+
+
+class ReportEventModel:
+    """
+    Append-only status history of reports (one document per event).
+    The report itself only keeps its current status.
+    """
+
+    @staticmethod
+    def get_collection():
+        return mongo.db.report_events
+
+    @staticmethod
+    def build_event(report_id, status, by=None, remarks=None, actor_id=None, timestamp=None, scope=None):
+        event = {
+            "report_id": ObjectId(report_id) if isinstance(report_id, str) else report_id,
+            "status": status,
+            "timestamp": timestamp or datetime.utcnow(),
+            "by": by,  # display name (authority name) or None for the system
+            "actor_id": ObjectId(actor_id) if isinstance(actor_id, str) else actor_id,
+            "remarks": remarks,
+        }
+        if scope:
+            event["scope"] = scope  # see AUTHORITY_SCOPE
+        return event
+
+    @staticmethod
+    def record(report_id, status, by=None, remarks=None, actor_id=None, scope=None):
+        event = ReportEventModel.build_event(report_id, status, by, remarks, actor_id, scope=scope)
+        event_id = ReportEventModel.get_collection().insert_one(event).inserted_id
+        _notify([event])
+        return event_id
+
+    @staticmethod
+    def record_many(events):
+        if not events:
+            return []
+        event_ids = ReportEventModel.get_collection().insert_many(events, ordered=False).inserted_ids
+        _notify(events)
+        return event_ids
+
+    @staticmethod
+    def find_for_report(report_id, limit=None, after=None):
+        """Events of one report, newest first, keyset-paginated on (timestamp, _id)."""
+        query = {"report_id": ObjectId(report_id)}
+        if after:
+            query = {"$and": [query, keyset_filter("timestamp", after)]}
+        cursor = (
+            ReportEventModel.get_collection()
+            .find(query, {"report_id": 0})
+            .sort([("timestamp", -1), ("_id", -1)])
+        )
+        if limit:
+            cursor = cursor.limit(limit)
+        return list(cursor)
+
+    @staticmethod
+    def legacy_event_id(report_id, index, timestamp=None):
+        """
+        Deterministic ObjectId for the index-th embedded history entry of a report,
+        so re-running the migration cannot insert the same entry twice.
+        """
+        seconds = calendar.timegm(timestamp.utctimetuple()) if timestamp else 0
+        digest = hashlib.sha1(f"{report_id}:{index}".encode("utf-8")).digest()
+        return ObjectId(struct.pack(">I", max(seconds, 0)) + digest[:8])
+
+    @staticmethod
+    def backfill_from_reports(batch_size=500):
+        """
+        Move legacy embedded `history` arrays into report_events and unset them.
+        Events get deterministic ids and duplicates are skipped, so an interrupted
+        or concurrent run can simply be repeated.
+        """
+        reports = mongo.db.reports
+        moved = 0
+        for report in reports.find({"history": {"$exists": True}}, {"history": 1}).batch_size(batch_size):
+            events = []
+            for index, h in enumerate(report.get("history") or []):
+                event = ReportEventModel.build_event(
+                    report["_id"], h.get("status"), h.get("by"), h.get("remarks"),
+                    timestamp=h.get("timestamp"),
+                )
+                event["_id"] = ReportEventModel.legacy_event_id(report["_id"], index, h.get("timestamp"))
+                events.append(event)
+            # legacy events are not re-announced to live listeners
+            if events:
+                try:
+                    ReportEventModel.get_collection().insert_many(events, ordered=False)
+                except BulkWriteError as e:
+                    # entries already moved by an earlier/concurrent run
+                    if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                        raise
+            reports.update_one({"_id": report["_id"]}, {"$unset": {"history": ""}})
+            moved += 1
+        return moved
@@ -2,6 +2,15 @@
 from database.mongo import mongo
 from datetime import datetime
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from utils.pagination import keyset_filter
+from models.report_event_model import AUTHORITY_SCOPE, ReportEventModel
+from models.hotspot_model import HotspotModel, ROLLUP_FIELDS
+from models.authority_model import geo_point
+
+# Reports whose drift prediction is still worth refreshing
+ACTIVE_STATUSES = ["pending", "accepted", "in_progress"]
 
 class ReportModel:
 
@@ -10,88 +19,143 @@ class ReportModel:
         return mongo.db.reports
 
     @staticmethod
-    def create_report(user_id, image_url, report_type, lat, lng, predicted_path, weather_data, notified_authorities, ml_output=None):
+    def build_report(user_id, image_url, report_type, lat, lng, predicted_path, weather_data, notified_authorities, ml_output=None, predicted_area=None, notifications=None):
+        """
+        Report document ready for insertion (shared by single and bulk creation).
+        notifications: outbox messages written atomically with the report; NotificationModel.fan_out
+        moves them to the outbox (the dispatcher sweeps any left behind).
+        """
         report = {
             "user_id": ObjectId(user_id) if isinstance(user_id, str) else user_id,
             "image_url": image_url,
             "type": report_type,  # "oil_spill" or "debris"
             "location": {"lat": float(lat), "lng": float(lng)},
+            "geo": geo_point(lat, lng),  # GeoJSON copy of location for the 2dsphere index
             "predicted_path": predicted_path,  # list of {"lat","lng","eta"}
+            "predicted_area": predicted_area,  # ensemble median + percentile envelope
             "weather_data": weather_data,
             "notified_authorities": [ObjectId(a) if isinstance(a, str) else a for a in (notified_authorities or [])],
             "assigned_authority": None,
             "status": "pending",  # pending | accepted | in_progress | cleaned | completed | rejected
             "ml_output": ml_output or {},
-            "history": [
-                {
-                    "status": "pending",
-                    "timestamp": datetime.utcnow(),
-                    "by": None,
-                    "remarks": "Report created",
-                }
-            ],
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow(),
         }
+        if notifications:
+            report["pending_notifications"] = notifications
+            report["notifications_pending"] = True
+        return report
 
+    @staticmethod
+    def create_report(user_id, image_url, report_type, lat, lng, predicted_path, weather_data, notified_authorities, ml_output=None, predicted_area=None, notifications=None):
+        report = ReportModel.build_report(
+            user_id, image_url, report_type, lat, lng, predicted_path, weather_data,
+            notified_authorities, ml_output=ml_output, predicted_area=predicted_area,
+            notifications=notifications,
+        )
         result = ReportModel.get_collection().insert_one(report)
+        ReportEventModel.record(result.inserted_id, "pending", remarks="Report created")
+        HotspotModel.record_created([report])
         return result.inserted_id
 
+    @staticmethod
+    def insert_reports(reports):
+        """
+        Insert many built reports in one unordered round-trip. A report the server refuses
+        does not stop the others; returns the inserted id of each report in order, None where refused.
+        """
+        if not reports:
+            return []
+        refused = set()
+        try:
+            ReportModel.get_collection().insert_many(reports, ordered=False)
+        except BulkWriteError as e:
+            refused = {err["index"] for err in e.details.get("writeErrors", [])}
+            if not refused:
+                raise
+            print(f"⚠️ {len(refused)} of {len(reports)} reports refused on insert:",
+                  e.details["writeErrors"][0].get("errmsg"))
+        # insert_many sets _id on every document before sending
+        inserted = [r for i, r in enumerate(reports) if i not in refused]
+        ReportEventModel.record_many([
+            ReportEventModel.build_event(r["_id"], "pending", remarks="Report created")
+            for r in inserted
+        ])
+        HotspotModel.record_created(inserted)
+        return [None if i in refused else r["_id"] for i, r in enumerate(reports)]
+
+    @staticmethod
+    def _transition(query, fields):
+        """
+        Apply a $set that changes status and keep the hotspot rollups in step.
+        Returns the report's rollup fields as they were before the update, or None if nothing matched.
+        """
+        before = ReportModel.get_collection().find_one_and_update(
+            query, {"$set": fields}, projection=ROLLUP_FIELDS, return_document=ReturnDocument.BEFORE,
+        )
+        if before:
+            HotspotModel.record_transition(before, fields["status"])
+        return before
+
     @staticmethod
     def add_history_entry(report_id, status, by=None, remarks=None):
-        """Append status updates to history with timestamp and update status/updated_at"""
-        return ReportModel.get_collection().update_one(
+        """Record a status event and update the report's current status/updated_at"""
+        before = ReportModel._transition(
             {"_id": ObjectId(report_id)},
-            {
-                "$push": {
-                    "history": {
-                        "status": status,
-                        "timestamp": datetime.utcnow(),
-                        "by": by,
-                        "remarks": remarks,
-                    }
-                },
-                "$set": {"status": status, "updated_at": datetime.utcnow()},
-            },
+            {"status": status, "updated_at": datetime.utcnow()},
         )
+        if before:
+            ReportEventModel.record(report_id, status, by=by, remarks=remarks)
+        return before
 
     @staticmethod
-    def find_by_user(user_id):
-        """Fetch all reports for a given user (most recent first)"""
-        return list(
+    def _find_page(query, sort_field, limit=None, after=None, projection=None):
+        """Keyset-paginated find ordered by (sort_field desc, _id desc)."""
+        if after:
+            query = {"$and": [query, keyset_filter(sort_field, after)]}
+        cursor = (
             ReportModel.get_collection()
-            .find({"user_id": ObjectId(user_id)})
-            .sort("created_at", -1)
+            .find(query, projection)
+            .sort([(sort_field, -1), ("_id", -1)])
+        )
+        if limit:
+            cursor = cursor.limit(limit)
+        return list(cursor)
+
+    @staticmethod
+    def find_by_user(user_id, limit=None, after=None, projection=None):
+        """Fetch reports for a given user (most recent first)"""
+        return ReportModel._find_page(
+            {"user_id": ObjectId(user_id)}, "created_at", limit, after, projection
         )
 
     @staticmethod
-    def find_by_id(report_id):
-        return ReportModel.get_collection().find_one({"_id": ObjectId(report_id)})
+    def find_by_id(report_id, projection=None):
+        return ReportModel.get_collection().find_one({"_id": ObjectId(report_id)}, projection)
 
     # ----------------------------
     # Authority related helpers
     # ----------------------------
     @staticmethod
-    def get_pending_for_authority(authority_id):
+    def get_pending_for_authority(authority_id, limit=None, after=None, projection=None):
         """
         Pending reports in which this authority was notified but not yet assigned.
         Returns list of documents.
         """
-        return list(
-            ReportModel.get_collection()
-            .find({
+        return ReportModel._find_page(
+            {
                 "status": "pending",
                 "notified_authorities": {"$in": [ObjectId(authority_id)]},
                 "assigned_authority": None,
-            })
-            .sort("created_at", -1)
+            },
+            "created_at", limit, after, projection,
         )
 
     @staticmethod
     def assign_authority(report_id, authority_id, authority_name=None, remarks=None):
         """
         Assign the report to an authority if it's still pending and authority was notified.
-        Returns the update result object (match_count, modified_count).
+        Returns the report before the update, or None if it could not be assigned.
         """
         q = {
             "_id": ObjectId(report_id),
@@ -99,82 +163,131 @@ class ReportModel:
             "notified_authorities": {"$in": [ObjectId(authority_id)]},
             "assigned_authority": None
         }
-        update = {
-            "$set": {
-                "assigned_authority": ObjectId(authority_id),
-                "status": "accepted",
-                "updated_at": datetime.utcnow()
-            },
-            "$push": {
-                "history": {
-                    "status": "accepted",
-                    "timestamp": datetime.utcnow(),
-                    "by": authority_name or authority_id,
-                    "remarks": remarks or "Accepted by authority"
-                }
-            }
+        fields = {
+            "assigned_authority": ObjectId(authority_id),
+            "status": "accepted",
+            "updated_at": datetime.utcnow()
         }
-        return ReportModel.get_collection().update_one(q, update)
+        before = ReportModel._transition(q, fields)
+        if before:
+            ReportEventModel.record(
+                report_id, "accepted", by=authority_name or authority_id,
+                remarks=remarks or "Accepted by authority", actor_id=authority_id,
+            )
+        return before
 
     @staticmethod
     def reject_report(report_id, authority_id, authority_name=None, remarks=None):
         """
-        When an authority rejects a report (they were notified), add a history entry.
+        When an authority rejects a report (they were notified), record a history event.
         Does NOT assign the report; other authorities can still accept it.
         """
         q = {
             "_id": ObjectId(report_id),
             "notified_authorities": {"$in": [ObjectId(authority_id)]}
         }
-        update = {
-            "$push": {
-                "history": {
-                    "status": "rejected",
-                    "timestamp": datetime.utcnow(),
-                    "by": authority_name or authority_id,
-                    "remarks": remarks or "Rejected by authority"
-                }
-            },
-            "$set": {"updated_at": datetime.utcnow()}
-        }
-        return ReportModel.get_collection().update_one(q, update)
+        update = {"$set": {"updated_at": datetime.utcnow()}}
+        res = ReportModel.get_collection().update_one(q, update)
+        if res.matched_count:
+            ReportEventModel.record(
+                report_id, "rejected", by=authority_name or authority_id,
+                remarks=remarks or "Rejected by authority", actor_id=authority_id, scope=AUTHORITY_SCOPE,
+            )
+        return res
 
     @staticmethod
     def update_status(report_id, authority_id, new_status, remarks=None, authority_name=None):
         """
         Update status for a report only if the authority_id is the assigned_authority.
         Allowed statuses should be validated by caller.
+        Returns the report before the update, or None if not assigned to this authority.
         """
         q = {
             "_id": ObjectId(report_id),
             "assigned_authority": ObjectId(authority_id)
         }
 
-        update = {
-            "$set": {
-                "status": new_status,
-                "updated_at": datetime.utcnow()
-            },
-            "$push": {
-                "history": {
-                    "status": new_status,
-                    "timestamp": datetime.utcnow(),
-                    "by": authority_name or authority_id,
-                    "remarks": remarks
-                }
-            }
+        fields = {
+            "status": new_status,
+            "updated_at": datetime.utcnow()
         }
 
-        return ReportModel.get_collection().update_one(q, update)
+        before = ReportModel._transition(q, fields)
+        if before:
+            ReportEventModel.record(
+                report_id, new_status, by=authority_name or authority_id,
+                remarks=remarks, actor_id=authority_id,
+            )
+        return before
 
     @staticmethod
-    def get_completed_by_authority(authority_id):
+    def get_completed_by_authority(authority_id, limit=None, after=None, projection=None):
         """Return reports completed (or historically done) by an authority."""
-        return list(
-            ReportModel.get_collection()
-            .find({
+        return ReportModel._find_page(
+            {
                 "assigned_authority": ObjectId(authority_id),
                 "status": "completed"
-            })
-            .sort("updated_at", -1)
+            },
+            "updated_at", limit, after, projection,
+        )
+
+    # ----------------------------
+    # Prediction refresh helpers
+    # ----------------------------
+    @staticmethod
+    def find_active(projection=None, batch_size=1000):
+        """Cursor over reports that are still open (see ACTIVE_STATUSES)."""
+        return (
+            ReportModel.get_collection()
+            .find({"status": {"$in": ACTIVE_STATUSES}}, projection)
+            .batch_size(batch_size)
+        )
+
+    @staticmethod
+    def bulk_update_predictions(updates):
+        """
+        updates: list of (report_id, fields to $set). One unordered bulk_write;
+        reports closed in the meantime are left untouched.
+        """
+        if not updates:
+            return None
+        ops = [
+            UpdateOne({"_id": report_id, "status": {"$in": ACTIVE_STATUSES}}, {"$set": fields})
+            for report_id, fields in updates
+        ]
+        return ReportModel.get_collection().bulk_write(ops, ordered=False)
+
+    # ----------------------------
+    # Map helpers
+    # ----------------------------
+    @staticmethod
+    def find_in_bbox(bbox, projection=None, limit=None, types=None, statuses=None):
+        """
+        Reports whose location lies in bbox (min_lat, min_lng, max_lat, max_lng).
+        Served by the 2dsphere index on geo.
+        """
+        min_lat, min_lng, max_lat, max_lng = bbox
+        ring = [[min_lng, min_lat], [max_lng, min_lat], [max_lng, max_lat], [min_lng, max_lat], [min_lng, min_lat]]
+        query = {"geo": {"$geoWithin": {"$geometry": {
+            "type": "Polygon",
+            "coordinates": [ring],
+            # counter-clockwise ring; allows boxes wider than a hemisphere
+            "crs": {"type": "name", "properties": {"name": "urn:x-mongodb:crs:strictwinding:EPSG:4326"}},
+        }}}}
+        if types:
+            query["type"] = {"$in": list(types)}
+        if statuses:
+            query["status"] = {"$in": list(statuses)}
+        cursor = ReportModel.get_collection().find(query, projection)
+        if limit:
+            cursor = cursor.limit(limit)
+        return list(cursor)
+
+    @staticmethod
+    def backfill_geo():
+        """Set the GeoJSON geo field on reports created before it existed."""
+        res = ReportModel.get_collection().update_many(
+            {"geo": {"$exists": False}, "location.lat": {"$type": "number"}, "location.lng": {"$type": "number"}},
+            [{"$set": {"geo": {"type": "Point", "coordinates": ["$location.lng", "$location.lat"]}}}],
         )
+        return res.modified_count
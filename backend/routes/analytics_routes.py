@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required
+
+from config import Config
+from models.hotspot_model import HotspotModel
+from utils import geohash
+from utils.bbox import parse_bbox
+from utils.query_args import csv_list
+
+analytics_bp = Blueprint("analytics_bp", __name__)
+
+
+def _utc(value):
+    """ISO date/datetime as naive UTC, like the stored rollup days."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+# Report hotspots for map dashboards (served from the rollups, not the reports)
+@analytics_bp.route('/hotspots', methods=['GET'])
+@jwt_required()
+def hotspots():
+    """
+    Query: bbox=west,south,east,north, from/to (ISO dates, default last HOTSPOT_DEFAULT_DAYS days),
+    type and status (comma-separated), precision (geohash length, up to HOTSPOT_GEOHASH_PRECISION).
+    """
+    args = request.args
+    try:
+        bbox = parse_bbox(args.get("bbox"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        until = _utc(args["to"]) if args.get("to") else datetime.utcnow()
+        since = _utc(args["from"]) if args.get("from") else until - timedelta(days=Config.HOTSPOT_DEFAULT_DAYS)
+    except ValueError:
+        return jsonify({"error": "from/to must be ISO dates"}), 400
+    try:
+        precision = int(args.get("precision") or Config.HOTSPOT_GEOHASH_PRECISION)
+    except ValueError:
+        return jsonify({"error": "precision must be an integer"}), 400
+    if since > until:
+        return jsonify({"error": "from must not be after to"}), 400
+    if precision < 1:
+        return jsonify({"error": "precision must be positive"}), 400
+    precision = min(precision, Config.HOTSPOT_GEOHASH_PRECISION)
+
+    tiles = HotspotModel.find_hotspots(
+        bbox=bbox, since=since, until=until,
+        types=csv_list(args.get("type")), statuses=csv_list(args.get("status")),
+        precision=precision, limit=Config.HOTSPOT_MAX_TILES,
+    )
+
+    output = []
+    for t in tiles:
+        lat, lng = geohash.center(t["tile"])
+        output.append({**t, "lat": lat, "lng": lng, "bounds": geohash.bounds(t["tile"])})
+
+    return jsonify({
+        "hotspots": output,
+        "precision": precision,
+        "from": since.date().isoformat(),
+        "to": until.date().isoformat(),
+    }), 200
@@ -5,6 +5,8 @@ from bson import ObjectId
 from models.authority_model import AuthorityModel
 from database.mongo import mongo
 from models.report_model import ReportModel
+from utils.pagination import parse_page_args, build_page
+from utils.coords import parse_lat_lng
 
 
 
@@ -33,10 +35,9 @@ def register():
     lng_value = data.get("lng")
 
     try:
-        lat = float(lat_value)
-        lng = float(lng_value)
-    except (TypeError, ValueError):
-        return jsonify({"error": "Latitude and Longitude must be provided as numbers"}), 400
+        lat, lng = parse_lat_lng(lat_value, lng_value)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     if not all([name, email, password, station]):
         return jsonify({"error": "All fields are required"}), 400
@@ -79,7 +80,7 @@ def login():
 @jwt_required()
 def profile():
     authority_id = get_jwt_identity()
-    authority = AuthorityModel.get_collection().find_one({"_id": ObjectId(authority_id)})
+    authority = AuthorityModel.get_profile(authority_id)
 
     if not authority:
         return jsonify({"error": "Authority not found"}), 404
@@ -103,24 +104,20 @@ def update_profile():
         update_data["station"] = data["station"]
     if "lat" in data and "lng" in data:
         try:
-            lat = float(data["lat"])
-            lng = float(data["lng"])
-            update_data["area"] = {"lat": lat, "lng": lng}
-        except (TypeError, ValueError):
-            return jsonify({"error": "Latitude and Longitude must be numbers"}), 400
+            lat, lng = parse_lat_lng(data["lat"], data["lng"])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        update_data["area"] = {"lat": lat, "lng": lng}
 
     if not update_data:
         return jsonify({"error": "No valid fields to update"}), 400
 
-    result = AuthorityModel.get_collection().update_one(
-        {"_id": ObjectId(authority_id)},
-        {"$set": update_data}
-    )
+    result = AuthorityModel.update_profile(authority_id, update_data)
 
     if result.matched_count == 0:
         return jsonify({"error": "Authority not found"}), 404
 
-    authority = AuthorityModel.get_collection().find_one({"_id": ObjectId(authority_id)})
+    authority = AuthorityModel.get_profile(authority_id)
 
     return jsonify({
         "message": "Profile updated successfully",
@@ -151,10 +148,7 @@ def update_availability():
         return jsonify({"error": "is_available must be provided"}), 400
 
     # Update in MongoDB
-    mongo.db.authorities.update_one(
-        {"_id": ObjectId(user_id)},
-        {"$set": {"is_available": is_available}}
-    )
+    AuthorityModel.update_availability(user_id, is_available)
 
     return jsonify({
         "message": "Availability updated successfully",
@@ -165,10 +159,26 @@ def update_availability():
 
 
 
+# Fields serialized by /history (status events are served by /api/report/<id>/history)
+HISTORY_PROJECTION = {
+    "type": 1, "status": 1, "image_url": 1, "location": 1, "predicted_path": 1,
+    "created_at": 1, "updated_at": 1,
+}
+
 # Allowed status transitions (you can adjust as you want)
 ALLOWED_STATUSES = ["accepted", "in_progress", "cleaned", "completed", "rejected"]
 
 
+# Helper: authority display name, falling back to the id
+def get_authority_name(authority_id):
+    try:
+        authority = AuthorityModel.get_profile(authority_id)
+    except Exception as e:
+        print("Authority lookup failed:", e)
+        authority = None
+    return authority.get("name") if authority else str(authority_id)
+
+
 # Helper: Works with both JSON and multipart/form-data
 def get_request_data():
     if request.is_json:
@@ -196,17 +206,12 @@ def authority_decision():
     if not report_id or decision not in ["accept", "reject"]:
         return jsonify({"error": "report_id and decision ('accept'|'reject') required"}), 400
 
-    # optionally fetch authority name for history
-    authority = None
-    try:
-        authority = AuthorityModel.find_by_id(ObjectId(authority_id)) if isinstance(authority_id, str) else AuthorityModel.find_by_id(authority_id)
-        authority_name = authority.get("name") if authority else str(authority_id)
-    except Exception:
-        authority_name = str(authority_id)
+    # authority name for history (served from the profile cache)
+    authority_name = get_authority_name(authority_id)
 
     if decision == "accept":
-        res = ReportModel.assign_authority(report_id, authority_id, authority_name=authority_name, remarks=remarks)
-        if res.matched_count == 0:
+        accepted = ReportModel.assign_authority(report_id, authority_id, authority_name=authority_name, remarks=remarks)
+        if not accepted:
             return jsonify({"error": "Cannot accept: report may be already assigned, not pending, or you were not notified."}), 400
         return jsonify({"message": "Report accepted successfully", "status": "accepted"}), 200
 
@@ -235,30 +240,23 @@ def authority_update_status():
     if not report_id or new_status not in ALLOWED_STATUSES:
         return jsonify({"error": f"report_id and valid status required. Allowed: {ALLOWED_STATUSES}"}), 400
 
-    # ensure authority is assigned to this report
-    report = ReportModel.find_by_id(report_id)
-    if not report:
-        return jsonify({"error": "Report not found"}), 404
-
-    if not report.get("assigned_authority"):
-        return jsonify({"error": "Report is not assigned to any authority"}), 400
+    # update only matches if this authority is assigned; the report is read
+    # only when it doesn't, to explain why
+    authority_name = get_authority_name(authority_id)
+    updated = ReportModel.update_status(report_id, authority_id, new_status, remarks=remarks, authority_name=authority_name)
 
-    # assigned_authority stored as ObjectId
-    assigned = str(report.get("assigned_authority"))
-    if str(authority_id) != assigned:
-        return jsonify({"error": "You are not the assigned authority for this report"}), 403
+    if not updated:
+        report = ReportModel.find_by_id(report_id, projection={"assigned_authority": 1})
+        if not report:
+            return jsonify({"error": "Report not found"}), 404
 
-    # perform update
-    authority_name = None
-    try:
-        authority_doc = AuthorityModel.find_by_id(ObjectId(authority_id))
-        authority_name = authority_doc.get("name") if authority_doc else str(authority_id)
-    except Exception:
-        authority_name = str(authority_id)
+        if not report.get("assigned_authority"):
+            return jsonify({"error": "Report is not assigned to any authority"}), 400
 
-    res = ReportModel.update_status(report_id, authority_id, new_status, remarks=remarks, authority_name=authority_name)
+        # assigned_authority stored as ObjectId
+        if str(authority_id) != str(report.get("assigned_authority")):
+            return jsonify({"error": "You are not the assigned authority for this report"}), 403
 
-    if res.matched_count == 0:
         return jsonify({"error": "Status update failed (check permissions)"}), 400
 
     # Optionally: notify the user about status change (you can implement an email_service.notify_user)
@@ -272,7 +270,15 @@ def authority_update_status():
 @jwt_required()
 def authority_history():
     authority_id = get_jwt_identity()
-    completed = ReportModel.get_completed_by_authority(authority_id)
+    try:
+        limit, after = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    completed = ReportModel.get_completed_by_authority(
+        authority_id, limit=limit + 1, after=after, projection=HISTORY_PROJECTION
+    )
+    completed, next_cursor = build_page(completed, limit, "updated_at")
 
     out = []
     for r in completed:
@@ -285,7 +291,6 @@ def authority_history():
             "predicted_path": r.get("predicted_path", []),
             "created_at": r.get("created_at").isoformat() if r.get("created_at") else None,
             "updated_at": r.get("updated_at").isoformat() if r.get("updated_at") else None,
-            "history": r.get("history", [])
         })
 
-    return jsonify({"reports": out}), 200
\ No newline at end of file
+    return jsonify({"reports": out, "next_cursor": next_cursor}), 200
@@ -1,21 +1,36 @@
-from flask import Blueprint, jsonify, request
+import gzip
+import json
+import zipfile
+from flask import Blueprint, Response, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from bson import ObjectId
 
+from config import Config
+from utils.pagination import parse_page_args, build_page
+from utils.bbox import parse_bbox
+from utils.query_args import csv_list
+from utils.coords import parse_lat_lng
+from utils.geohash import precision_for_zoom
+
 # 🔧 Services
-from services.detection_service import run_detection
-from services.cloudinary_service import upload_image
-from services.weather_service import fetch_weather_data
-from services.prediction_service import predict_trajectory
-from services.email_service import notify_authorities
+from services.report_pipeline import STAGES, PipelineError, run_report_pipeline
+from services.ingestion_service import submit_report_job
+from services.bulk_ingestion import ingest_survey, items_from_files, items_from_zip
+from services.realtime import feed_bus, sse_stream
 
 # 🔧 Models
-from models.authority_model import AuthorityModel
+from models.job_model import JobModel
 from models.report_model import ReportModel
+from models.report_event_model import ReportEventModel
+from models.hotspot_model import HotspotModel
 
 report_bp = Blueprint("report_bp", __name__)
 
 
+def _iso(value):
+    return value.isoformat() if value else None
+
+
 # Create new report (User)
 @report_bp.route('/create', methods=['POST'])
 @jwt_required()
@@ -32,74 +47,119 @@ def create_report():
         return jsonify({"error": "Image, latitude, and longitude are required"}), 400
 
     try:
-        lat = float(lat_val)
-        lng = float(lng_val)
-    except (TypeError, ValueError):
-        return jsonify({"error": "Latitude and Longitude must be numeric"}), 400
+        lat, lng = parse_lat_lng(lat_val, lng_val)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Async mode: queue the pipeline and let the client poll the job
+    async_flag = str(data.get("async", Config.REPORT_ASYNC_INGESTION)).lower() in ["true", "1", "yes"]
+    if async_flag:
+        job_id = submit_report_job(user_id, image_file, lat, lng)
+        return jsonify({
+            "message": "Report accepted for processing",
+            "job_id": str(job_id),
+            "status_url": f"/api/report/jobs/{job_id}",
+        }), 202
 
-    # 1) Run ML detection (YOLO + optional debris model)
     try:
-        processed_path, detected_type, confidences = run_detection(image_file)
-    except Exception as e:
-        print("Detection failed:", e)
-        return jsonify({"error": "Failed to run ML models", "details": str(e)}), 500
+        result = run_report_pipeline(user_id, image_file, lat, lng)
+    except PipelineError as e:
+        return jsonify(e.to_dict()), e.status_code
 
-    if detected_type == "none":
-        return jsonify({"error": "No debris or oil spill detected in the image"}), 400
+    return jsonify(result), 201
 
-    report_type = detected_type
 
-    # 2) Upload annotated image to Cloudinary
+# Bulk survey upload (drone / patrol image batches)
+@report_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_create_reports():
+    """
+    multipart/form-data with either:
+      images: one or more image files, or
+      archive: a .zip of images
+    Optional:
+      coords: JSON object {"<filename>": {"lat": .., "lng": ..}}
+      lat, lng: fallback location for images without form or EXIF coordinates
+    """
+    user_id = get_jwt_identity()
+
     try:
-        with open(processed_path, "rb") as f:
-            image_url = upload_image(f)
-    except Exception as e:
-        print("Cloudinary upload failed:", e)
-        return jsonify({"error": "Failed to upload image", "details": str(e)}), 500
-
-    # 3) Fetch weather and current data
-    weather = fetch_weather_data(lat, lng)
-
-    # 4) Predict debris/oil drift trajectory
-    predicted_path = predict_trajectory(
-        lat, lng, weather, report_type, steps=6, interval_minutes=30
-    )
+        if "archive" in request.files:
+            items = items_from_zip(request.files["archive"].stream)
+        else:
+            items = items_from_files(request.files.getlist("images"))
+    except zipfile.BadZipFile:
+        return jsonify({"error": "archive must be a valid zip file"}), 400
 
-    # 5) Find authorities nearby (within 10 km)
-    nearby_authorities = AuthorityModel.get_nearby_authorities(lat, lng, radius_km=10)
-    notified_ids = [a["_id"] for a in nearby_authorities]
-
-    # 6) Save report in MongoDB
-    report_id = ReportModel.create_report(
-        user_id=user_id,
-        image_url=image_url,
-        report_type=report_type,
-        lat=lat,
-        lng=lng,
-        predicted_path=predicted_path,
-        weather_data=weather,
-        notified_authorities=notified_ids,
-        ml_output={
-            "debris_confidence": confidences.get("debris"),
-            "oil_confidence": confidences.get("oil"),
-        },
-    )
+    if not items:
+        return jsonify({"error": "Provide image files under 'images' or a zip under 'archive'"}), 400
+    if len(items) > Config.BULK_MAX_IMAGES:
+        return jsonify({"error": f"At most {Config.BULK_MAX_IMAGES} images per batch"}), 400
 
-    # 7) Notify nearby authorities by email
     try:
-        notify_authorities(lat, lng, report_type, image_url, predicted_path, radius_km=10)
-    except Exception as e:
-        print("Email notification failed:", e)
+        coords = json.loads(request.form.get("coords") or "{}")
+        if not isinstance(coords, dict):
+            raise ValueError
+    except ValueError:
+        return jsonify({"error": "coords must be a JSON object keyed by filename"}), 400
+
+    default_location = None
+    lat_val = request.form.get("lat")
+    lng_val = request.form.get("lng") or request.form.get("long")
+    if lat_val and lng_val:
+        try:
+            default_location = parse_lat_lng(lat_val, lng_val)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    results = ingest_survey(user_id, items, coords=coords, default_location=default_location)
+
+    summary = {"total": len(results)}
+    for status in ["reported", "skipped", "failed"]:
+        summary[status] = sum(1 for r in results if r["status"] == status)
+
+    return jsonify({"summary": summary, "results": results}), 201 if summary["reported"] else 200
 
-    # 8) Send final response
+
+# Async report job status (User)
+@report_bp.route('/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def report_job_status(job_id):
+    user_id = get_jwt_identity()
+    if not ObjectId.is_valid(job_id):
+        return jsonify({"error": "Invalid job id"}), 400
+
+    job = JobModel.find_for_user(job_id, user_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    stages = job.get("stages", {})
     return jsonify({
-        "message": f"{report_type.replace('_',' ').title()} detected and reported successfully",
-        "report_id": str(report_id),
-        "predicted_path": predicted_path,
-        "confidences": confidences,
-        "notified_authorities_count": len(notified_ids),
-        "image_url": image_url,
-    }), 201
+        "job_id": str(job["_id"]),
+        "status": job.get("status"),
+        "stages": [
+            {
+                "name": name,
+                "status": stages.get(name, {}).get("status"),
+                "started_at": _iso(stages.get(name, {}).get("started_at")),
+                "finished_at": _iso(stages.get(name, {}).get("finished_at")),
+            }
+            for name in STAGES
+        ],
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "created_at": _iso(job.get("created_at")),
+        "updated_at": _iso(job.get("updated_at")),
+    }), 200
+
+
+# Fields serialized by the list endpoints below
+LIST_PROJECTION = {
+    "type": 1, "status": 1, "image_url": 1, "location": 1,
+    "predicted_path": 1, "created_at": 1,
+}
+# Authorities also get the ensemble search area
+ASSIGNED_PROJECTION = {**LIST_PROJECTION, "predicted_area": 1}
 
 
 # User Report History
@@ -107,21 +167,27 @@ def create_report():
 @jwt_required()
 def user_history():
     user_id = get_jwt_identity()
-    reports = ReportModel.find_by_user(user_id)
+    try:
+        limit, after = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    reports = ReportModel.find_by_user(user_id, limit=limit + 1, after=after, projection=LIST_PROJECTION)
+    reports, next_cursor = build_page(reports, limit, "created_at")
 
     output = []
     for r in reports:
         output.append({
             "id": str(r["_id"]),
-            "type": r.get("report_type"),
+            "type": r.get("type"),
             "status": r.get("status", "pending"),
             "image_url": r.get("image_url"),
             "location": r.get("location"),
             "predicted_path": r.get("predicted_path", []),
-            "created_at": r.get("created_at").isoformat() if r.get("created_at") else None,
+            "created_at": _iso(r.get("created_at")),
         })
 
-    return jsonify({"reports": output}), 200
+    return jsonify({"reports": output, "next_cursor": next_cursor}), 200
 
 
 # Authority: Assigned Reports (within their region)
@@ -129,17 +195,153 @@ def user_history():
 @jwt_required()
 def authority_assigned_reports():
     authority_id = get_jwt_identity()
-    assigned_reports = ReportModel.get_pending_for_authority(authority_id)
+    try:
+        limit, after = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    assigned_reports = ReportModel.get_pending_for_authority(
+        authority_id, limit=limit + 1, after=after, projection=ASSIGNED_PROJECTION
+    )
+    assigned_reports, next_cursor = build_page(assigned_reports, limit, "created_at")
 
     output = []
     for r in assigned_reports:
         output.append({
             "id": str(r["_id"]),
-            "type": r.get("report_type"),
+            "type": r.get("type"),
             "status": r.get("status", "pending"),
             "image_url": r.get("image_url"),
             "location": r.get("location"),
             "predicted_path": r.get("predicted_path", []),
+            "predicted_area": r.get("predicted_area"),
         })
 
-    return jsonify({"reports": output}), 200
\ No newline at end of file
+    return jsonify({"reports": output, "next_cursor": next_cursor}), 200
+
+
+# Status history of one report (owner, notified or assigned authority)
+@report_bp.route('/<report_id>/history', methods=['GET'])
+@jwt_required()
+def report_history(report_id):
+    identity = get_jwt_identity()
+    if not ObjectId.is_valid(report_id):
+        return jsonify({"error": "Invalid report id"}), 400
+    try:
+        limit, after = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    report = ReportModel.find_by_id(
+        report_id, projection={"user_id": 1, "notified_authorities": 1, "assigned_authority": 1, "status": 1}
+    )
+    if not report:
+        return jsonify({"error": "Report not found"}), 404
+
+    allowed = {str(report.get("user_id")), str(report.get("assigned_authority"))}
+    allowed.update(str(a) for a in report.get("notified_authorities", []))
+    if str(identity) not in allowed:
+        return jsonify({"error": "You do not have access to this report"}), 403
+
+    events = ReportEventModel.find_for_report(report_id, limit=limit + 1, after=after)
+    events, next_cursor = build_page(events, limit, "timestamp")
+
+    return jsonify({
+        "report_id": report_id,
+        "status": report.get("status"),
+        "events": [
+            {
+                "id": str(e["_id"]),
+                "status": e.get("status"),
+                "timestamp": _iso(e.get("timestamp")),
+                "by": e.get("by"),
+                "remarks": e.get("remarks"),
+            }
+            for e in events
+        ],
+        "next_cursor": next_cursor,
+    }), 200
+
+
+# Map viewport as GeoJSON
+GEOJSON_PROJECTION = {"geo": 1, "type": 1, "status": 1}
+
+
+def _point(lng, lat, properties):
+    # ~1 m precision is plenty for a map marker and keeps the payload small
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [round(lng, 5), round(lat, 5)]},
+        "properties": properties,
+    }
+
+
+def _geojson_response(payload):
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    headers = {"Vary": "Accept-Encoding"}
+    if len(body) >= Config.GEOJSON_GZIP_MIN_BYTES and "gzip" in request.headers.get("Accept-Encoding", ""):
+        body = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+    return Response(body, mimetype="application/geo+json", headers=headers)
+
+
+@report_bp.route('/geojson', methods=['GET'])
+@jwt_required()
+def reports_geojson():
+    """
+    Reports in the viewport as a GeoJSON FeatureCollection.
+    Query: bbox=west,south,east,north (required), zoom, type / status (comma-separated).
+    Up to GEOJSON_CLUSTER_MAX_ZOOM (or when the viewport holds more than
+    GEOJSON_MAX_FEATURES reports) features are clusters read from the hotspot
+    rollups, so the payload and query cost depend on tiles rather than reports.
+    """
+    try:
+        bbox = parse_bbox(request.args.get("bbox"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        zoom = int(request.args.get("zoom", 0))
+    except ValueError:
+        return jsonify({"error": "zoom must be an integer"}), 400
+    if not bbox:
+        return jsonify({"error": "bbox is required"}), 400
+    if not 0 <= zoom <= 24:
+        return jsonify({"error": "zoom must be between 0 and 24"}), 400
+
+    types, statuses = csv_list(request.args.get("type")), csv_list(request.args.get("status"))
+
+    if zoom > Config.GEOJSON_CLUSTER_MAX_ZOOM:
+        limit = Config.GEOJSON_MAX_FEATURES
+        reports = ReportModel.find_in_bbox(
+            bbox, projection=GEOJSON_PROJECTION, limit=limit + 1, types=types, statuses=statuses,
+        )
+        if len(reports) <= limit:
+            features = [
+                _point(*r["geo"]["coordinates"], {"id": str(r["_id"]), "type": r.get("type"), "status": r.get("status")})
+                for r in reports
+            ]
+            return _geojson_response({"type": "FeatureCollection", "zoom": zoom, "clustered": False, "features": features})
+
+    precision = precision_for_zoom(zoom, max_precision=Config.HOTSPOT_GEOHASH_PRECISION)
+    clusters = HotspotModel.find_clusters(
+        bbox, precision=precision, types=types, statuses=statuses, limit=Config.GEOJSON_MAX_FEATURES,
+    )
+    features = [
+        _point(c["lng"], c["lat"], {"cluster": True, "point_count": c["count"], "tile": c["tile"]})
+        for c in clusters
+    ]
+    return _geojson_response({"type": "FeatureCollection", "zoom": zoom, "clustered": True, "features": features})
+
+
+# Live feed (Server-Sent Events) of new reports and status changes for this user/authority
+# (an authority also hears report_rejected for reports it declined).
+# EventSource can't set headers: this route alone also accepts /api/report/feed?jwt=<access token>
+@report_bp.route('/feed', methods=['GET'])
+@jwt_required(locations=["headers", "query_string"])
+def report_feed():
+    subscription = feed_bus.subscribe(get_jwt_identity())
+    stream = sse_stream(subscription, Config.REALTIME_HEARTBEAT_SECONDS)
+    return Response(stream, mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
@@ -0,0 +1,178 @@
+# services/bulk_ingestion.py
+import io
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from services.detection_service import decode_image, detect_images
+from services.cloudinary_service import upload_image
+from services.weather_service import fetch_weather_data, grid_cell
+from services.prediction_service import predict_trajectory, predict_trajectory_ensemble
+from services.email_service import build_authority_notifications
+from models.authority_model import AuthorityModel
+from models.report_model import ReportModel
+from models.notification_model import NotificationModel
+from utils.exif import gps_from_exif
+from utils.coords import parse_lat_lng
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp"}
+
+# Upload / weather / authority lookups for positives run side by side
+_io_pool = ThreadPoolExecutor(max_workers=Config.BULK_IO_WORKERS, thread_name_prefix="bulk-io")
+
+
+class SurveyItem:
+    """One image of a survey batch; bytes are read only when its chunk is processed."""
+
+    def __init__(self, filename, read, lat=None, lng=None):
+        self.filename = filename
+        self._read = read
+        self.lat = lat
+        self.lng = lng
+
+    def read(self):
+        return self._read()
+
+
+def items_from_files(files):
+    return [SurveyItem(f.filename, f.read) for f in files if f and f.filename]
+
+
+def items_from_zip(file_obj):
+    """Image entries of an uploaded zip, read lazily from the archive."""
+    archive = zipfile.ZipFile(file_obj)
+    items = []
+    for info in archive.infolist():
+        name = info.filename
+        if info.is_dir() or name.startswith("__MACOSX/") or os.path.basename(name).startswith("."):
+            continue
+        if os.path.splitext(name)[1].lower() not in IMAGE_EXTENSIONS:
+            continue
+        items.append(SurveyItem(name, lambda n=name: archive.read(n)))
+    return items
+
+
+def _resolve_coordinates(item, data, coords, default):
+    """
+    Per-file form coordinates, then EXIF GPS, then the batch-wide lat/lng.
+    Raises ValueError on coordinates the geo indexes would refuse.
+    """
+    entry = coords.get(item.filename) or coords.get(os.path.basename(item.filename))
+    if entry:
+        if not isinstance(entry, dict):
+            raise ValueError("coords entries must be {\"lat\": .., \"lng\": ..}")
+        return parse_lat_lng(entry.get("lat"), entry.get("lng", entry.get("long")))
+    gps = gps_from_exif(data)
+    if gps:
+        return parse_lat_lng(*gps)
+    return default
+
+
+def _prepare_report(user_id, filename, lat, lng, annotated_jpeg, report_type, confidences, authorities_future):
+    """Everything after detection for one positive image; returns the report doc (with its outbox messages)."""
+    image_url = upload_image(io.BytesIO(annotated_jpeg))
+    weather = fetch_weather_data(lat, lng)
+    predicted_path = predict_trajectory(lat, lng, weather, report_type, steps=6, interval_minutes=30)
+    predicted_area = None
+    if Config.PREDICTION_ENSEMBLE_SIZE > 0:
+        predicted_area = predict_trajectory_ensemble(
+            lat, lng, weather, report_type, steps=6, interval_minutes=30,
+            n_particles=Config.PREDICTION_ENSEMBLE_SIZE,
+        )
+    authorities = authorities_future.result()
+    report = ReportModel.build_report(
+        user_id=user_id,
+        image_url=image_url,
+        report_type=report_type,
+        lat=lat,
+        lng=lng,
+        predicted_path=predicted_path,
+        predicted_area=predicted_area,
+        weather_data=weather,
+        notified_authorities=[a["_id"] for a in authorities],
+        ml_output={
+            "debris_confidence": confidences.get("debris"),
+            "oil_confidence": confidences.get("oil"),
+            "source_filename": filename,
+        },
+        notifications=build_authority_notifications(
+            authorities, lat, lng, report_type, image_url, predicted_path,
+        ),
+    )
+    return report
+
+
+def ingest_survey(user_id, items, coords=None, default_location=None):
+    """
+    Detect over a survey batch in chunks of BULK_BATCH_SIZE, skip images with no
+    detection, and insert every resulting report with one insert_many.
+    Returns per-image results (same order as items).
+    """
+    coords = coords or {}
+    results = [{"filename": item.filename, "status": "pending"} for item in items]
+    prepared = []  # (result index, future)
+
+    # nearby authorities are shared by every image in the same grid cell; only this
+    # thread fills the dict (one lookup per cell), the I/O workers just wait on it
+    authority_futures = {}
+
+    def authorities_for(lat, lng):
+        cell = grid_cell(lat, lng)
+        if cell not in authority_futures:
+            authority_futures[cell] = _io_pool.submit(AuthorityModel.get_nearby_authorities, lat, lng, radius_km=10)
+        return authority_futures[cell]
+
+    batch_size = max(1, Config.BULK_BATCH_SIZE)
+    for start in range(0, len(items), batch_size):
+        chunk = []
+        for idx in range(start, min(start + batch_size, len(items))):
+            item = items[idx]
+            try:
+                data = item.read()
+                location = _resolve_coordinates(item, data, coords, default_location)
+                if not location:
+                    results[idx].update(status="failed", error="No coordinates in form or EXIF")
+                    continue
+                chunk.append((idx, decode_image(data), location))
+            except Exception as e:
+                results[idx].update(status="failed", error=str(e))
+
+        if not chunk:
+            continue
+        detections = detect_images([image for _, image, _ in chunk])
+
+        for (idx, _, (lat, lng)), (annotated_jpeg, detected_type, confidences) in zip(chunk, detections):
+            results[idx].update(confidences=confidences, location={"lat": lat, "lng": lng})
+            if detected_type == "none":
+                results[idx]["status"] = "skipped"
+                continue
+            results[idx]["type"] = detected_type
+            future = _io_pool.submit(
+                _prepare_report, user_id, items[idx].filename, lat, lng,
+                annotated_jpeg, detected_type, confidences, authorities_for(lat, lng),
+            )
+            prepared.append((idx, future))
+
+    reports, owners = [], []
+    for idx, future in prepared:
+        try:
+            reports.append(future.result())
+            owners.append(idx)
+        except Exception as e:
+            print("Bulk report preparation failed:", e)
+            results[idx].update(status="failed", error=str(e))
+
+    report_ids = ReportModel.insert_reports(reports)
+
+    for report, report_id, idx in zip(reports, report_ids, owners):
+        if report_id is None:
+            results[idx].update(status="failed", error="Report could not be saved")
+            continue
+        results[idx].update(status="reported", report_id=str(report_id), image_url=report["image_url"])
+        try:
+            NotificationModel.fan_out(report_id, report.get("pending_notifications"))
+        except Exception as e:
+            # the messages are stored on the report; the dispatcher fans them out on its next poll
+            print("⚠️ Notification fan-out deferred to the dispatcher:", e)
+
+    return results
@@ -2,6 +2,7 @@
 import cloudinary
 import cloudinary.uploader
 import os
+from utils.metrics import track_external
 
 # Set these env vars in your .env or config
 cloudinary.config(
@@ -23,8 +24,20 @@ def upload_image(file_obj, folder="oceanguard/reports"):
     # Accept either FileStorage or path
     if hasattr(file_obj, "read"):
         # Cloudinary accepts file-like objects or temporary path
-        res = cloudinary.uploader.upload(file_obj, folder=folder, resource_type="image")
-        return res.get("secure_url")
+        return upload_asset(file_obj, folder)["secure_url"]
     else:
         # If string URL already, return as is
         return str(file_obj)
+
+
+def upload_asset(file_obj, folder="oceanguard/reports"):
+    """Upload a file-like object; returns {"secure_url", "public_id"} (public_id is what delete_image takes)."""
+    with track_external("cloudinary"):
+        res = cloudinary.uploader.upload(file_obj, folder=folder, resource_type="image")
+    return {"secure_url": res.get("secure_url"), "public_id": res.get("public_id")}
+
+
+def delete_image(public_id):
+    """Remove an uploaded image (e.g. one whose report was never saved)."""
+    with track_external("cloudinary"):
+        cloudinary.uploader.destroy(public_id, resource_type="image")
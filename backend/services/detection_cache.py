@@ -0,0 +1,81 @@
+# services/detection_cache.py
+import hashlib
+import threading
+from collections import OrderedDict
+import cv2
+import numpy as np
+from config import Config
+from utils.ttl_cache import TTLCache, MongoCacheBackend
+
+
+def content_hash(data):
+    """Exact fingerprint of the uploaded bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def perceptual_hash(image):
+    """64-bit difference hash (dHash) of a decoded BGR image."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+class DetectionResultCache:
+    """
+    Detection results (type, confidences, annotated image URL) keyed by content hash,
+    with an optional perceptual-hash index for near-duplicate images.
+    """
+
+    def __init__(self, maxsize=4096, ttl=86400, perceptual=True, max_distance=4, backend=None):
+        self.results = TTLCache(maxsize=maxsize, ttl=ttl, backend=backend, name="detection")
+        self.perceptual = perceptual
+        self.max_distance = max_distance
+        self._phashes = OrderedDict()  # phash -> content hash
+        self._lock = threading.Lock()
+        self.similar_hits = 0
+
+    def get(self, digest):
+        return self.results.get(digest)
+
+    def get_similar(self, phash):
+        """Closest cached entry within max_distance bits of phash, if any."""
+        if not self.perceptual or phash is None:
+            return None
+        with self._lock:
+            candidates = list(self._phashes.items())
+        best = None
+        for known, digest in candidates:
+            distance = bin(known ^ phash).count("1")
+            if distance <= self.max_distance and (best is None or distance < best[0]):
+                best = (distance, digest)
+        if best is None:
+            return None
+        entry = self.results.get(best[1])
+        if entry is not None:
+            with self._lock:
+                self.similar_hits += 1
+        return entry
+
+    def put(self, digest, entry, phash=None):
+        self.results.set(digest, entry)
+        if self.perceptual and phash is not None:
+            with self._lock:
+                self._phashes[phash] = digest
+                self._phashes.move_to_end(phash)
+                while len(self._phashes) > self.results.maxsize:
+                    self._phashes.popitem(last=False)
+
+    def stats(self):
+        stats = self.results.stats()
+        stats["similar_hits"] = self.similar_hits
+        return stats
+
+
+detection_cache = DetectionResultCache(
+    maxsize=Config.DETECTION_CACHE_SIZE,
+    ttl=Config.DETECTION_CACHE_TTL_SECONDS,
+    perceptual=Config.DETECTION_CACHE_PERCEPTUAL,
+    max_distance=Config.DETECTION_CACHE_MAX_DISTANCE,
+    backend=MongoCacheBackend("detection_cache") if Config.DETECTION_CACHE_SHARED else None,
+)
@@ -1,61 +1,203 @@
-import os
-import tempfile
+import io
+import logging
+import math
 import cv2
-from ultralytics import YOLO
+import numpy as np
+from PIL import Image
+from config import Config
+from services.inference_backends import Detections
+from services.inference_scheduler import BatchInferenceScheduler
+from services.model_registry import registry
+from services.tiling import merge_tile_detections, tile_windows
 
 
 # ---------------------------------------------------------------------
-# 🧩 Model paths (relative to backend/)
+# ⚙️ Load models (YOLO oil spill + optional debris classifier; backend per Config)
 # ---------------------------------------------------------------------
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-ML_MODELS_DIR = os.path.join(BASE_DIR, "..", "ml_Models")
+oil_model = registry.get("oil")
+debris_model = registry.get("debris")
 
-OIL_MODEL_PATH = os.path.join(ML_MODELS_DIR, "oilspill_detector.pt")
 
-# Verify path before loading
-if not os.path.exists(OIL_MODEL_PATH):
-    raise FileNotFoundError(f"❌ Oil-spill model not found at {OIL_MODEL_PATH}")
+# Concurrent requests share the model through a micro-batching scheduler
+oil_scheduler = BatchInferenceScheduler(
+    oil_model.predict_batch,
+    max_batch_size=Config.INFERENCE_MAX_BATCH_SIZE,
+    max_wait_ms=Config.INFERENCE_MAX_WAIT_MS,
+    name="oil-yolo",
+)
+
+# The debris model gets its own batching thread so both models run in parallel
+debris_scheduler = BatchInferenceScheduler(
+    debris_model.predict_batch,
+    max_batch_size=Config.INFERENCE_MAX_BATCH_SIZE,
+    max_wait_ms=Config.INFERENCE_MAX_WAIT_MS,
+    name="debris-tf",
+) if debris_model else None
+
+if debris_model is None:
+    # every image then gets debris_conf = 0.0, so only oil spills are ever detected
+    logging.getLogger(__name__).warning(
+        "Debris model disabled: detection runs oil-only (set DEBRIS_MODEL_BACKEND=onnx/openvino with an export, "
+        "or ship the SavedModel variables/ next to %s)", "debris_detector.pb",
+    )
+
 
 # ---------------------------------------------------------------------
-# ⚙️ Load YOLO (oil spill) model
+# 🖼️ In-memory image helpers
 # ---------------------------------------------------------------------
-print("🔹 Loading Oil-Spill YOLO model...")
-oil_model = YOLO(OIL_MODEL_PATH)
+# JPEG decoders can scale by 1/2, 1/4 or 1/8 while decoding
+_DECODE_SCALES = [
+    (1, cv2.IMREAD_COLOR),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+]
+
+
+def _working_side(width, height):
+    """Longest side a frame is brought down to before inference; None keeps full resolution for tiling."""
+    mode = Config.TILED_DETECTION
+    if mode == "always" or (mode == "auto" and width * height > Config.TILE_MIN_PIXELS):
+        return None
+    return Config.INFERENCE_MAX_IMAGE_SIDE
+
+
+def _decode_plan(data):
+    """
+    (imdecode flag, target longest side) for an upload, from its header only.
+    Picks the largest JPEG decode reduction that stays under MAX_DECODE_PIXELS
+    without dropping below the working resolution.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            width, height = img.size
+    except Exception:
+        return cv2.IMREAD_COLOR, Config.INFERENCE_MAX_IMAGE_SIDE
+    target = _working_side(width, height)
+    for factor, flag in _DECODE_SCALES:
+        fits = width * height / (factor * factor) <= Config.MAX_DECODE_PIXELS
+        next_too_small = target is None or max(width, height) / (factor * 2) < target
+        if fits and next_too_small:
+            return flag, target
+    return _DECODE_SCALES[-1][1], target
+
+
+def decode_image(image_file):
+    """
+    Decode an uploaded FileStorage (or raw bytes) once, straight into a BGR ndarray
+    no larger than the working resolution (the annotated upload is drawn on it too).
+    """
+    data = image_file if isinstance(image_file, (bytes, bytearray)) else image_file.read()
+    flag, target = _decode_plan(data)
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flag)
+    if image is None:
+        raise ValueError("Uploaded file is not a readable image")
+    if target and max(image.shape[:2]) > target:
+        scale = target / max(image.shape[:2])
+        size = (max(1, int(image.shape[1] * scale)), max(1, int(image.shape[0] * scale)))
+        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    return image
+
+
+def encode_jpeg(image, quality=90):
+    """Encode a BGR ndarray to JPEG bytes."""
+    ok, buf = cv2.imencode(".jpg", image, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    if not ok:
+        raise ValueError("Failed to encode annotated image")
+    return buf.tobytes()
 
 
 # ---------------------------------------------------------------------
-# 🧠 Detection function
+# 🧩 Tiled detection (large aerial frames)
 # ---------------------------------------------------------------------
-def run_oil_detection(image_path: str):
-    """Run YOLOv8 oil-spill detection."""
-    results = oil_model(image_path)
-    conf = max([r.boxes.conf.max().item() for r in results if len(r.boxes) > 0], default=0.0)
-    output_path = results[0].save(filename="oil_detection_output.jpg")
-    return str(output_path), conf
+def use_tiling(image):
+    mode = Config.TILED_DETECTION
+    if mode == "always":
+        return True
+    return mode == "auto" and image.shape[0] * image.shape[1] > Config.TILE_MIN_PIXELS
+
+
+def run_tiled_oil_detection(image, tile_size=None, overlap=None):
+    """
+    Oil detection over overlapping tiles of a large frame. Tiles are crops (views)
+    of the decoded frame and go through the shared scheduler one model batch at a
+    time; boxes are mapped back to frame coordinates and merged with NMS.
+    Returns the same dict as the model's predict_batch (boxes / confidences / classes / result).
+    """
+    tile_size = tile_size or Config.TILE_SIZE
+    overlap = Config.TILE_OVERLAP if overlap is None else overlap
+    height, width = image.shape[:2]
+
+    # Bound CPU cost: shrink the frame until it needs at most TILE_MAX_TILES tiles
+    scale = 1.0
+    work = image
+    windows = tile_windows(height, width, tile_size, overlap)
+    while len(windows) > Config.TILE_MAX_TILES:
+        scale *= math.sqrt(Config.TILE_MAX_TILES / len(windows)) * 0.95
+        work = cv2.resize(image, (max(1, int(width * scale)), max(1, int(height * scale))), interpolation=cv2.INTER_AREA)
+        windows = tile_windows(work.shape[0], work.shape[1], tile_size, overlap)
+
+    tile_outputs = []
+    batch_size = Config.INFERENCE_MAX_BATCH_SIZE
+    for start in range(0, len(windows), batch_size):
+        chunk = windows[start:start + batch_size]
+        futures = [oil_scheduler.submit(work[y0:y1, x0:x1]) for x0, y0, x1, y1 in chunk]
+        tile_outputs.extend((window, future.result()) for window, future in zip(chunk, futures))
+
+    # Back to frame coordinates; duplicates from overlapping tiles merged per class
+    boxes, confidences, classes = merge_tile_detections(tile_outputs, scale, Config.TILE_MERGE_IOU)
+
+    merged = Detections(image, boxes, confidences, classes, getattr(oil_model, "names", {}))
+    return {"boxes": merged.boxes, "confidences": merged.confidences, "classes": merged.classes, "result": merged}
+
+
+def run_debris_detection(image):
+    """Debris probability for a decoded image; 0.0 when the debris model is unavailable."""
+    if debris_scheduler is None:
+        return 0.0
+    return debris_scheduler.run(image)
+
+
+def classify(oil_conf, debris_conf):
+    """Merge both model outputs into a single detection type."""
+    oil_hit = oil_conf > Config.OIL_CONFIDENCE_THRESHOLD
+    debris_hit = debris_conf > Config.DEBRIS_CONFIDENCE_THRESHOLD
+    if oil_hit and (not debris_hit or oil_conf >= debris_conf):
+        return "oil_spill"
+    if debris_hit:
+        return "debris"
+    return "none"
 
 
 # ---------------------------------------------------------------------
-# 🚀 Combined detection (temporary single-model)
+# 🚀 Combined detection (oil + debris in parallel)
 # ---------------------------------------------------------------------
-def run_detection(image_file):
+def detect_images(images):
     """
-    For now, only runs oil-spill YOLO model.
-    Later we'll merge debris model when available.
+    Run both models over already-decoded images. All images are queued before
+    any result is awaited, so the schedulers can batch them (large frames in
+    tiled mode are detected tile batch by tile batch when their turn comes).
+    Returns [(annotated JPEG bytes or None, detected type, confidences)] in input order.
     """
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
-        image_file.save(tmp.name)
-        temp_path = tmp.name
+    oil_futures = [None if use_tiling(img) else oil_scheduler.submit(img) for img in images]
+    debris_futures = [debris_scheduler.submit(img) if debris_scheduler else None for img in images]
 
-    # Run YOLO detection
-    output_path, oil_conf = run_oil_detection(temp_path)
+    outputs = []
+    for img, oil_future, debris_future in zip(images, oil_futures, debris_futures):
+        oil_output = oil_future.result() if oil_future else run_tiled_oil_detection(img)
+        oil_conf = max(oil_output["confidences"], default=0.0)
+        debris_conf = debris_future.result() if debris_future else 0.0
+        detected_type = classify(oil_conf, debris_conf)
+        # only positives are uploaded, so skip encoding the rest
+        annotated_jpeg = encode_jpeg(oil_output["result"].plot()) if detected_type != "none" else None
+        outputs.append((annotated_jpeg, detected_type, {"oil": oil_conf, "debris": debris_conf}))
+    return outputs
 
-    # For now, no debris model, so debris_conf = 0.0
-    debris_conf = 0.0
 
-    # Decide classification result
-    if oil_conf > 0.5:
-        detected_type = "oil_spill"
-    else:
-        detected_type = "none"
-
-    return output_path, detected_type, {"oil": oil_conf, "debris": debris_conf}
+def run_detection(image_file):
+    """
+    Decode the upload once and run both models on it concurrently.
+    Returns (annotated JPEG bytes, detected type, confidences).
+    """
+    image = decode_image(image_file)
+    return detect_images([image])[0]
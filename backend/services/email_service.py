@@ -1,22 +1,73 @@
-import os
-from models.authority_model import AuthorityModel
-# For production use an email provider like SendGrid, SES, etc.
-# Here we provide a placeholder that prints and can be extended.
-
-def notify_authorities(lat, lng, report_type, image_url, predicted_path, radius_km=10):
-    authorities = AuthorityModel.get_nearby_authorities(lat, lng, radius_km)
-    emails_sent = []
-    for a in authorities:
-        to = a.get("email")
-        subject = f"New {report_type.replace('_', ' ').title()} reported nearby"
-        body = f"""
+import smtplib
+from email.message import EmailMessage
+from config import Config
+from models.notification_model import NotificationModel
+# For production point SMTP_* at an email provider like SendGrid, SES, etc.
+# Without SMTP_HOST messages are printed instead of sent.
+
+def build_authority_message(lat, lng, report_type, image_url, predicted_path):
+    subject = f"New {report_type.replace('_', ' ').title()} reported nearby"
+    body = f"""
 New report at ({lat}, {lng})
 Type: {report_type}
 Image: {image_url}
 Predicted path: {predicted_path}
 Please login to OceanGuard to accept the request.
 """
-        # Replace this with real email sending code
-        print(f"[Email] To: {to}\nSubject: {subject}\n{body}")
-        emails_sent.append(to)
-    return emails_sent
+    return subject, body
+
+
+def build_authority_notifications(authorities, lat, lng, report_type, image_url, predicted_path):
+    """
+    One outbox message per authority (already looked up by the caller). They are
+    stored with the report insert and fanned out to the outbox for the dispatcher.
+    """
+    subject, body = build_authority_message(lat, lng, report_type, image_url, predicted_path)
+    recipients = [{"authority_id": a.get("_id"), "email": a.get("email")} for a in authorities]
+    return NotificationModel.build_messages(recipients, subject, body)
+
+
+def _to_email(message):
+    msg = EmailMessage()
+    msg["From"] = Config.MAIL_FROM
+    msg["To"] = message["to"]
+    msg["Subject"] = message["subject"]
+    msg.set_content(message["body"])
+    return msg
+
+
+def send_batch(messages):
+    """
+    Send outbox messages over a single SMTP connection.
+    Returns (sent_ids, failures) where failures maps message _id -> error.
+    """
+    if not messages:
+        return [], {}
+
+    if not Config.SMTP_HOST:
+        # Placeholder transport
+        for m in messages:
+            print(f"[Email] To: {m['to']}\nSubject: {m['subject']}\n{m['body']}")
+        return [m["_id"] for m in messages], {}
+
+    sent, failures = [], {}
+    try:
+        with smtplib.SMTP(Config.SMTP_HOST, Config.SMTP_PORT, timeout=Config.SMTP_TIMEOUT_SECONDS) as smtp:
+            if Config.SMTP_USE_TLS:
+                smtp.starttls()
+            if Config.SMTP_USERNAME:
+                smtp.login(Config.SMTP_USERNAME, Config.SMTP_PASSWORD)
+            for m in messages:
+                try:
+                    smtp.send_message(_to_email(m))
+                    sent.append(m["_id"])
+                except smtplib.SMTPServerDisconnected:
+                    raise
+                except smtplib.SMTPException as e:
+                    failures[m["_id"]] = e
+    except (smtplib.SMTPException, OSError) as e:
+        # connection-level failure: everything not yet sent is retried
+        for m in messages:
+            if m["_id"] not in sent and m["_id"] not in failures:
+                failures[m["_id"]] = e
+    return sent, failures
@@ -0,0 +1,176 @@
+# services/inference_backends.py
+import json
+import os
+import cv2
+import numpy as np
+
+
+# ---------------------------------------------------------------------
+# ⚙️ CPU runtimes (ONNX Runtime / OpenVINO) with explicit thread settings
+# ---------------------------------------------------------------------
+def onnx_runner(path, intra_threads, inter_threads=1):
+    """Callable running an ONNX model on CPU: batch ndarray in, first output out."""
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = intra_threads
+    options.inter_op_num_threads = inter_threads
+    options.execution_mode = ort.ExecutionMode.ORT_PARALLEL if inter_threads > 1 else ort.ExecutionMode.ORT_SEQUENTIAL
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+
+    def run(batch):
+        return session.run(None, {input_name: batch})[0]
+
+    return run
+
+
+def openvino_runner(path, intra_threads, inter_threads=1):
+    """Callable running an OpenVINO IR (.xml) on CPU; inter_threads maps to inference streams."""
+    import openvino as ov
+
+    core = ov.Core()
+    compiled = core.compile_model(path, "CPU", {
+        "INFERENCE_NUM_THREADS": str(intra_threads),
+        "NUM_STREAMS": str(inter_threads),
+    })
+    output = compiled.output(0)
+
+    def run(batch):
+        return compiled(batch)[output]
+
+    return run
+
+
+def read_metadata(model_path):
+    """Sidecar JSON written at export time (class names, input size)."""
+    meta_path = os.path.splitext(model_path)[0] + ".json"
+    if not os.path.exists(meta_path):
+        return {}
+    with open(meta_path) as f:
+        return json.load(f)
+
+
+# ---------------------------------------------------------------------
+# 🛢️ YOLOv8 detector on an exported graph
+# ---------------------------------------------------------------------
+def letterbox(image, size, pad_value=114):
+    """Resize keeping aspect ratio and pad to size x size. Returns (padded, gain, (pad_x, pad_y))."""
+    h, w = image.shape[:2]
+    gain = min(size / h, size / w)
+    new_w, new_h = int(round(w * gain)), int(round(h * gain))
+    resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+    padded = np.full((size, size, 3), pad_value, dtype=np.uint8)
+    padded[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = resized
+    return padded, gain, (pad_x, pad_y)
+
+
+def nms(boxes, scores, iou_threshold):
+    """Indices kept by greedy non-maximum suppression over xyxy boxes."""
+    if len(boxes) == 0:
+        return []
+    xywh = [[float(x1), float(y1), float(x2 - x1), float(y2 - y1)] for x1, y1, x2, y2 in boxes]
+    keep = cv2.dnn.NMSBoxes(xywh, [float(s) for s in scores], 0.0, iou_threshold)
+    return sorted(np.array(keep).flatten().tolist(), key=lambda i: -scores[i])
+
+
+class Detections:
+    """Boxes found in one image, with an ultralytics-like plot() for the annotated upload."""
+
+    def __init__(self, image, boxes, confidences, classes, names):
+        self.image = image
+        self.boxes = boxes
+        self.confidences = confidences
+        self.classes = classes
+        self.names = names
+
+    def plot(self):
+        canvas = self.image.copy()
+        for (x1, y1, x2, y2), conf, cls in zip(self.boxes, self.confidences, self.classes):
+            p1, p2 = (int(x1), int(y1)), (int(x2), int(y2))
+            cv2.rectangle(canvas, p1, p2, (0, 0, 255), 2)
+            label = f"{self.names.get(cls, cls)} {conf:.2f}"
+            cv2.putText(canvas, label, (p1[0], max(p1[1] - 5, 12)), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
+        return canvas
+
+
+class ExportedYolo:
+    """
+    YOLOv8 detection head on ONNX Runtime / OpenVINO.
+    infer: callable taking an NCHW float32 batch and returning (N, 4 + classes, anchors).
+    """
+
+    def __init__(self, infer, imgsz=640, names=None, conf_threshold=0.25, iou_threshold=0.7):
+        self.infer = infer
+        self.imgsz = imgsz
+        self.names = {int(k): v for k, v in (names or {0: "oil_spill"}).items()}
+        self.conf_threshold = conf_threshold
+        self.iou_threshold = iou_threshold
+
+    def preprocess(self, image):
+        padded, gain, pad = letterbox(image, self.imgsz)
+        rgb = cv2.cvtColor(padded, cv2.COLOR_BGR2RGB)
+        return rgb.transpose(2, 0, 1).astype(np.float32) / 255.0, gain, pad
+
+    def postprocess(self, prediction, image, gain, pad):
+        preds = prediction.T  # anchors x (4 + classes)
+        scores = preds[:, 4:]
+        classes = scores.argmax(axis=1)
+        confs = scores[np.arange(len(scores)), classes]
+        mask = confs > self.conf_threshold
+        preds, confs, classes = preds[mask], confs[mask], classes[mask]
+
+        cx, cy, w, h = preds[:, 0], preds[:, 1], preds[:, 2], preds[:, 3]
+        boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+        boxes[:, [0, 2]] = ((boxes[:, [0, 2]] - pad[0]) / gain).clip(0, image.shape[1])
+        boxes[:, [1, 3]] = ((boxes[:, [1, 3]] - pad[1]) / gain).clip(0, image.shape[0])
+
+        keep = []
+        for cls in np.unique(classes):
+            idx = np.where(classes == cls)[0]
+            keep.extend(idx[i] for i in nms(boxes[idx], confs[idx], self.iou_threshold))
+        keep.sort(key=lambda i: -confs[i])
+        return Detections(
+            image,
+            boxes[keep].tolist(),
+            confs[keep].astype(float).tolist(),
+            classes[keep].astype(int).tolist(),
+            self.names,
+        )
+
+    def predict_batch(self, images):
+        prepared = [self.preprocess(img) for img in images]
+        output = self.infer(np.stack([p[0] for p in prepared]))
+        outputs = []
+        for pred, img, (_, gain, pad) in zip(output, images, prepared):
+            det = self.postprocess(pred, img, gain, pad)
+            outputs.append({
+                "boxes": det.boxes, "confidences": det.confidences, "classes": det.classes, "result": det,
+            })
+        return outputs
+
+
+# ---------------------------------------------------------------------
+# 🗑️ Debris classifier on an exported graph
+# ---------------------------------------------------------------------
+class ExportedDebrisClassifier:
+    """Same contract as DebrisClassifier (NHWC RGB in [0, 1]) on ONNX Runtime / OpenVINO."""
+
+    def __init__(self, infer, height, width, class_index=1):
+        self.infer = infer
+        self.height = height
+        self.width = width
+        self.class_index = class_index
+
+    def preprocess(self, image):
+        rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        resized = cv2.resize(rgb, (self.width, self.height), interpolation=cv2.INTER_AREA)
+        return resized.astype(np.float32) / 255.0
+
+    def predict_batch(self, images):
+        probs = np.asarray(self.infer(np.stack([self.preprocess(img) for img in images])))
+        if probs.shape[-1] == 1:
+            return [float(p[0]) for p in probs]
+        return [float(p[self.class_index]) for p in probs]
@@ -0,0 +1,82 @@
+# services/inference_scheduler.py
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from utils.metrics import INFERENCE_BATCH_SIZE, INFERENCE_FAILURES, INFERENCE_LATENCY, INFERENCE_QUEUE_DEPTH
+
+
+class BatchInferenceScheduler:
+    """
+    Collects pending inference requests and runs them through the model as one batch.
+
+    predict_batch: callable taking a list of inputs and returning a list of outputs
+                   in the same order.
+    max_batch_size: upper bound on items passed to predict_batch at once.
+    max_wait_ms: how long the first queued item waits for company before the batch runs.
+    """
+
+    def __init__(self, predict_batch, max_batch_size=8, max_wait_ms=15, name="inference"):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms) / 1000.0)
+        self.name = name
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        INFERENCE_QUEUE_DEPTH.labels(name).set_function(self.queue_depth)
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._loop, name=f"{self.name}-batcher", daemon=True)
+                self._worker.start()
+
+    def submit(self, item):
+        """Queue one input; returns a Future resolving to that input's output."""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def run(self, item, timeout=None):
+        """Blocking helper: submit and wait for the result."""
+        return self.submit(item).result(timeout=timeout)
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def _collect_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect_batch()
+            # skip callers that already gave up
+            batch = [(item, fut) for item, fut in batch if fut.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            INFERENCE_BATCH_SIZE.labels(self.name).observe(len(batch))
+            start = time.perf_counter()
+            try:
+                outputs = self.predict_batch([item for item, _ in batch])
+                INFERENCE_LATENCY.labels(self.name).observe(time.perf_counter() - start)
+                if len(outputs) != len(batch):
+                    raise RuntimeError(f"{self.name}: expected {len(batch)} outputs, got {len(outputs)}")
+                for (_, fut), out in zip(batch, outputs):
+                    fut.set_result(out)
+            except Exception as e:
+                INFERENCE_FAILURES.labels(self.name).inc()
+                print(f"⚠️ {self.name} batch failed:", e)
+                for _, fut in batch:
+                    fut.set_exception(e)
@@ -0,0 +1,46 @@
+# services/ingestion_service.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.datastructures import FileStorage
+from config import Config
+from models.job_model import JobModel
+from services.report_pipeline import STAGES, PipelineError, run_report_pipeline
+
+# Shared worker pool for background report processing
+_executor = ThreadPoolExecutor(max_workers=Config.INGESTION_WORKERS, thread_name_prefix="ingest")
+
+
+def submit_report_job(user_id, image_file, lat, lng):
+    """
+    Save the upload to the spool directory, create a job and queue the pipeline.
+    Returns the job id.
+    """
+    os.makedirs(Config.UPLOAD_SPOOL_DIR, exist_ok=True)
+
+    job_id = JobModel.create_job(user_id, lat, lng, STAGES)
+    upload_path = os.path.join(Config.UPLOAD_SPOOL_DIR, f"{job_id}.upload")
+    image_file.save(upload_path)
+
+    _executor.submit(_process_job, str(job_id), user_id, upload_path, lat, lng)
+    return job_id
+
+
+def _process_job(job_id, user_id, upload_path, lat, lng):
+    def on_stage(stage, state):
+        JobModel.update_stage(job_id, stage, state)
+
+    try:
+        with open(upload_path, "rb") as f:
+            image_file = FileStorage(stream=f, filename=os.path.basename(upload_path))
+            result = run_report_pipeline(user_id, image_file, lat, lng, on_stage=on_stage)
+        JobModel.complete(job_id, result)
+    except PipelineError as e:
+        JobModel.fail(job_id, e.to_dict())
+    except Exception as e:
+        print("Report job failed:", e)
+        JobModel.fail(job_id, {"error": "Report processing failed", "details": str(e)})
+    finally:
+        try:
+            os.remove(upload_path)
+        except OSError:
+            pass
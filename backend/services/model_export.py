@@ -0,0 +1,198 @@
+# services/model_export.py
+"""
+Export the detection models for the CPU inference backends.
+Export-time tools (not needed at runtime): tf2onnx, onnx, nncf. They and the
+runtimes used for quantization are in requirements-inference.txt.
+
+    cd backend
+    python -m services.model_export --model oil --backend onnx
+    python -m services.model_export --model all --backend all --int8 --calibration-dir samples/
+
+Every model is first exported to ONNX (YOLO via ultralytics, the debris SavedModel
+via tf2onnx); OpenVINO IR is converted from that ONNX graph. int8 variants are
+written alongside the fp32 ones (*.int8.onnx / *.int8.xml). Select them with
+OIL_MODEL_BACKEND / DEBRIS_MODEL_BACKEND / INFERENCE_INT8.
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+import cv2
+import numpy as np
+from config import Config
+from services.inference_backends import ExportedDebrisClassifier, ExportedYolo
+from services.model_registry import (
+    OIL_MODEL_PATH, DEBRIS_MODEL_PATH, EXPORT_BACKENDS, _saved_model_dir, exported_path, load_debris_model,
+)
+
+IMAGE_PATTERNS = ("*.jpg", "*.jpeg", "*.png", "*.bmp", "*.webp")
+
+
+def _write_metadata(model_path, meta):
+    with open(os.path.splitext(model_path)[0] + ".json", "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+def _read_metadata(model_path):
+    with open(os.path.splitext(model_path)[0] + ".json") as f:
+        return json.load(f)
+
+
+# ---------------------------------------------------------------------
+# 📦 fp32 ONNX exports
+# ---------------------------------------------------------------------
+def export_oil_onnx():
+    from ultralytics import YOLO
+
+    model = YOLO(OIL_MODEL_PATH)
+    produced = model.export(format="onnx", imgsz=Config.OIL_MODEL_IMGSZ, dynamic=True, simplify=True)
+    target = exported_path("oil", "onnx")
+    shutil.move(produced, target)
+    _write_metadata(target, {
+        "imgsz": Config.OIL_MODEL_IMGSZ,
+        "names": {str(k): v for k, v in model.names.items()},
+    })
+    return target
+
+
+def export_debris_onnx():
+    # input size comes from the SavedModel's serving signature
+    reference = load_debris_model(backend="tensorflow")
+    target = exported_path("debris", "onnx")
+    with _saved_model_dir(DEBRIS_MODEL_PATH) as model_dir:
+        subprocess.run([
+            sys.executable, "-m", "tf2onnx.convert",
+            "--saved-model", model_dir,
+            "--output", target,
+            "--opset", "17",
+        ], check=True)
+    _write_metadata(target, {"height": reference.height, "width": reference.width})
+    return target
+
+
+EXPORTERS = {"oil": export_oil_onnx, "debris": export_debris_onnx}
+
+
+# ---------------------------------------------------------------------
+# 🔁 OpenVINO conversion and int8 quantization
+# ---------------------------------------------------------------------
+def onnx_to_openvino(onnx_path, xml_path):
+    import openvino as ov
+
+    ov.save_model(ov.convert_model(onnx_path), xml_path, compress_to_fp16=False)
+    _write_metadata(xml_path, _read_metadata(onnx_path))
+    return xml_path
+
+
+def calibration_batches(model, meta, calibration_dir, limit=100):
+    """Preprocessed single-image batches, using the runtime's own preprocessing."""
+    if model == "oil":
+        prep = ExportedYolo(None, imgsz=meta["imgsz"])
+        preprocess = lambda img: prep.preprocess(img)[0]
+    else:
+        preprocess = ExportedDebrisClassifier(None, meta["height"], meta["width"]).preprocess
+
+    paths = sorted(p for pattern in IMAGE_PATTERNS for p in glob.glob(os.path.join(calibration_dir, pattern)))
+    batches = []
+    for path in paths[:limit]:
+        image = cv2.imread(path)
+        if image is not None:
+            batches.append(preprocess(image)[np.newaxis].astype(np.float32))
+    if not batches:
+        raise ValueError(f"No readable calibration images in {calibration_dir}")
+    return batches
+
+
+def quantize_onnx(model, src, dst, calibration_dir=None):
+    """Static int8 quantization with calibration images, dynamic (weights only) without."""
+    from onnxruntime.quantization import CalibrationDataReader, QuantType, quantize_dynamic, quantize_static
+
+    if calibration_dir is None:
+        quantize_dynamic(src, dst, weight_type=QuantType.QInt8)
+    else:
+        import onnxruntime as ort
+
+        input_name = ort.InferenceSession(src, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+        batches = calibration_batches(model, _read_metadata(src), calibration_dir)
+
+        class Reader(CalibrationDataReader):
+            def __init__(self):
+                self._iter = iter(batches)
+
+            def get_next(self):
+                batch = next(self._iter, None)
+                return None if batch is None else {input_name: batch}
+
+        quantize_static(src, dst, Reader(), weight_type=QuantType.QInt8, activation_type=QuantType.QUInt8)
+    _write_metadata(dst, _read_metadata(src))
+    return dst
+
+
+def quantize_openvino(model, src, dst, calibration_dir):
+    """Post-training int8 quantization with NNCF (needs calibration images)."""
+    import nncf
+    import openvino as ov
+
+    if calibration_dir is None:
+        raise ValueError("OpenVINO int8 quantization needs --calibration-dir")
+    batches = calibration_batches(model, _read_metadata(src), calibration_dir)
+    quantized = nncf.quantize(ov.Core().read_model(src), nncf.Dataset(batches))
+    ov.save_model(quantized, dst, compress_to_fp16=False)
+    _write_metadata(dst, _read_metadata(src))
+    return dst
+
+
+def export_model(model, backend, int8=False, calibration_dir=None, force=False):
+    """Produce the file load_<model>_model(backend, int8) expects; returns its path."""
+    onnx_path = exported_path(model, "onnx")
+    if force or not os.path.exists(onnx_path):
+        print(f"🔹 Exporting {model} model to ONNX...")
+        EXPORTERS[model]()
+
+    path = onnx_path
+    if backend == "openvino":
+        path = exported_path(model, "openvino")
+        if force or not os.path.exists(path):
+            print(f"🔹 Converting {model} model to OpenVINO IR...")
+            onnx_to_openvino(onnx_path, path)
+
+    if int8:
+        target = exported_path(model, backend, int8=True)
+        print(f"🔹 Quantizing {model} model ({backend}) to int8...")
+        if backend == "onnx":
+            path = quantize_onnx(model, path, target, calibration_dir)
+        else:
+            path = quantize_openvino(model, path, target, calibration_dir)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export detection models for ONNX Runtime / OpenVINO")
+    parser.add_argument("--model", choices=["oil", "debris", "all"], default="all")
+    parser.add_argument("--backend", choices=EXPORT_BACKENDS + ["all"], default="onnx")
+    parser.add_argument("--int8", action="store_true", help="also write an int8-quantized variant")
+    parser.add_argument("--calibration-dir", help="representative images for static int8 calibration")
+    parser.add_argument("--force", action="store_true", help="re-export even if files exist")
+    args = parser.parse_args(argv)
+
+    os.makedirs(Config.EXPORTED_MODELS_DIR, exist_ok=True)
+    models = ["oil", "debris"] if args.model == "all" else [args.model]
+    backends = EXPORT_BACKENDS if args.backend == "all" else [args.backend]
+    failed = 0
+    for model in models:
+        for backend in backends:
+            try:
+                path = export_model(model, backend, args.int8, args.calibration_dir, args.force)
+                print(f"✅ {model} / {backend}{' int8' if args.int8 else ''}: {path}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {model} / {backend} export failed:", e)
+    # non-zero so CI / deploy scripts notice a missing export
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
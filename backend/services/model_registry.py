@@ -0,0 +1,218 @@
+# services/model_registry.py
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+import cv2
+import numpy as np
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------
+# 🧩 Model paths (relative to backend/)
+# ---------------------------------------------------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ML_MODELS_DIR = os.path.join(BASE_DIR, "..", "ml_Models")
+
+OIL_MODEL_PATH = os.path.join(ML_MODELS_DIR, "oilspill_detector.pt")
+DEBRIS_MODEL_PATH = os.path.join(ML_MODELS_DIR, "debris_detector.pb")
+
+# Native backend of each model; the others load exports from Config.EXPORTED_MODELS_DIR
+NATIVE_BACKENDS = {"oil": "pytorch", "debris": "tensorflow"}
+EXPORT_BACKENDS = ["onnx", "openvino"]
+MODEL_BASENAMES = {"oil": "oilspill_detector", "debris": "debris_detector"}
+
+
+def exported_path(model, backend, int8=False):
+    """Location of an exported model, e.g. exported/oilspill_detector.int8.onnx"""
+    suffix = ".int8" if int8 else ""
+    ext = ".onnx" if backend == "onnx" else ".xml"
+    return os.path.join(Config.EXPORTED_MODELS_DIR, MODEL_BASENAMES[model] + suffix + ext)
+
+
+def exported_runner(model, backend, int8, intra_threads):
+    """(infer callable, export metadata) for an exported model; raises if it was never exported."""
+    from services.inference_backends import onnx_runner, openvino_runner, read_metadata
+
+    if backend not in EXPORT_BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}' for {model} model")
+    path = exported_path(model, backend, int8)
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"❌ {path} not found; run `python -m services.model_export --model {model} --backend {backend}"
+            + (" --int8" if int8 else "") + "`"
+        )
+    make_runner = onnx_runner if backend == "onnx" else openvino_runner
+    return make_runner(path, intra_threads, Config.INFERENCE_INTER_OP_THREADS), read_metadata(path)
+
+
+class ModelRegistry:
+    """Loads each model once, on first use, and hands out the shared instance."""
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader, required=True):
+        self._loaders[name] = (loader, required)
+
+    def get(self, name):
+        if name in self._models:
+            return self._models[name]
+        with self._lock:
+            if name not in self._models:
+                loader, required = self._loaders[name]
+                try:
+                    self._models[name] = loader()
+                except Exception as e:
+                    if required:
+                        raise
+                    logger.warning("Optional model '%s' unavailable: %s", name, e)
+                    self._models[name] = None
+            return self._models[name]
+
+
+# ---------------------------------------------------------------------
+# ⚙️ YOLO (oil spill) model
+# ---------------------------------------------------------------------
+class UltralyticsYolo:
+    """Stock ultralytics/PyTorch YOLO behind the predict_batch interface of the exported backends."""
+
+    def __init__(self, model):
+        self.model = model
+        self.names = dict(model.names)
+
+    def predict_batch(self, images):
+        results = self.model(images, batch=len(images), verbose=False)
+        outputs = []
+        for r in results:
+            outputs.append({
+                "boxes": r.boxes.xyxy.tolist() if len(r.boxes) > 0 else [],
+                "confidences": r.boxes.conf.tolist() if len(r.boxes) > 0 else [],
+                "classes": [int(c) for c in r.boxes.cls.tolist()] if len(r.boxes) > 0 else [],
+                "result": r,
+            })
+        return outputs
+
+
+def load_oil_model(backend=None, int8=None, threads=None):
+    backend = backend or Config.OIL_MODEL_BACKEND
+    int8 = Config.INFERENCE_INT8 if int8 is None else int8
+    threads = threads or Config.OIL_MODEL_THREADS
+
+    if backend != "pytorch":
+        from services.inference_backends import ExportedYolo
+
+        infer, meta = exported_runner("oil", backend, int8, threads)
+        print(f"🔹 Loading Oil-Spill YOLO model ({backend}{' int8' if int8 else ''})...")
+        return ExportedYolo(
+            infer,
+            imgsz=meta.get("imgsz", Config.OIL_MODEL_IMGSZ),
+            names=meta.get("names"),
+            conf_threshold=Config.OIL_DETECTION_MIN_CONFIDENCE,
+            iou_threshold=Config.OIL_NMS_IOU,
+        )
+
+    import torch
+    from ultralytics import YOLO
+
+    if not os.path.exists(OIL_MODEL_PATH):
+        raise FileNotFoundError(f"❌ Oil-spill model not found at {OIL_MODEL_PATH}")
+
+    # Pin torch's intra-op pool so it does not fight the debris model for cores
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(Config.INFERENCE_INTER_OP_THREADS)
+    except RuntimeError as e:
+        print("⚠️ PyTorch already initialized, inter-op threads ignored:", e)
+    print("🔹 Loading Oil-Spill YOLO model...")
+    return UltralyticsYolo(YOLO(OIL_MODEL_PATH))
+
+
+# ---------------------------------------------------------------------
+# ⚙️ TensorFlow (debris) classifier
+# ---------------------------------------------------------------------
+class DebrisClassifier:
+    """Wraps the Keras debris SavedModel: BGR images in, debris probability out."""
+
+    def __init__(self, saved_model, class_index=1):
+        self.model = saved_model
+        self.fn = saved_model.signatures["serving_default"]
+        self.input_name, spec = next(iter(self.fn.structured_input_signature[1].items()))
+        _, self.height, self.width, _ = spec.shape.as_list()
+        self.class_index = class_index
+
+    def preprocess(self, image):
+        rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        resized = cv2.resize(rgb, (self.width, self.height), interpolation=cv2.INTER_AREA)
+        return resized.astype(np.float32) / 255.0
+
+    def predict_batch(self, images):
+        import tensorflow as tf
+
+        batch = np.stack([self.preprocess(img) for img in images])
+        outputs = self.fn(**{self.input_name: tf.constant(batch)})
+        probs = next(iter(outputs.values())).numpy()
+        if probs.shape[-1] == 1:
+            return [float(p[0]) for p in probs]
+        return [float(p[self.class_index]) for p in probs]
+
+
+@contextmanager
+def _saved_model_dir(path):
+    """
+    tf.saved_model.load expects a directory holding saved_model.pb and variables/.
+    A bare .pb file is staged into such a (temporary) directory next to its variables/ folder.
+    """
+    if os.path.isdir(path):
+        yield path
+        return
+    variables_dir = os.path.join(os.path.dirname(os.path.abspath(path)), "variables")
+    if not os.path.isdir(variables_dir):
+        raise FileNotFoundError(
+            f"{path} has no variables/ directory next to it; it cannot be loaded as a SavedModel"
+        )
+    with tempfile.TemporaryDirectory(prefix="debris_model_") as staged:
+        os.symlink(os.path.abspath(path), os.path.join(staged, "saved_model.pb"))
+        os.symlink(variables_dir, os.path.join(staged, "variables"))
+        yield staged
+
+
+def load_debris_model(backend=None, int8=None, threads=None):
+    backend = backend or Config.DEBRIS_MODEL_BACKEND
+    int8 = Config.INFERENCE_INT8 if int8 is None else int8
+    threads = threads or Config.DEBRIS_MODEL_THREADS
+
+    if backend != "tensorflow":
+        from services.inference_backends import ExportedDebrisClassifier
+
+        infer, meta = exported_runner("debris", backend, int8, threads)
+        print(f"🔹 Loading Debris model ({backend}{' int8' if int8 else ''})...")
+        return ExportedDebrisClassifier(
+            infer, meta["height"], meta["width"], class_index=Config.DEBRIS_CLASS_INDEX
+        )
+
+    import tensorflow as tf
+
+    if not os.path.exists(DEBRIS_MODEL_PATH):
+        raise FileNotFoundError(f"Debris model not found at {DEBRIS_MODEL_PATH}")
+
+    # Must be set before TF creates its thread pools
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(Config.INFERENCE_INTER_OP_THREADS)
+    except RuntimeError as e:
+        print("⚠️ TensorFlow already initialized, thread settings ignored:", e)
+    print("🔹 Loading Debris TensorFlow model...")
+    # variables are read into memory, so the staging directory can go once loaded
+    with _saved_model_dir(DEBRIS_MODEL_PATH) as model_dir:
+        saved_model = tf.saved_model.load(model_dir)
+    return DebrisClassifier(saved_model, class_index=Config.DEBRIS_CLASS_INDEX)
+
+
+registry = ModelRegistry()
+registry.register("oil", load_oil_model)
+registry.register("debris", load_debris_model, required=False)
@@ -0,0 +1,62 @@
+# services/notification_dispatcher.py
+import threading
+from config import Config
+from models.notification_model import NotificationModel
+from services.email_service import send_batch
+
+
+class NotificationDispatcher:
+    """Background thread that drains the notification outbox in batches."""
+
+    def __init__(self, batch_size=50, poll_seconds=5, max_attempts=5, retry_base_seconds=30):
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self._stop = threading.Event()
+        self._thread = None
+
+    def drain_once(self):
+        """Claim and send one batch. Returns (sent_count, failed_count)."""
+        NotificationModel.fan_out_pending(self.batch_size)
+        NotificationModel.expire_leases(self.max_attempts, self.retry_base_seconds)
+        messages = NotificationModel.claim_batch(self.batch_size)
+        if not messages:
+            return 0, 0
+        sent, failures = send_batch(messages)
+        NotificationModel.mark_sent(sent)
+        by_id = {m["_id"]: m for m in messages}
+        for message_id, error in failures.items():
+            print("⚠️ Notification send failed:", error)
+            NotificationModel.mark_failed(by_id[message_id], error, self.max_attempts, self.retry_base_seconds)
+        return len(sent), len(failures)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                sent, failed = self.drain_once()
+            except Exception as e:
+                print("⚠️ Notification dispatcher error:", e)
+                sent = failed = 0
+            # keep draining while batches come back full
+            if sent + failed < self.batch_size:
+                self._stop.wait(self.poll_seconds)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="notification-dispatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+dispatcher = NotificationDispatcher(
+    batch_size=Config.NOTIFY_BATCH_SIZE,
+    poll_seconds=Config.NOTIFY_POLL_SECONDS,
+    max_attempts=Config.NOTIFY_MAX_ATTEMPTS,
+    retry_base_seconds=Config.NOTIFY_RETRY_BASE_SECONDS,
+)
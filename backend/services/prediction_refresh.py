@@ -0,0 +1,135 @@
+# services/prediction_refresh.py
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from config import Config
+from models.lock_model import LockModel
+from models.report_model import ReportModel
+from services.prediction_service import predict_trajectories, predict_trajectory_ensembles
+from services.weather_service import fetch_weather_data, grid_cell
+
+# Same horizon as the prediction made at report creation
+PATH_STEPS = 6
+PATH_INTERVAL_MINUTES = 30
+
+LOCK_NAME = "prediction_refresh"
+
+
+def _weather_by_cell(cells):
+    """One weather lookup per grid cell, issued concurrently."""
+    cells = list(cells)
+    with ThreadPoolExecutor(max_workers=Config.WEATHER_HTTP_POOL_SIZE, thread_name_prefix="refresh-weather") as pool:
+        return dict(zip(cells, pool.map(lambda c: fetch_weather_data(*c), cells)))
+
+
+def refresh_chunk(reports):
+    """Recompute predictions for one chunk of open reports and write them back. Returns reports updated."""
+    by_cell = defaultdict(list)
+    for r in reports:
+        loc = r.get("location") or {}
+        if loc.get("lat") is None or loc.get("lng") is None:
+            continue
+        by_cell[grid_cell(loc["lat"], loc["lng"])].append(r)
+    if not by_cell:
+        return 0
+
+    weather = _weather_by_cell(by_cell.keys())
+    ordered = [(r, weather[cell]) for cell, rs in by_cell.items() for r in rs]
+
+    lats = [r["location"]["lat"] for r, _ in ordered]
+    lngs = [r["location"]["lng"] for r, _ in ordered]
+    weathers = [w for _, w in ordered]
+    types = [r.get("type") for r, _ in ordered]
+    paths = predict_trajectories(
+        lats, lngs, weathers, types, steps=PATH_STEPS, interval_minutes=PATH_INTERVAL_MINUTES,
+    )
+    # particles are integrated once per grid cell and report type, not per report
+    areas = [None] * len(ordered)
+    if Config.PREDICTION_ENSEMBLE_SIZE > 0:
+        areas = predict_trajectory_ensembles(
+            lats, lngs, weathers, types, steps=PATH_STEPS, interval_minutes=PATH_INTERVAL_MINUTES,
+            n_particles=Config.PREDICTION_ENSEMBLE_SIZE,
+        )
+
+    now = datetime.utcnow()
+    updates = []
+    for (r, w), path, area in zip(ordered, paths, areas):
+        fields = {"predicted_path": path, "weather_data": w, "prediction_updated_at": now}
+        if area is not None:
+            fields["predicted_area"] = area
+        updates.append((r["_id"], fields))
+
+    result = ReportModel.bulk_update_predictions(updates)
+    return result.modified_count if result else 0
+
+
+def refresh_active_predictions(chunk_size=None):
+    """
+    Refresh predicted_path / predicted_area of every open report.
+    Reports are read in chunks of PREDICTION_REFRESH_BATCH; each chunk costs one
+    weather lookup per grid cell, one vectorized path prediction, one particle
+    ensemble per grid cell and report type, and one bulk_write.
+    """
+    chunk_size = chunk_size or Config.PREDICTION_REFRESH_BATCH
+    started = time.perf_counter()
+    stats = {"reports": 0, "updated": 0}
+
+    chunk = []
+    for report in ReportModel.find_active({"location": 1, "type": 1}, batch_size=chunk_size):
+        chunk.append(report)
+        if len(chunk) >= chunk_size:
+            stats["updated"] += refresh_chunk(chunk)
+            stats["reports"] += len(chunk)
+            chunk = []
+    if chunk:
+        stats["updated"] += refresh_chunk(chunk)
+        stats["reports"] += len(chunk)
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    return stats
+
+
+class PredictionRefresher:
+    """Background thread re-running refresh_active_predictions every interval (one process at a time)."""
+
+    def __init__(self, interval_minutes=30):
+        self.interval = interval_minutes * 60
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self):
+        """Refresh if this process wins the lease; returns stats or None."""
+        if not LockModel.acquire(LOCK_NAME, self.owner, self.interval):
+            return None
+        stats = refresh_active_predictions()
+        print("🔹 Predicted paths refreshed:", stats)
+        return stats
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print("⚠️ Prediction refresh failed:", e)
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="prediction-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        # let another worker take over without waiting out the lease
+        LockModel.release(LOCK_NAME, self.owner)
+
+
+refresher = PredictionRefresher(interval_minutes=Config.PREDICTION_REFRESH_MINUTES)
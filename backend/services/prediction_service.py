@@ -1,4 +1,5 @@
 import math
+import numpy as np
 from datetime import datetime, timedelta
 
 EARTH_RADIUS_KM = 6371.0
@@ -19,6 +20,12 @@ def vector_from_speed_dir(speed, direction_deg):
     dy = speed * math.cos(theta_rad)   # north
     return dx, dy
 
+def wind_factor_for(report_type):
+    """Share of wind speed transferred to the drifting object."""
+    # wind influence smaller for debris, larger for oil
+    return 0.03 if report_type == "debris" else 0.06
+
+
 def predict_trajectory(lat, lng, weather_data, report_type, steps=6, interval_minutes=30):
     """
     Predict future debris/oil drift based on both wind and ocean currents.
@@ -34,11 +41,8 @@ def predict_trajectory(lat, lng, weather_data, report_type, steps=6, interval_mi
     dx_wind, dy_wind = vector_from_speed_dir(wind_speed, wind_direction)
     dx_curr, dy_curr = vector_from_speed_dir(current_speed, current_direction)
 
-    # Adjust coefficients (wind influence smaller for debris, larger for oil)
-    if report_type == "debris":
-        wind_factor = 0.03  # debris moves 3% of wind speed
-    else:  # oil spill
-        wind_factor = 0.06  # oil slick moves ~6% of wind speed
+    # Adjust coefficients (debris moves ~3% of wind speed, oil slick ~6%)
+    wind_factor = wind_factor_for(report_type)
 
     # Combine wind + current
     dx_total = dx_curr + dx_wind * wind_factor
@@ -64,3 +68,171 @@ def predict_trajectory(lat, lng, weather_data, report_type, steps=6, interval_mi
         })
 
     return points
+
+
+# ---------------------------------------------------------------------
+# Monte Carlo ensemble (vectorized over particles and steps)
+# ---------------------------------------------------------------------
+def _step_vectors(weather_data, steps, interval_minutes):
+    """
+    East/north wind and current components (m/s) for each step, taken from the
+    hourly forecast slot the step starts in. Falls back to the scalar values.
+    """
+    hourly = weather_data.get("hourly") or {}
+
+    def series(key):
+        values = hourly.get(key) or [weather_data.get(key)]
+        return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+    hour_idx = (np.arange(steps) * interval_minutes) // 60
+
+    def components(speed_key, dir_key):
+        speed, direction = series(speed_key), series(dir_key)
+        n = min(len(speed), len(direction))
+        idx = np.minimum(hour_idx, n - 1)
+        speed, direction = np.nan_to_num(speed[idx]), np.nan_to_num(direction[idx])
+        theta = np.radians((direction + 180) % 360)  # from → to
+        return speed * np.sin(theta), speed * np.cos(theta)
+
+    wind_dx, wind_dy = components("wind_speed", "wind_direction")
+    curr_dx, curr_dy = components("current_speed", "current_direction")
+    return wind_dx, wind_dy, curr_dx, curr_dy
+
+
+def _rotate(dx, dy, angle):
+    cos_a, sin_a = np.cos(angle), np.sin(angle)
+    return dx * cos_a - dy * sin_a, dx * sin_a + dy * cos_a
+
+
+def _ensemble_offsets(weather_data, report_type, steps, interval_minutes, n_particles, percentiles, seed=None):
+    """
+    Perturbed-particle displacements (metres east/north) per step, reduced to the
+    median, the percentile band and the spread radius. Independent of the start point.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(n_particles)
+
+    wind_dx, wind_dy, curr_dx, curr_dy = _step_vectors(weather_data, steps, interval_minutes)
+
+    # Per-particle perturbations, shape (n, 1) so they broadcast over steps
+    wind_factor = wind_factor_for(report_type) * rng.lognormal(0.0, 0.25, (n, 1))
+    wind_turn = rng.normal(0.0, math.radians(15), (n, 1))
+    curr_turn = rng.normal(0.0, math.radians(20), (n, 1))
+    curr_scale = np.clip(rng.normal(1.0, 0.2, (n, 1)), 0.0, None)
+
+    w_dx, w_dy = _rotate(wind_dx[None, :], wind_dy[None, :], wind_turn)
+    c_dx, c_dy = _rotate(curr_dx[None, :], curr_dy[None, :], curr_turn)
+    vx = c_dx * curr_scale + w_dx * wind_factor
+    vy = c_dy * curr_scale + w_dy * wind_factor
+
+    # Cumulative displacement in metres, shape (n, steps)
+    dt = interval_minutes * 60
+    east_m = np.cumsum(vx * dt, axis=1)
+    north_m = np.cumsum(vy * dt, axis=1)
+
+    low, high = percentiles
+    east_med, north_med = np.median(east_m, axis=0), np.median(north_m, axis=0)
+    # Spread radius: distance from the median point that covers the `high` percentile
+    dist_km = np.hypot(east_m - east_med, north_m - north_med) / 1000.0
+    return {
+        "particles": n,
+        "percentiles": list(percentiles),
+        "east_med": east_med, "north_med": north_med,
+        "east_band": np.percentile(east_m, [low, high], axis=0),
+        "north_band": np.percentile(north_m, [low, high], axis=0),
+        "radius_km": np.percentile(dist_km, high, axis=0),
+    }
+
+
+def _ensemble_at(lat, lng, offsets, interval_minutes, now=None):
+    """Place ensemble offsets at a start point (degrees are linear in metres, so percentiles carry over)."""
+    lat, lng = float(lat), float(lng)
+    m_per_deg_lng = 111000.0 * math.cos(math.radians(lat))
+    lat_med = lat + offsets["north_med"] / 111000.0
+    lng_med = lng + offsets["east_med"] / m_per_deg_lng
+    lat_lo, lat_hi = lat + offsets["north_band"] / 111000.0
+    lng_lo, lng_hi = lng + offsets["east_band"] / m_per_deg_lng
+    radius_km = offsets["radius_km"]
+
+    now = now or datetime.utcnow()
+    median, envelope = [], []
+    for i in range(len(lat_med)):
+        eta = (now + timedelta(minutes=interval_minutes * (i + 1))).isoformat() + "Z"
+        median.append({"lat": float(lat_med[i]), "lng": float(lng_med[i]), "eta": eta})
+        envelope.append({
+            "eta": eta,
+            "lat_min": float(lat_lo[i]), "lat_max": float(lat_hi[i]),
+            "lng_min": float(lng_lo[i]), "lng_max": float(lng_hi[i]),
+            "radius_km": float(radius_km[i]),
+        })
+
+    return {"particles": offsets["particles"], "percentiles": offsets["percentiles"], "median": median, "envelope": envelope}
+
+
+def predict_trajectory_ensemble(lat, lng, weather_data, report_type, steps=6, interval_minutes=30,
+                                n_particles=1000, percentiles=(10, 90), seed=None):
+    """
+    Integrate n_particles perturbed drifters over all steps at once.
+    Each particle gets its own wind factor, wind/current heading error and current
+    speed scale. Returns the median path plus a percentile envelope per step:
+    {"particles", "median": [{"lat","lng","eta"}], "envelope": [{"eta","lat_min",
+    "lat_max","lng_min","lng_max","radius_km"}]}.
+    """
+    offsets = _ensemble_offsets(weather_data, report_type, steps, interval_minutes, n_particles, percentiles, seed)
+    return _ensemble_at(lat, lng, offsets, interval_minutes)
+
+
+# ---------------------------------------------------------------------
+# Batch refresh (vectorized over reports and steps)
+# ---------------------------------------------------------------------
+def predict_trajectories(lats, lngs, weathers, report_types, steps=6, interval_minutes=30):
+    """
+    predict_trajectory for many reports in one pass (same model: current-hour wind
+    and current held constant over the horizon). weathers[i] is the weather record
+    of report i; reports in one grid cell can share the same dict.
+    Returns one [{"lat","lng","eta"}] list per report.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+
+    # Drift vector (m/s east, north) per distinct weather record and wind factor
+    drift = np.empty((len(lats), 2))
+    vectors = {}
+    for i, (weather, report_type) in enumerate(zip(weathers, report_types)):
+        key = (id(weather), wind_factor_for(report_type))
+        if key not in vectors:
+            dx_wind, dy_wind = vector_from_speed_dir(weather.get("wind_speed"), weather.get("wind_direction"))
+            dx_curr, dy_curr = vector_from_speed_dir(weather.get("current_speed"), weather.get("current_direction"))
+            vectors[key] = (dx_curr + dx_wind * key[1], dy_curr + dy_wind * key[1])
+        drift[i] = vectors[key]
+
+    # Displacement in metres, shape (reports, steps)
+    seconds = interval_minutes * 60 * np.arange(1, steps + 1)
+    east_m = drift[:, 0:1] * seconds
+    north_m = drift[:, 1:2] * seconds
+
+    lat_p = lats[:, None] + north_m / 111000.0
+    lng_p = lngs[:, None] + east_m / (111000.0 * np.cos(np.radians(lats))[:, None])
+
+    now = datetime.utcnow()
+    etas = [(now + timedelta(minutes=interval_minutes * (i + 1))).isoformat() + "Z" for i in range(steps)]
+    return [
+        [{"lat": float(a), "lng": float(b), "eta": eta} for a, b, eta in zip(row_lat, row_lng, etas)]
+        for row_lat, row_lng in zip(lat_p.tolist(), lng_p.tolist())
+    ]
+
+
+def predict_trajectory_ensembles(lats, lngs, weathers, report_types, steps=6, interval_minutes=30,
+                                 n_particles=1000, percentiles=(10, 90)):
+    """
+    predict_trajectory_ensemble for many reports: particles are integrated once per
+    distinct weather record and wind factor (i.e. per grid cell and report type) and
+    the resulting offsets are placed at each report's position.
+    """
+    offsets, now, areas = {}, datetime.utcnow(), []
+    for lat, lng, weather, report_type in zip(lats, lngs, weathers, report_types):
+        key = (id(weather), wind_factor_for(report_type))
+        if key not in offsets:
+            offsets[key] = _ensemble_offsets(weather, report_type, steps, interval_minutes, n_particles, percentiles)
+        areas.append(_ensemble_at(lat, lng, offsets[key], interval_minutes, now))
+    return areas
@@ -0,0 +1,173 @@
+# services/realtime.py
+import json
+import threading
+from pymongo.errors import PyMongoError
+from config import Config
+from database.mongo import mongo
+from models.report_event_model import AUTHORITY_SCOPE, add_event_listener, remove_event_listener
+from utils.event_bus import EventBus
+from utils.metrics import REALTIME_SUBSCRIBERS
+
+# Live feed subscribers, keyed by authority / user id
+feed_bus = EventBus(queue_size=Config.REALTIME_QUEUE_SIZE)
+REALTIME_SUBSCRIBERS.set_function(feed_bus.subscriber_count)
+
+# Report fields sent with a "new_report" item
+SUMMARY_PROJECTION = {
+    "type": 1, "status": 1, "image_url": 1, "location": 1, "predicted_path": 1,
+    "user_id": 1, "notified_authorities": 1, "assigned_authority": 1, "created_at": 1,
+}
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _audience(report):
+    """Everyone who may see this report: its notified/assigned authorities and its reporter."""
+    keys = {str(a) for a in report.get("notified_authorities", [])}
+    for field in ("assigned_authority", "user_id"):
+        if report.get(field):
+            keys.add(str(report[field]))
+    return keys
+
+
+def _event_kind(event):
+    if event.get("scope") == AUTHORITY_SCOPE:
+        return "report_rejected"  # one authority declined; the report's status did not change
+    return "new_report" if event.get("status") == "pending" else "status_changed"
+
+
+def _feed_item(event, report):
+    kind = _event_kind(event)
+    data = {
+        "report_id": str(event["report_id"]),
+        "status": event.get("status"),
+        "by": event.get("by"),
+        "remarks": event.get("remarks"),
+        "timestamp": _iso(event.get("timestamp")),
+    }
+    if kind == "new_report":
+        data.update({
+            "type": report.get("type"),
+            "image_url": report.get("image_url"),
+            "location": report.get("location"),
+            "predicted_path": report.get("predicted_path", []),
+            "created_at": _iso(report.get("created_at")),
+        })
+    return {"id": str(event.get("_id", "")), "event": kind, "data": data}
+
+
+def publish_events(events):
+    """Fan report events out to live subscribers (one report lookup per batch)."""
+    if not events or not feed_bus.has_subscribers():
+        return 0
+    report_ids = list({e["report_id"] for e in events})
+    reports = {r["_id"]: r for r in mongo.db.reports.find({"_id": {"$in": report_ids}}, SUMMARY_PROJECTION)}
+    delivered = 0
+    for event in events:
+        report = reports.get(event["report_id"])
+        if not report:
+            continue
+        # an authority-scoped event only concerns the authority that acted
+        audience = [str(event["actor_id"])] if event.get("scope") == AUTHORITY_SCOPE else _audience(report)
+        delivered += feed_bus.publish(audience, _feed_item(event, report))
+    return delivered
+
+
+def format_sse(item):
+    return f"id: {item['id']}\nevent: {item['event']}\ndata: {json.dumps(item['data'])}\n\n"
+
+
+def sse_stream(subscription, heartbeat):
+    """SSE text for one subscription: items, keepalives, and a final resync if the client fell behind."""
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            item = subscription.get(timeout=heartbeat)
+            if subscription.overflowed:
+                # client fell behind; it should refetch /authority/assigned and reconnect
+                yield "event: resync\ndata: {}\n\n"
+                return
+            yield format_sse(item) if item else ": keepalive\n\n"
+    finally:
+        subscription.close()
+
+
+class ChangeStreamRelay:
+    """
+    Publishes report_events inserts seen on a Mongo change stream, so every worker
+    process hears about reports created by any other. Needs a replica set.
+    """
+
+    def __init__(self):
+        self._thread = None
+        self._stop = threading.Event()
+        self._resume_token = None
+
+    def _open(self):
+        return mongo.db.report_events.watch(
+            [{"$match": {"operationType": "insert"}}],
+            resume_after=self._resume_token,
+            max_await_time_ms=1000,
+        )
+
+    def _loop(self, stream):
+        while not self._stop.is_set():
+            try:
+                with stream:
+                    while not self._stop.is_set() and stream.alive:
+                        change = stream.try_next()
+                        if change is None:
+                            continue
+                        self._resume_token = stream.resume_token
+                        publish_events([change["fullDocument"]])
+            except PyMongoError as e:
+                print("⚠️ Report change stream interrupted:", e)
+            if self._stop.wait(1):
+                break
+            try:
+                stream = self._open()
+            except PyMongoError as e:
+                print("⚠️ Report change stream reopen failed:", e)
+
+    def start(self):
+        """Open the stream and start relaying; returns False if change streams are unavailable."""
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        try:
+            stream = self._open()
+        except PyMongoError as e:
+            print("🔹 Change streams unavailable, using in-process feed:", e)
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, args=(stream,), name="report-change-stream", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+change_stream_relay = ChangeStreamRelay()
+
+
+def start_feed(source=None):
+    """
+    Wire the live feed: change streams when requested/available, otherwise events
+    recorded by this process are published directly (single-worker deployments only).
+    Returns the source in use.
+    """
+    source = (source or Config.REALTIME_SOURCE).lower()
+    if source in ("changestream", "auto") and change_stream_relay.start():
+        remove_event_listener(publish_events)
+        return "changestream"
+    if source == "changestream":
+        print("⚠️ REALTIME_SOURCE=changestream but change streams failed; falling back to in-process feed")
+    # only events recorded by this process reach its subscribers: with several
+    # workers, clients on one miss reports created on another
+    print("⚠️ Live report feed is in-process: run a single worker or use REALTIME_SOURCE=changestream")
+    add_event_listener(publish_events)
+    return "inprocess"
@@ -0,0 +1,253 @@
+# services/report_pipeline.py
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from services.detection_service import decode_image, detect_images
+from services.detection_cache import detection_cache, content_hash, perceptual_hash
+from services.cloudinary_service import delete_image, upload_asset
+from services.weather_service import fetch_weather_data, empty_weather
+from services.prediction_service import predict_trajectory, predict_trajectory_ensemble
+from config import Config
+from services.email_service import build_authority_notifications
+from models.authority_model import AuthorityModel
+from models.report_model import ReportModel
+from models.notification_model import NotificationModel
+
+# Ordered stages of report creation (also used for job progress)
+STAGES = ["detection", "upload", "weather", "prediction", "authorities", "insert", "notify"]
+
+
+class PipelineError(Exception):
+    """Raised when a stage fails in a way the client should be told about."""
+
+    def __init__(self, message, status_code=500, details=None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.details = details
+
+    def to_dict(self):
+        out = {"error": self.message}
+        if self.details:
+            out["details"] = self.details
+        return out
+
+
+# Upload, weather and authority lookup of one report run side by side here
+_stage_pool = ThreadPoolExecutor(max_workers=Config.PIPELINE_IO_WORKERS, thread_name_prefix="report-io")
+
+# Process-wide observers of stage timings: listener(stage, state, elapsed_seconds)
+STAGE_LISTENERS = []
+
+
+def add_stage_listener(listener):
+    if listener not in STAGE_LISTENERS:
+        STAGE_LISTENERS.append(listener)
+
+
+def _notify(on_stage, name, state, elapsed=None):
+    if on_stage:
+        on_stage(name, state)
+    for listener in STAGE_LISTENERS:
+        try:
+            listener(name, state, elapsed)
+        except Exception as e:
+            print("Stage listener failed:", e)
+
+
+@contextmanager
+def stage(name, on_stage=None):
+    """Mark a pipeline stage running, then done or failed with its elapsed time."""
+    _notify(on_stage, name, "running")
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        _notify(on_stage, name, "failed", time.perf_counter() - start)
+        raise
+    _notify(on_stage, name, "done", time.perf_counter() - start)
+
+
+def _run_stage(name, on_stage, fn, *args, **kwargs):
+    with stage(name, on_stage):
+        return fn(*args, **kwargs)
+
+
+def _submit_stage(name, on_stage, fn, *args, **kwargs):
+    """Run fn inside stage(name) on the I/O pool; returns its Future."""
+    return _stage_pool.submit(_run_stage, name, on_stage, fn, *args, **kwargs)
+
+
+def _remaining(started, timeout):
+    """Seconds left of a stage timeout counted from when the stages were submitted."""
+    return max(0.0, started + timeout - time.monotonic())
+
+
+def _upload_annotated(annotated_jpeg):
+    return upload_asset(io.BytesIO(annotated_jpeg))
+
+
+def _discard_late_upload(future):
+    """Done-callback for an upload the request stopped waiting for: its report will never exist."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    public_id = future.result()["public_id"]
+    try:
+        delete_image(public_id)
+        print("🔹 Deleted late upload of a timed-out report:", public_id)
+    except Exception as e:
+        print("⚠️ Could not delete orphaned upload", public_id, e)
+
+
+def detect_with_cache(image_file):
+    """
+    Detection with the result cache in front of it: exact content hash first,
+    then (optionally) perceptual hash. Returns
+    (annotated_jpeg, detected_type, confidences, cached_image_url, digest, phash);
+    annotated_jpeg is None and cached_image_url set when served from the cache.
+    """
+    data = image_file if isinstance(image_file, (bytes, bytearray)) else image_file.read()
+    digest = content_hash(data)
+    cached = detection_cache.get(digest)
+    phash = None
+
+    if cached is None:
+        image = decode_image(data)
+        if detection_cache.perceptual:
+            phash = perceptual_hash(image)
+            cached = detection_cache.get_similar(phash)
+        if cached is None:
+            annotated_jpeg, detected_type, confidences = detect_images([image])[0]
+            return annotated_jpeg, detected_type, confidences, None, digest, phash
+        # near-duplicate: remember the exact bytes too
+        detection_cache.put(digest, cached, phash)
+
+    return None, cached["type"], cached["confidences"], cached.get("image_url"), digest, phash
+
+
+def run_report_pipeline(user_id, image_file, lat, lng, on_stage=None):
+    """
+    Run every step of report creation for one uploaded image.
+    on_stage(stage, state) is called with state "running" | "done" | "failed".
+    Returns the response payload; raises PipelineError on failure.
+    """
+
+    # 1) Run ML detection (YOLO + optional debris model)
+    with stage("detection", on_stage):
+        try:
+            annotated_jpeg, detected_type, confidences, image_url, digest, phash = detect_with_cache(image_file)
+        except Exception as e:
+            print("Detection failed:", e)
+            raise PipelineError("Failed to run ML models", 500, str(e))
+
+        if detected_type == "none":
+            detection_cache.put(digest, {"type": "none", "confidences": confidences, "image_url": None}, phash)
+            raise PipelineError("No debris or oil spill detected in the image", 400)
+
+    report_type = detected_type
+
+    # 2-4) Upload (skipped on cache hit), weather and nearby authorities are
+    # independent: run them concurrently and join before prediction
+    started = time.monotonic()
+    upload_future = _submit_stage("upload", on_stage, _upload_annotated, annotated_jpeg) if image_url is None else None
+    weather_future = _submit_stage("weather", on_stage, fetch_weather_data, lat, lng)
+    authorities_future = _submit_stage(
+        "authorities", on_stage, AuthorityModel.get_nearby_authorities, lat, lng, radius_km=10
+    )
+
+    # Upload: the report needs its image, so this one is fatal
+    if upload_future is not None:
+        try:
+            image_url = upload_future.result(timeout=_remaining(started, Config.UPLOAD_STAGE_TIMEOUT_SECONDS))["secure_url"]
+        except FutureTimeout:
+            # cancel() only helps while the upload is still queued; one already running
+            # keeps its pool slot until Cloudinary answers, then its asset is deleted
+            if not upload_future.cancel():
+                upload_future.add_done_callback(_discard_late_upload)
+            raise PipelineError("Image upload timed out", 504)
+        except Exception as e:
+            print("Cloudinary upload failed:", e)
+            raise PipelineError("Failed to upload image", 500, str(e))
+        detection_cache.put(digest, {"type": report_type, "confidences": confidences, "image_url": image_url}, phash)
+    else:
+        with stage("upload", on_stage):
+            pass  # served from the detection cache
+
+    # Weather: fall back to an empty record (no drift) rather than failing the report
+    try:
+        weather = weather_future.result(timeout=_remaining(started, Config.WEATHER_STAGE_TIMEOUT_SECONDS))
+    except FutureTimeout:
+        print("⚠️ Weather lookup timed out; predicting without weather")
+        weather = empty_weather()
+    except Exception as e:
+        print("⚠️ Weather lookup failed:", e)
+        weather = empty_weather()
+
+    # Authorities: save the report even if the lookup fails (nobody is notified)
+    try:
+        nearby_authorities = authorities_future.result(timeout=_remaining(started, Config.AUTHORITY_STAGE_TIMEOUT_SECONDS))
+    except FutureTimeout:
+        print("⚠️ Authority lookup timed out; report saved without notifications")
+        nearby_authorities = []
+    except Exception as e:
+        print("⚠️ Authority lookup failed:", e)
+        nearby_authorities = []
+    notified_ids = [a["_id"] for a in nearby_authorities]
+
+    # 5) Predict debris/oil drift trajectory
+    with stage("prediction", on_stage):
+        predicted_path = predict_trajectory(
+            lat, lng, weather, report_type, steps=6, interval_minutes=30
+        )
+        # Search area from a perturbed-particle ensemble
+        predicted_area = None
+        if Config.PREDICTION_ENSEMBLE_SIZE > 0:
+            predicted_area = predict_trajectory_ensemble(
+                lat, lng, weather, report_type, steps=6, interval_minutes=30,
+                n_particles=Config.PREDICTION_ENSEMBLE_SIZE,
+            )
+
+    # 6) Save report in MongoDB, with its authority emails in the same document
+    notifications = build_authority_notifications(
+        nearby_authorities, lat, lng, report_type, image_url, predicted_path,
+    )
+    with stage("insert", on_stage):
+        try:
+            report_id = ReportModel.create_report(
+                user_id=user_id,
+                image_url=image_url,
+                report_type=report_type,
+                lat=lat,
+                lng=lng,
+                predicted_path=predicted_path,
+                predicted_area=predicted_area,
+                weather_data=weather,
+                notified_authorities=notified_ids,
+                notifications=notifications,
+                ml_output={
+                    "debris_confidence": confidences.get("debris"),
+                    "oil_confidence": confidences.get("oil"),
+                },
+            )
+        except Exception as e:
+            print("Report insert failed:", e)
+            raise PipelineError("Failed to save report", 500, str(e))
+
+    # 7) Move the emails into the outbox (sent by the dispatcher). They are already
+    # stored with the report, so a failure here only delays them to the dispatcher's next poll.
+    try:
+        with stage("notify", on_stage):
+            NotificationModel.fan_out(report_id, notifications)
+    except Exception as e:
+        print("⚠️ Notification fan-out deferred to the dispatcher:", e)
+
+    return {
+        "message": f"{report_type.replace('_',' ').title()} detected and reported successfully",
+        "report_id": str(report_id),
+        "predicted_path": predicted_path,
+        "predicted_area": predicted_area,
+        "confidences": confidences,
+        "notified_authorities_count": len(notified_ids),
+        "image_url": image_url,
+    }
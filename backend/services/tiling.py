@@ -0,0 +1,45 @@
+# services/tiling.py
+"""
+Geometry of tiled detection: overlapping windows over a large frame, and
+merging per-tile boxes back into frame coordinates. Pure functions, no models.
+"""
+from services.inference_backends import nms
+
+
+def _axis_starts(length, tile, stride):
+    if length <= tile:
+        return [0]
+    starts = list(range(0, length - tile, stride))
+    starts.append(length - tile)  # last tile flush with the edge
+    return starts
+
+
+def tile_windows(height, width, tile_size, overlap):
+    """Overlapping (x0, y0, x1, y1) windows covering the frame."""
+    stride = max(1, int(tile_size * (1 - overlap)))
+    return [
+        (x0, y0, min(x0 + tile_size, width), min(y0 + tile_size, height))
+        for y0 in _axis_starts(height, tile_size, stride)
+        for x0 in _axis_starts(width, tile_size, stride)
+    ]
+
+
+def merge_tile_detections(tile_outputs, scale, iou_threshold):
+    """
+    tile_outputs: [((x0, y0, x1, y1) window, model output dict)] on a frame resized by scale.
+    Maps every box back to the original frame and drops duplicates from overlapping
+    tiles with per-class NMS. Returns (boxes, confidences, classes), most confident first.
+    """
+    boxes, confidences, classes = [], [], []
+    for (x0, y0, _, _), output in tile_outputs:
+        for (bx1, by1, bx2, by2), conf, cls in zip(output["boxes"], output["confidences"], output["classes"]):
+            boxes.append([(bx1 + x0) / scale, (by1 + y0) / scale, (bx2 + x0) / scale, (by2 + y0) / scale])
+            confidences.append(conf)
+            classes.append(cls)
+
+    keep = []
+    for cls in set(classes):
+        idx = [i for i, c in enumerate(classes) if c == cls]
+        keep.extend(idx[i] for i in nms([boxes[i] for i in idx], [confidences[i] for i in idx], iou_threshold))
+    keep.sort(key=lambda i: -confidences[i])
+    return [boxes[i] for i in keep], [confidences[i] for i in keep], [classes[i] for i in keep]
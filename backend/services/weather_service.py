@@ -1,68 +1,156 @@
 import requests
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from config import Config
+from utils.ttl_cache import TTLCache, MongoCacheBackend
+from utils.metrics import track_external
+
+OPEN_METEO_URL = Config.OPEN_METEO_URL
+OPEN_METEO_MARINE_URL = Config.OPEN_METEO_MARINE_URL
+
+# Keep-alive connection pool shared by all weather lookups
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=2, pool_maxsize=Config.WEATHER_HTTP_POOL_SIZE)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+# Wind and marine calls are issued side by side
+_fetch_pool = ThreadPoolExecutor(max_workers=Config.WEATHER_HTTP_POOL_SIZE, thread_name_prefix="weather")
+
+# Reports from the same grid cell in the same forecast hour share one lookup
+weather_cache = TTLCache(
+    maxsize=Config.WEATHER_CACHE_SIZE,
+    ttl=Config.WEATHER_CACHE_TTL_SECONDS,
+    backend=MongoCacheBackend("weather_cache") if Config.WEATHER_CACHE_SHARED else None,
+    name="weather",
+)
+
+
+def grid_cell(lat, lng, cell_deg=None):
+    """Snap a coordinate to the centre of its weather grid cell."""
+    cell_deg = cell_deg or Config.WEATHER_CACHE_GRID_DEG
+    cell_lat = (int(lat // cell_deg) + 0.5) * cell_deg
+    cell_lng = (int(lng // cell_deg) + 0.5) * cell_deg
+    return round(cell_lat, 6), round(cell_lng, 6)
+
+
+def forecast_hour(now=None):
+    """Current forecast hour in Open-Meteo's hourly time format."""
+    return (now or datetime.utcnow()).strftime("%Y-%m-%dT%H:00")
+
+
+def _hour_index(timestamps, hour):
+    try:
+        return timestamps.index(hour)
+    except ValueError:
+        return 0
 
-OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
-OPEN_METEO_MARINE_URL = "https://marine-api.open-meteo.com/v1/marine"
 
 def fetch_weather_data(lat, lng):
     """
-    Fetch both wind and ocean current data from Open-Meteo APIs.
+    Cached wrapper around the Open-Meteo lookups, keyed on grid cell + forecast hour.
     Returns a dictionary with wind_speed, wind_direction,
-    current_speed, current_direction, and timestamp.
+    current_speed, current_direction, timestamp and an hourly series.
     """
+    cell_lat, cell_lng = grid_cell(lat, lng)
+    hour = forecast_hour()
+    key = f"{cell_lat}:{cell_lng}:{hour}"
 
-    weather = {
-        "timestamp": datetime.utcnow().isoformat(),
-        "wind_speed": None,
-        "wind_direction": None,
-        "current_speed": None,
-        "current_direction": None
+    cached = weather_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    weather = _fetch_from_api(cell_lat, cell_lng, hour)
+    # don't pin failed lookups in the cache
+    if weather["wind_speed"] is not None or weather["current_speed"] is not None:
+        weather_cache.set(key, weather)
+    return dict(weather)
+
+
+def _get_hourly(url, lat, lng, fields, hour, service="open_meteo"):
+    """Hourly series from `hour` through the next WEATHER_FORECAST_HOURS hours."""
+    end_hour = datetime.strptime(hour, "%Y-%m-%dT%H:00") + timedelta(hours=max(Config.WEATHER_FORECAST_HOURS - 1, 0))
+    params = {
+        "latitude": lat,
+        "longitude": lng,
+        "hourly": fields,
+        "start_hour": hour,
+        "end_hour": forecast_hour(end_hour),
+        "timezone": "UTC"
     }
+    with track_external(service):
+        resp = _session.get(url, params=params, timeout=Config.WEATHER_TIMEOUT_SECONDS)
+        resp.raise_for_status()
+    return resp.json().get("hourly", {})
+
 
-    # --- 1️⃣ Fetch wind data ---
+def _fetch_wind(lat, lng, hour):
+    out = {}
     try:
-        params_wind = {
-            "latitude": lat,
-            "longitude": lng,
-            "hourly": "winddirection_10m,windspeed_10m",
-            "timezone": "UTC"
-        }
-        resp_wind = requests.get(OPEN_METEO_URL, params=params_wind, timeout=10)
-        data_wind = resp_wind.json()
-        hourly = data_wind.get("hourly", {})
+        hourly = _get_hourly(OPEN_METEO_URL, lat, lng, "winddirection_10m,windspeed_10m", hour, "open_meteo_forecast")
         wind_speeds = hourly.get("windspeed_10m", [])
         wind_dirs = hourly.get("winddirection_10m", [])
         timestamps = hourly.get("time", [])
-        if wind_speeds and wind_dirs:
-            weather["wind_speed"] = wind_speeds[0]
-            weather["wind_direction"] = wind_dirs[0]
-            weather["timestamp"] = timestamps[0] if timestamps else weather["timestamp"]
+        idx = _hour_index(timestamps, hour)
+        if len(wind_speeds) > idx and len(wind_dirs) > idx:
+            out["wind_speed"] = wind_speeds[idx]
+            out["wind_direction"] = wind_dirs[idx]
+            if timestamps:
+                out["timestamp"] = timestamps[idx]
+            out["hourly"] = {
+                "time": timestamps[idx:],
+                "wind_speed": wind_speeds[idx:],
+                "wind_direction": wind_dirs[idx:],
+            }
     except Exception as e:
         print("⚠️ Wind data fetch failed:", e)
+    return out
 
-    # --- 2️⃣ Fetch ocean current data ---
+
+def _fetch_currents(lat, lng, hour):
+    out = {}
     try:
-        params_curr = {
-            "latitude": lat,
-            "longitude": lng,
-            "hourly": "current_speed,current_direction",
-            "timezone": "UTC"
-        }
-        resp_curr = requests.get(OPEN_METEO_MARINE_URL, params=params_curr, timeout=10)
-        data_curr = resp_curr.json()
-        hourly = data_curr.get("hourly", {})
+        hourly = _get_hourly(OPEN_METEO_MARINE_URL, lat, lng, "current_speed,current_direction", hour, "open_meteo_marine")
         curr_speeds = hourly.get("current_speed", [])
         curr_dirs = hourly.get("current_direction", [])
-        if curr_speeds and curr_dirs:
-            weather["current_speed"] = curr_speeds[0]
-            weather["current_direction"] = curr_dirs[0]
+        idx = _hour_index(hourly.get("time", []), hour)
+        if len(curr_speeds) > idx and len(curr_dirs) > idx:
+            out["current_speed"] = curr_speeds[idx]
+            out["current_direction"] = curr_dirs[idx]
+            out["hourly"] = {
+                "current_speed": curr_speeds[idx:],
+                "current_direction": curr_dirs[idx:],
+            }
     except Exception as e:
         print("⚠️ Ocean current data fetch failed:", e)
+    return out
+
 
-    # Add raw API results (optional)
-    weather["raw"] = {
-        "wind_api": data_wind if 'data_wind' in locals() else None,
-        "curr_api": data_curr if 'data_curr' in locals() else None
+def empty_weather():
+    """Weather record with no data (the drift model then predicts no movement)."""
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "wind_speed": None,
+        "wind_direction": None,
+        "current_speed": None,
+        "current_direction": None,
+        "hourly": {},
     }
 
+
+def _fetch_from_api(lat, lng, hour):
+    """
+    Fetch wind and ocean current data from Open-Meteo concurrently.
+    Only the fields used by the drift model are kept: the current-hour values
+    plus a short hourly series for the ensemble prediction.
+    """
+    weather = empty_weather()
+
+    wind_future = _fetch_pool.submit(_fetch_wind, lat, lng, hour)
+    curr_future = _fetch_pool.submit(_fetch_currents, lat, lng, hour)
+    for part in [wind_future.result(), curr_future.result()]:
+        weather["hourly"].update(part.pop("hourly", {}))
+        weather.update(part)
+
     return weather
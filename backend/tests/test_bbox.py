@@ -0,0 +1,14 @@
+import pytest
+
+from utils.bbox import parse_bbox
+
+
+def test_parses_west_south_east_north():
+    assert parse_bbox("72.5,18.8,73.1,19.3") == (18.8, 72.5, 19.3, 73.1)
+    assert parse_bbox("") is None
+
+
+@pytest.mark.parametrize("raw", ["0,0,0,0", "72.5,19.3,73.1,19.3", "72.5,19.3,73.1,18.8", "170,0,-170,10", "1,2,3", "a,b,c,d", "0,-91,1,0"])
+def test_rejects_malformed_or_degenerate_boxes(raw):
+    with pytest.raises(ValueError):
+        parse_bbox(raw)
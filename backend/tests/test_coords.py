@@ -0,0 +1,14 @@
+import pytest
+
+from utils.coords import parse_lat_lng
+
+
+def test_parses_numbers_and_numeric_strings():
+    assert parse_lat_lng("19.07", "72.87") == (19.07, 72.87)
+    assert parse_lat_lng(-90, 180) == (-90.0, 180.0)
+
+
+@pytest.mark.parametrize("lat,lng", [(None, 1), ("x", 1), ("nan", 1), (1, "inf"), (90.5, 0), (0, -180.01)])
+def test_rejects_what_a_2dsphere_index_refuses(lat, lng):
+    with pytest.raises(ValueError):
+        parse_lat_lng(lat, lng)
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+import pytest
+from pymongo import UpdateOne
+
+from config import Config
+from models.hotspot_model import HotspotModel
+from utils import geohash
+
+
+def test_encode_matches_the_reference_geohash():
+    assert geohash.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geohash.encode(57.64911, 10.40744, 5) == "u4pru"
+    assert (geohash.encode(90, 180), geohash.encode(-90, -180)) == ("zzzzz", "00000")
+
+
+@pytest.mark.parametrize("precision", range(1, 9))
+def test_cells_nest_and_contain_their_point(precision):
+    lat, lng = 19.0761, 72.8775
+    tile = geohash.encode(lat, lng, precision)
+    min_lat, min_lng, max_lat, max_lng = geohash.bounds(tile)
+
+    assert len(tile) == precision
+    assert geohash.encode(lat, lng, precision + 1).startswith(tile)
+    assert min_lat <= lat < max_lat and min_lng <= lng < max_lng
+    assert max_lng - min_lng == pytest.approx(geohash.cell_width(precision))
+    assert geohash.encode(*geohash.center(tile), precision) == tile
+
+
+def test_precision_grows_with_zoom():
+    precisions = [geohash.precision_for_zoom(z) for z in range(0, 22)]
+    assert precisions == sorted(precisions)
+    assert precisions[0] == 1 and max(precisions) <= 12
+    assert geohash.precision_for_zoom(30, max_precision=7) == 7
+
+
+def test_rollup_key_is_tile_day_type_status():
+    report = {
+        "location": {"lat": 19.0761, "lng": 72.8775},
+        "type": "oil_spill",
+        "created_at": datetime(2025, 3, 4, 22, 15),
+    }
+    tile = geohash.encode(19.0761, 72.8775, Config.HOTSPOT_GEOHASH_PRECISION)
+
+    rollup_id, fields = HotspotModel._rollup(report, "accepted")
+
+    assert rollup_id == f"{tile}|2025-03-04|oil_spill|accepted"
+    assert fields["day"] == datetime(2025, 3, 4)
+    assert (fields["tile"], fields["type"], fields["status"]) == (tile, "oil_spill", "accepted")
+    lat, lng = geohash.center(tile)
+    assert fields["center"] == {"lat": lat, "lng": lng}
+
+
+def test_rollup_key_defaults_type():
+    report = {"location": {"lat": 0.0, "lng": 0.0}, "created_at": datetime(2025, 1, 1)}
+    rollup_id, _ = HotspotModel._rollup(report, "pending")
+    assert rollup_id.endswith("|2025-01-01|unknown|pending")
+
+
+def test_bump_upserts_the_rollup():
+    report = {"location": {"lat": 19.0, "lng": 72.8}, "type": "debris", "created_at": datetime(2025, 1, 1)}
+    rollup_id, fields = HotspotModel._rollup(report, "pending")
+
+    assert HotspotModel._bump(report, "pending", -1) == UpdateOne(
+        {"_id": rollup_id}, {"$inc": {"count": -1}, "$setOnInsert": fields}, upsert=True,
+    )
+
+
+def test_coarser_precision_groups_by_geohash_prefix():
+    stored = Config.HOTSPOT_GEOHASH_PRECISION
+    assert HotspotModel._tile_expr(None) == "$tile"
+    assert HotspotModel._tile_expr(stored + 2) == "$tile"
+    assert HotspotModel._tile_expr(stored - 2) == {"$substrCP": ["$tile", 0, stored - 2]}
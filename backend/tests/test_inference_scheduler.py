@@ -0,0 +1,88 @@
+import threading
+import time
+
+import pytest
+
+from services.inference_scheduler import BatchInferenceScheduler
+
+
+class Recorder:
+    """predict_batch stand-in that remembers every batch it was given."""
+
+    def __init__(self, fn=lambda x: x * 10):
+        self.fn = fn
+        self.batches = []
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        return [self.fn(x) for x in items]
+
+
+def test_full_batch_runs_without_waiting_out_the_timer():
+    model = Recorder()
+    scheduler = BatchInferenceScheduler(model, max_batch_size=3, max_wait_ms=10_000, name="test-size")
+
+    started = time.monotonic()
+    futures = [scheduler.submit(n) for n in range(3)]
+
+    assert [f.result(timeout=2) for f in futures] == [0, 10, 20]
+    assert time.monotonic() - started < 2
+    assert model.batches == [[0, 1, 2]]
+
+
+def test_partial_batch_runs_when_the_wait_expires():
+    model = Recorder()
+    scheduler = BatchInferenceScheduler(model, max_batch_size=8, max_wait_ms=20, name="test-timeout")
+
+    assert scheduler.run(4, timeout=2) == 40
+    assert model.batches == [[4]]
+
+
+def test_batches_never_exceed_max_size():
+    model = Recorder()
+    scheduler = BatchInferenceScheduler(model, max_batch_size=2, max_wait_ms=50, name="test-split")
+
+    futures = [scheduler.submit(n) for n in range(5)]
+
+    assert [f.result(timeout=2) for f in futures] == [0, 10, 20, 30, 40]
+    assert all(len(b) <= 2 for b in model.batches)
+    assert sum(model.batches, []) == [0, 1, 2, 3, 4]
+
+
+def test_model_error_reaches_every_future_in_the_batch():
+    def fail(items):
+        raise ValueError("model exploded")
+
+    scheduler = BatchInferenceScheduler(fail, max_batch_size=3, max_wait_ms=10_000, name="test-error")
+    futures = [scheduler.submit(n) for n in range(3)]
+
+    for f in futures:
+        with pytest.raises(ValueError, match="model exploded"):
+            f.result(timeout=2)
+
+
+def test_wrong_output_count_fails_the_batch():
+    scheduler = BatchInferenceScheduler(lambda items: items[:1], max_batch_size=2, max_wait_ms=10_000,
+                                        name="test-count")
+    futures = [scheduler.submit(n) for n in range(2)]
+
+    for f in futures:
+        with pytest.raises(RuntimeError, match="expected 2 outputs, got 1"):
+            f.result(timeout=2)
+
+
+def test_cancelled_requests_are_skipped():
+    gate = threading.Event()
+    model = Recorder(lambda x: gate.wait(2) and x)
+    scheduler = BatchInferenceScheduler(model, max_batch_size=1, max_wait_ms=0, name="test-cancel")
+
+    first = scheduler.submit("busy")  # occupies the worker until the gate opens
+    time.sleep(0.05)
+    dropped = scheduler.submit("dropped")
+    assert dropped.cancel()
+    kept = scheduler.submit("kept")
+    gate.set()
+
+    assert kept.result(timeout=2) == "kept"
+    assert first.result(timeout=2) == "busy"
+    assert model.batches == [["busy"], ["kept"]]
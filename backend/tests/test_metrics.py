@@ -0,0 +1,32 @@
+import socket
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import pytest
+import requests
+from cloudinary.exceptions import Error as CloudinaryError, RateLimited
+
+from utils.metrics import failure_reason
+
+
+def _http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+@pytest.mark.parametrize("exc, reason", [
+    (requests.ReadTimeout(), "timeout"),
+    (requests.ConnectTimeout(), "timeout"),
+    (FutureTimeout(), "timeout"),
+    (socket.timeout(), "timeout"),
+    (requests.ConnectionError(), "connection"),
+    (ConnectionRefusedError(), "connection"),
+    (_http_error(503), "http_5xx"),
+    (_http_error(429), "http_4xx"),
+    (requests.HTTPError(), "http"),
+    (CloudinaryError("bad signature"), "cloudinary"),
+    (RateLimited("slow down"), "cloudinary"),
+    (ValueError("timed out parsing"), "error"),
+])
+def test_failure_reason_maps_exception_types(exc, reason):
+    assert failure_reason(exc) == reason
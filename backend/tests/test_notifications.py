@@ -0,0 +1,112 @@
+import socket
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+from aiosmtpd.controller import Controller
+from bson import ObjectId
+
+from config import Config
+from database.mongo import mongo
+from models.notification_model import NotificationModel
+from services.email_service import send_batch
+from services.notification_dispatcher import NotificationDispatcher
+
+
+class Inbox:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = mongomock.MongoClient().oceanguard
+    monkeypatch.setattr(mongo, "db", database, raising=False)
+    return database
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    inbox = Inbox()
+    controller = Controller(inbox, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    monkeypatch.setattr(Config, "SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(Config, "SMTP_PORT", controller.port)
+    monkeypatch.setattr(Config, "SMTP_USERNAME", None)
+    monkeypatch.setattr(Config, "SMTP_USE_TLS", False)
+    yield inbox
+    controller.stop()
+
+
+def _messages(*emails):
+    recipients = [{"authority_id": ObjectId(), "email": e} for e in emails]
+    return NotificationModel.build_messages(recipients, "New oil spill reported nearby", "body")
+
+
+def test_send_batch_delivers_over_one_connection(smtp):
+    messages = _messages("a@example.com", "b@example.com")
+    sent, failures = send_batch(messages)
+
+    assert sent == [m["_id"] for m in messages]
+    assert failures == {}
+    assert [e.rcpt_tos for e in smtp.messages] == [["a@example.com"], ["b@example.com"]]
+
+
+def test_dispatcher_fans_out_report_messages_and_sends(db, smtp):
+    messages = _messages("a@example.com")
+    report_id = db.reports.insert_one(
+        {"status": "pending", "pending_notifications": messages, "notifications_pending": True}
+    ).inserted_id
+
+    sent, failed = NotificationDispatcher(batch_size=10).drain_once()
+
+    assert (sent, failed) == (1, 0)
+    assert len(smtp.messages) == 1
+    assert db.notification_outbox.find_one({"report_id": report_id})["status"] == "sent"
+    assert "pending_notifications" not in db.reports.find_one({"_id": report_id})
+
+
+def test_fan_out_is_idempotent(db):
+    messages = _messages("a@example.com", "b@example.com")
+    report_id = db.reports.insert_one({"pending_notifications": messages, "notifications_pending": True}).inserted_id
+
+    assert NotificationModel.fan_out(report_id, messages) == 2
+    NotificationModel.fan_out(report_id, messages)
+    assert db.notification_outbox.count_documents({}) == 2
+
+
+def test_unreachable_smtp_reschedules_with_backoff(db, monkeypatch):
+    monkeypatch.setattr(Config, "SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(Config, "SMTP_PORT", _free_port())  # nothing listening
+    NotificationModel.fan_out(ObjectId(), _messages("a@example.com"))
+
+    sent, failed = NotificationDispatcher(batch_size=10, retry_base_seconds=30).drain_once()
+
+    message = db.notification_outbox.find_one()
+    assert (sent, failed) == (0, 1)
+    assert message["status"] == "pending"
+    assert message["attempts"] == 1
+    assert message["next_attempt_at"] > datetime.utcnow() + timedelta(seconds=20)
+
+
+def test_expired_lease_counts_as_attempt(db):
+    NotificationModel.fan_out(ObjectId(), _messages("a@example.com"))
+    db.notification_outbox.update_many({}, {"$set": {
+        "status": "sending", "attempts": 4, "lease_expires_at": datetime.utcnow() - timedelta(minutes=1),
+    }})
+
+    assert NotificationModel.expire_leases(max_attempts=5, retry_base_seconds=30) == 1
+    message = db.notification_outbox.find_one()
+    assert message["status"] == "failed"
+    assert message["attempts"] == 5
+    assert NotificationModel.claim_batch(10) == []
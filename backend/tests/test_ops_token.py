@@ -0,0 +1,31 @@
+import pytest
+from flask import Flask
+
+from utils.ops_token import ops_token_required
+
+
+def _client(token):
+    app = Flask(__name__)
+    app.config["OPS_API_TOKEN"] = token
+
+    @app.route("/metrics")
+    @ops_token_required
+    def metrics():
+        return "ok"
+
+    return app.test_client()
+
+
+def test_hidden_without_a_configured_token():
+    assert _client(None).get("/metrics", headers={"Authorization": "Bearer "}).status_code == 404
+
+
+@pytest.mark.parametrize("header", [None, "Bearer wrong", "Basic s3cret", "s3cret"])
+def test_rejects_missing_or_wrong_token(header):
+    headers = {"Authorization": header} if header else {}
+    assert _client("s3cret").get("/metrics", headers=headers).status_code == 401
+
+
+def test_serves_with_the_token():
+    response = _client("s3cret").get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert (response.status_code, response.data) == (200, b"ok")
@@ -0,0 +1,28 @@
+import pytest
+from bson import ObjectId
+from datetime import datetime
+
+from utils.pagination import build_page, encode_cursor, parse_page_args
+
+
+def test_defaults_and_max_limit():
+    assert parse_page_args({}) == (20, None)
+    assert parse_page_args({"limit": "500"})[0] == 100
+
+
+@pytest.mark.parametrize("args, message", [
+    ({"limit": "abc"}, "limit must be an integer"),
+    ({"limit": "0"}, "limit must be positive"),
+    ({"cursor": "???"}, "Invalid cursor"),
+])
+def test_bad_args_give_fixed_messages(args, message):
+    with pytest.raises(ValueError, match=message):
+        parse_page_args(args)
+
+
+def test_cursor_round_trip():
+    docs = [{"_id": ObjectId(), "created_at": datetime(2024, 1, 3 - i)} for i in range(3)]
+    page, cursor = build_page(docs, 2, "created_at")
+    assert page == docs[:2]
+    assert cursor == encode_cursor(docs[1]["created_at"], docs[1]["_id"])
+    assert parse_page_args({"cursor": cursor})[1] == (docs[1]["created_at"], docs[1]["_id"])
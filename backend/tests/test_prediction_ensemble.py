@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from services.prediction_service import _ensemble_offsets, predict_trajectory, predict_trajectory_ensemble
+
+WEATHER = {"wind_speed": 8.0, "wind_direction": 270.0, "current_speed": 0.4, "current_direction": 200.0}
+
+
+def _numbers(area):
+    """The ensemble without its wall-clock etas."""
+    return (
+        [(p["lat"], p["lng"]) for p in area["median"]],
+        [{k: v for k, v in e.items() if k != "eta"} for e in area["envelope"]],
+    )
+
+
+def test_same_seed_same_ensemble():
+    a = predict_trajectory_ensemble(19.0, 72.8, WEATHER, "oil_spill", n_particles=500, seed=7)
+    b = predict_trajectory_ensemble(19.0, 72.8, WEATHER, "oil_spill", n_particles=500, seed=7)
+    c = predict_trajectory_ensemble(19.0, 72.8, WEATHER, "oil_spill", n_particles=500, seed=8)
+
+    assert _numbers(a) == _numbers(b)
+    assert _numbers(a) != _numbers(c)
+
+
+def test_output_shape():
+    area = predict_trajectory_ensemble(19.0, 72.8, WEATHER, "debris", steps=4, interval_minutes=45,
+                                       n_particles=200, percentiles=(5, 95), seed=1)
+
+    assert area["particles"] == 200
+    assert area["percentiles"] == [5, 95]
+    assert len(area["median"]) == len(area["envelope"]) == 4
+    assert set(area["median"][0]) == {"lat", "lng", "eta"}
+    assert set(area["envelope"][0]) == {"eta", "lat_min", "lat_max", "lng_min", "lng_max", "radius_km"}
+    assert [p["eta"] for p in area["median"]] == [e["eta"] for e in area["envelope"]]
+
+
+def test_envelope_brackets_the_median():
+    area = predict_trajectory_ensemble(19.0, 72.8, WEATHER, "oil_spill", n_particles=1000, seed=3)
+
+    for point, band in zip(area["median"], area["envelope"]):
+        assert band["lat_min"] <= point["lat"] <= band["lat_max"]
+        assert band["lng_min"] <= point["lng"] <= band["lng_max"]
+        assert band["radius_km"] > 0
+
+
+def test_median_follows_the_deterministic_drift():
+    current_only = {"current_speed": 0.5, "current_direction": 270.0}  # flowing east
+    path = predict_trajectory(19.0, 72.8, current_only, "debris")
+    area = predict_trajectory_ensemble(19.0, 72.8, current_only, "debris", n_particles=4000, seed=5)
+
+    for det, med in zip(path, area["median"]):
+        assert med["lng"] - 72.8 == pytest.approx(det["lng"] - 72.8, rel=0.1)
+        assert med["lat"] == pytest.approx(19.0, abs=1e-3)
+
+
+def test_calm_weather_stays_put():
+    offsets = _ensemble_offsets({}, "oil_spill", steps=3, interval_minutes=30, n_particles=50,
+                                percentiles=(10, 90), seed=0)
+
+    assert offsets["east_band"].shape == offsets["north_band"].shape == (2, 3)
+    for key in ("east_med", "north_med", "east_band", "north_band", "radius_km"):
+        assert np.all(offsets[key] == 0)
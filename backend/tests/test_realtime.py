@@ -0,0 +1,97 @@
+import mongomock
+import pytest
+from bson import ObjectId
+
+from database.mongo import mongo
+from models.report_event_model import AUTHORITY_SCOPE, ReportEventModel
+from utils.event_bus import EventBus
+from services import realtime
+from services.realtime import format_sse, publish_events, sse_stream
+
+
+def _item(n):
+    return {"id": str(n), "event": "status_changed", "data": {"report_id": "r1", "status": "accepted"}}
+
+
+def test_publish_reaches_only_addressed_subscribers():
+    bus = EventBus(queue_size=4)
+    authority = bus.subscribe("a1")
+    other = bus.subscribe("a2")
+
+    assert bus.publish(["a1"], _item(1)) == 1
+    assert authority.get(timeout=0) == _item(1)
+    assert other.get(timeout=0) is None
+
+
+def test_close_unsubscribes():
+    bus = EventBus()
+    sub = bus.subscribe("a1")
+    assert bus.subscriber_count() == 1
+    sub.close()
+    assert bus.subscriber_count() == 0
+    assert not bus.has_subscribers()
+    assert bus.publish(["a1"], _item(1)) == 0
+
+
+def test_full_queue_marks_overflow():
+    bus = EventBus(queue_size=2)
+    sub = bus.subscribe("a1")
+    for n in range(3):
+        bus.publish(["a1"], _item(n))
+    assert sub.overflowed
+
+
+def test_stream_sends_items_then_keepalive():
+    bus = EventBus()
+    sub = bus.subscribe("a1")
+    bus.publish(["a1"], _item(1))
+
+    stream = sse_stream(sub, heartbeat=0.01)
+    assert next(stream) == "retry: 3000\n\n"
+    assert next(stream) == format_sse(_item(1))
+    assert next(stream) == ": keepalive\n\n"
+    stream.close()
+    assert bus.subscriber_count() == 0
+
+
+def test_stream_ends_with_resync_after_overflow():
+    bus = EventBus(queue_size=1)
+    sub = bus.subscribe("a1")
+    bus.publish(["a1"], _item(1))
+    bus.publish(["a1"], _item(2))  # dropped
+
+    chunks = list(sse_stream(sub, heartbeat=0.01))
+    assert chunks == ["retry: 3000\n\n", "event: resync\ndata: {}\n\n"]
+    assert bus.subscriber_count() == 0
+
+
+@pytest.fixture
+def report(monkeypatch):
+    db = mongomock.MongoClient().oceanguard
+    monkeypatch.setattr(mongo, "db", db, raising=False)
+    monkeypatch.setattr(realtime, "feed_bus", EventBus())
+    a1, a2, user = ObjectId(), ObjectId(), ObjectId()
+    report_id = db.reports.insert_one(
+        {"status": "pending", "notified_authorities": [a1, a2], "assigned_authority": None, "user_id": user}
+    ).inserted_id
+    return report_id, str(a1), str(a2), str(user)
+
+
+def test_status_change_reaches_the_whole_audience(report):
+    report_id, a1, a2, user = report
+    subs = [realtime.feed_bus.subscribe(key) for key in (a1, a2, user)]
+
+    publish_events([ReportEventModel.build_event(report_id, "accepted", actor_id=a1)])
+
+    assert [s.get(timeout=0)["event"] for s in subs] == ["status_changed"] * 3
+
+
+def test_rejection_reaches_only_the_rejecting_authority(report):
+    report_id, a1, a2, user = report
+    rejecting, other, reporter = (realtime.feed_bus.subscribe(key) for key in (a1, a2, user))
+
+    publish_events([ReportEventModel.build_event(report_id, "rejected", actor_id=a1, scope=AUTHORITY_SCOPE)])
+
+    assert rejecting.get(timeout=0)["event"] == "report_rejected"
+    assert other.get(timeout=0) is None
+    assert reporter.get(timeout=0) is None
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from services.tiling import merge_tile_detections, tile_windows
+
+
+def _output(*detections):
+    return {
+        "boxes": [d[0] for d in detections],
+        "confidences": [d[1] for d in detections],
+        "classes": [d[2] for d in detections],
+    }
+
+
+@pytest.mark.parametrize("height,width", [(640, 640), (1000, 1500), (641, 1281), (3000, 4000)])
+def test_windows_cover_the_frame_within_bounds(height, width):
+    windows = tile_windows(height, width, tile_size=640, overlap=0.2)
+
+    covered = np.zeros((height, width), dtype=bool)
+    for x0, y0, x1, y1 in windows:
+        assert 0 <= x0 < x1 <= width and 0 <= y0 < y1 <= height
+        assert (x1 - x0, y1 - y0) == (min(640, width), min(640, height))
+        covered[y0:y1, x0:x1] = True
+    assert covered.all()
+
+
+def test_edge_tiles_are_flush_and_not_duplicated():
+    windows = tile_windows(641, 1281, tile_size=640, overlap=0.2)
+    xs = sorted({x0 for x0, _, _, _ in windows})
+    ys = sorted({y0 for _, y0, _, _ in windows})
+
+    assert xs == [0, 512, 641]  # stride 512, last tile ends at 1281
+    assert ys == [0, 1]
+    assert len(windows) == len(set(windows)) == 6
+
+
+def test_frame_smaller_than_a_tile_is_one_window():
+    assert tile_windows(300, 200, tile_size=640, overlap=0.2) == [(0, 0, 200, 300)]
+
+
+def test_boxes_map_back_through_offset_and_scale():
+    tile_outputs = [((512, 100, 1152, 740), _output(([10, 20, 50, 60], 0.8, 0)))]
+
+    boxes, confidences, classes = merge_tile_detections(tile_outputs, scale=0.5, iou_threshold=0.5)
+
+    assert boxes == [[1044.0, 240.0, 1124.0, 320.0]]
+    assert (confidences, classes) == ([0.8], [0])
+
+
+def test_overlap_duplicates_merge_per_class():
+    # the same slick seen by two overlapping tiles, plus a second class on the same spot
+    tile_outputs = [
+        ((0, 0, 640, 640), _output(([520, 10, 600, 90], 0.6, 0), ([520, 10, 600, 90], 0.4, 1))),
+        ((512, 0, 1152, 640), _output(([9, 11, 89, 91], 0.9, 0))),
+    ]
+
+    boxes, confidences, classes = merge_tile_detections(tile_outputs, scale=1.0, iou_threshold=0.5)
+
+    assert confidences == [0.9, 0.4]
+    assert classes == [0, 1]
+    assert boxes[0] == [521.0, 11.0, 601.0, 91.0]
+
+
+def test_no_detections():
+    assert merge_tile_detections([((0, 0, 640, 640), _output())], 1.0, 0.5) == ([], [], [])
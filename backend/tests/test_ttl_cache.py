@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import mongomock
+import pytest
+
+from database.mongo import mongo
+from utils import ttl_cache
+from utils.ttl_cache import MongoCacheBackend, TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class BrokenBackend:
+    def get(self, key):
+        raise ConnectionError("mongo down")
+
+    def set(self, key, value, ttl):
+        raise ConnectionError("mongo down")
+
+    def delete(self, key):
+        raise ConnectionError("mongo down")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ttl_cache, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = mongomock.MongoClient().oceanguard
+    monkeypatch.setattr(mongo, "db", database, raising=False)
+    return database
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set("k", "v")
+
+    clock.now += 59
+    assert cache.get("k") == "v"
+    clock.now += 2
+    assert cache.get("k") is None
+    assert cache.stats()["size"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # b is now the oldest
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_shared_tier_serves_other_workers(db, clock):
+    backend = MongoCacheBackend("test_cache")
+    writer = TTLCache(ttl=60, backend=backend)
+    reader = TTLCache(ttl=60, backend=backend)  # another process: empty local LRU
+
+    writer.set("k", {"type": "oil_spill"})
+
+    assert reader.get("k") == {"type": "oil_spill"}
+    assert reader.shared_hits == 1
+    db.test_cache.delete_many({})
+    assert reader.get("k") == {"type": "oil_spill"}  # now served locally
+    assert reader.hits == 1
+
+
+def test_expired_shared_entries_are_ignored(db):
+    backend = MongoCacheBackend("test_cache")
+    TTLCache(ttl=60, backend=backend).set("k", "v")
+    db.test_cache.update_one({"_id": "k"}, {"$set": {"expires_at": datetime.utcnow() - timedelta(seconds=1)}})
+
+    assert TTLCache(ttl=60, backend=backend).get("k") is None
+
+
+def test_invalidate_clears_both_tiers(db):
+    backend = MongoCacheBackend("test_cache")
+    cache = TTLCache(ttl=60, backend=backend)
+    cache.set("k", "v")
+    cache.invalidate("k")
+
+    assert cache.get("k") is None
+    assert db.test_cache.count_documents({}) == 0
+
+
+def test_unreachable_shared_tier_degrades_to_local(clock):
+    cache = TTLCache(ttl=60, backend=BrokenBackend())
+    cache.set("k", "v")  # local write still happens
+
+    assert cache.get("k") == "v"
+    assert cache.get("missing") is None
+    cache.invalidate("k")
+    assert cache.get("k") is None
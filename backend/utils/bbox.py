@@ -0,0 +1,19 @@
+def parse_bbox(raw):
+    """
+    ?bbox=west,south,east,north (lng/lat degrees, as map libraries emit it).
+    Returns (min_lat, min_lng, max_lat, max_lng), or None if raw is empty.
+    Raises ValueError on malformed input.
+    """
+    if not raw:
+        return None
+    try:
+        west, south, east, north = (float(v) for v in raw.split(","))
+    except ValueError:
+        raise ValueError("bbox must be west,south,east,north")
+    if not (-90 <= south <= 90 and -90 <= north <= 90 and -180 <= west <= 180 and -180 <= east <= 180):
+        raise ValueError("bbox out of range")
+    if west > east:
+        raise ValueError("bbox crossing the antimeridian is not supported")
+    if south >= north or west >= east:
+        raise ValueError("bbox must have south < north and west < east")
+    return south, west, north, east
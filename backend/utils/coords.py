@@ -0,0 +1,17 @@
+import math
+
+
+def parse_lat_lng(lat, lng):
+    """
+    (lat, lng) as floats a 2dsphere index accepts.
+    Raises ValueError if either is missing, not a number, not finite or out of range.
+    """
+    try:
+        lat, lng = float(lat), float(lng)
+    except (TypeError, ValueError):
+        raise ValueError("Latitude and Longitude must be numeric")
+    if not (math.isfinite(lat) and math.isfinite(lng)):
+        raise ValueError("Latitude and Longitude must be finite")
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise ValueError("Latitude must be within [-90, 90] and Longitude within [-180, 180]")
+    return lat, lng
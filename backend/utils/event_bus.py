@@ -0,0 +1,67 @@
+import queue
+import threading
+from collections import defaultdict
+
+
+class Subscription:
+    """Bounded per-client queue. A client that falls behind is marked overflowed and should resync."""
+
+    def __init__(self, bus, key, maxsize):
+        self.bus = bus
+        self.key = key
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def put(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout=None):
+        """Next item, or None if nothing arrived within timeout."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """In-process pub/sub keyed by recipient (e.g. an authority or user id)."""
+
+    def __init__(self, queue_size=256):
+        self.queue_size = queue_size
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, key):
+        sub = Subscription(self, str(key), self.queue_size)
+        with self._lock:
+            self._subscribers[sub.key].add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subscribers.get(sub.key)
+            if subs:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.key]
+
+    def has_subscribers(self):
+        return bool(self._subscribers)
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(s) for s in self._subscribers.values())
+
+    def publish(self, keys, item):
+        """Deliver item to every subscription of the given recipients; returns deliveries."""
+        with self._lock:
+            targets = [sub for key in keys for sub in self._subscribers.get(str(key), ())]
+        for sub in targets:
+            sub.put(item)
+        return len(targets)
@@ -0,0 +1,35 @@
+import io
+from PIL import Image
+
+GPS_IFD = 0x8825
+GPS_LATITUDE_REF, GPS_LATITUDE = 1, 2
+GPS_LONGITUDE_REF, GPS_LONGITUDE = 3, 4
+
+
+def _to_degrees(dms):
+    d, m, s = (float(x) for x in dms)
+    return d + m / 60.0 + s / 3600.0
+
+
+def gps_from_exif(data):
+    """
+    Read (lat, lng) from the EXIF GPS block of an image, or None if absent.
+    Only the header is parsed; pixel data is not decoded.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            gps = img.getexif().get_ifd(GPS_IFD)
+    except Exception:
+        return None
+    if not gps or GPS_LATITUDE not in gps or GPS_LONGITUDE not in gps:
+        return None
+    try:
+        lat = _to_degrees(gps[GPS_LATITUDE])
+        lng = _to_degrees(gps[GPS_LONGITUDE])
+    except (TypeError, ValueError, ZeroDivisionError):
+        return None
+    if gps.get(GPS_LATITUDE_REF) in ("S", b"S"):
+        lat = -lat
+    if gps.get(GPS_LONGITUDE_REF) in ("W", b"W"):
+        lng = -lng
+    return lat, lng
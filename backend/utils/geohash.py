@@ -0,0 +1,60 @@
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {c: i for i, c in enumerate(_BASE32)}
+
+
+def encode(lat, lng, precision=5):
+    """Geohash of a point (precision 5 ≈ 4.9 x 4.9 km, 4 ≈ 39 x 20 km)."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def bounds(geohash):
+    """(min_lat, min_lng, max_lat, max_lng) of a geohash cell."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for c in geohash:
+        value = _DECODE[c]
+        for shift in range(4, -1, -1):
+            rng = lng_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (value >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return lat_range[0], lng_range[0], lat_range[1], lng_range[1]
+
+
+def center(geohash):
+    """(lat, lng) at the middle of a geohash cell."""
+    min_lat, min_lng, max_lat, max_lng = bounds(geohash)
+    return (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+
+
+def cell_width(precision):
+    """Longitude span (degrees) of a geohash cell."""
+    return 360.0 / 2 ** ((5 * precision + 1) // 2)
+
+
+def precision_for_zoom(zoom, max_precision=12, cells_per_tile=4):
+    """Coarsest geohash precision giving about cells_per_tile cells across one web-map tile at zoom."""
+    target = 360.0 / 2 ** zoom / cells_per_tile
+    precision = 1
+    while precision < max_precision and cell_width(precision) > target:
+        precision += 1
+    return precision
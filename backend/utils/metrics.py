@@ -0,0 +1,95 @@
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
+import requests
+from cloudinary.exceptions import Error as CloudinaryError
+from prometheus_client import Counter, Gauge, Histogram
+
+# Latency buckets from 5 ms to 60 s (image uploads and model passes sit in the upper half)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+REQUEST_LATENCY = Histogram(
+    "oceanguard_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "endpoint", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+STAGE_LATENCY = Histogram(
+    "oceanguard_pipeline_stage_duration_seconds",
+    "Report pipeline stage latency",
+    ["stage", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+EXTERNAL_LATENCY = Histogram(
+    "oceanguard_external_call_duration_seconds",
+    "Latency of calls to external APIs",
+    ["service"],
+    buckets=LATENCY_BUCKETS,
+)
+EXTERNAL_FAILURES = Counter(
+    "oceanguard_external_call_failures_total",
+    "Failed calls to external APIs",
+    ["service", "reason"],
+)
+INFERENCE_LATENCY = Histogram(
+    "oceanguard_model_inference_seconds",
+    "Time for one batched model pass",
+    ["model"],
+    buckets=LATENCY_BUCKETS,
+)
+INFERENCE_BATCH_SIZE = Histogram(
+    "oceanguard_model_batch_size",
+    "Items per batched model pass",
+    ["model"],
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+INFERENCE_FAILURES = Counter(
+    "oceanguard_model_inference_failures_total",
+    "Batched model passes that raised",
+    ["model"],
+)
+INFERENCE_QUEUE_DEPTH = Gauge(
+    "oceanguard_inference_queue_depth",
+    "Inputs waiting for a model batch",
+    ["model"],
+)
+REALTIME_SUBSCRIBERS = Gauge(
+    "oceanguard_realtime_subscribers",
+    "Open live feed connections in this process",
+)
+
+
+def failure_reason(exc):
+    """
+    Failure class of an external call, from the exception type:
+    timeout | connection | http_4xx | http_5xx | http | cloudinary | error.
+    """
+    if isinstance(exc, (requests.Timeout, TimeoutError, FutureTimeout)):
+        return "timeout"
+    if isinstance(exc, (requests.ConnectionError, ConnectionError)):
+        return "connection"
+    if isinstance(exc, requests.HTTPError):
+        status = getattr(exc.response, "status_code", None)
+        return f"http_{status // 100}xx" if status else "http"
+    if isinstance(exc, CloudinaryError):
+        return "cloudinary"
+    return "error"
+
+
+@contextmanager
+def track_external(service):
+    """Time an external API call and count it as failed if the block raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        EXTERNAL_FAILURES.labels(service, failure_reason(e)).inc()
+        raise
+    finally:
+        EXTERNAL_LATENCY.labels(service).observe(time.perf_counter() - start)
+
+
+def observe_stage(stage, state, elapsed):
+    """Report pipeline stage listener feeding STAGE_LATENCY."""
+    if elapsed is not None:
+        STAGE_LATENCY.labels(stage, state).observe(elapsed)
@@ -0,0 +1,21 @@
+import hmac
+from functools import wraps
+from flask import current_app, jsonify, request
+
+
+def ops_token_required(fn):
+    """
+    Guard for internal endpoints (metrics, cache stats): requires
+    `Authorization: Bearer <OPS_API_TOKEN>`. Without a configured token the
+    endpoint answers 404, so nothing is exposed by default.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = current_app.config.get("OPS_API_TOKEN")
+        if not token:
+            return jsonify({"error": "Not found"}), 404
+        scheme, _, supplied = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.encode(), token.encode()):
+            return jsonify({"error": "Invalid or missing ops token"}), 401
+        return fn(*args, **kwargs)
+    return wrapper
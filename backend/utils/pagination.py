@@ -0,0 +1,63 @@
+import base64
+from datetime import datetime
+from bson import ObjectId
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def parse_page_args(args, default_limit=DEFAULT_PAGE_SIZE, max_limit=MAX_PAGE_SIZE):
+    """
+    Read ?limit= and ?cursor= from request args.
+    Returns (limit, after) where after is (datetime, ObjectId) or None.
+    Raises ValueError on malformed input.
+    """
+    raw_limit = args.get("limit")
+    try:
+        limit = default_limit if raw_limit in (None, "") else int(raw_limit)
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    limit = min(limit, max_limit)
+
+    raw_cursor = args.get("cursor")
+    after = decode_cursor(raw_cursor) if raw_cursor else None
+    return limit, after
+
+
+def encode_cursor(sort_value, doc_id):
+    raw = f"{sort_value.isoformat()}|{doc_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        sort_value, doc_id = raw.split("|", 1)
+        return datetime.fromisoformat(sort_value), ObjectId(doc_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def keyset_filter(sort_field, after):
+    """Filter for documents strictly after `after` in (sort_field desc, _id desc) order."""
+    if not after:
+        return {}
+    sort_value, doc_id = after
+    return {"$or": [
+        {sort_field: {"$lt": sort_value}},
+        {sort_field: sort_value, "_id": {"$lt": doc_id}},
+    ]}
+
+
+def build_page(docs, limit, sort_field):
+    """
+    docs were fetched with limit + 1; trim to limit and derive the next cursor.
+    Returns (page_docs, next_cursor or None).
+    """
+    if len(docs) <= limit:
+        return docs, None
+    page = docs[:limit]
+    last = page[-1]
+    return page, encode_cursor(last[sort_field], last["_id"])
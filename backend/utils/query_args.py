@@ -0,0 +1,3 @@
+def csv_list(value):
+    """?type=oil_spill,debris -> ["oil_spill", "debris"]; None when empty."""
+    return [v.strip() for v in value.split(",") if v.strip()] if value else None
@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+
+class MongoCacheBackend:
+    """
+    Shared cache tier in a Mongo collection so every worker process can reuse entries.
+    Expired documents are removed by a TTL index on expires_at.
+    """
+
+    def __init__(self, collection_name):
+        self.collection_name = collection_name
+        self._index_ready = False
+
+    def _collection(self):
+        from database.mongo import mongo
+        col = mongo.db[self.collection_name]
+        if not self._index_ready:
+            col.create_index("expires_at", expireAfterSeconds=0)
+            self._index_ready = True
+        return col
+
+    def get(self, key):
+        doc = self._collection().find_one({"_id": key, "expires_at": {"$gt": datetime.utcnow()}})
+        return doc["value"] if doc else None
+
+    def set(self, key, value, ttl):
+        self._collection().replace_one(
+            {"_id": key},
+            {"_id": key, "value": value, "expires_at": datetime.utcnow() + timedelta(seconds=ttl)},
+            upsert=True,
+        )
+
+    def delete(self, key):
+        self._collection().delete_one({"_id": key})
+
+
+class TTLCache:
+    """
+    Thread-safe in-process LRU cache with per-entry TTL and an optional shared backend.
+    Lookups try the local LRU first, then the backend (re-populating the LRU on a hit).
+    """
+
+    def __init__(self, maxsize=1024, ttl=600, backend=None, name="cache"):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.backend = backend
+        self.name = name
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+
+        if self.backend is not None:
+            try:
+                value = self.backend.get(key)
+            except Exception as e:
+                print(f"⚠️ {self.name} shared cache read failed:", e)
+                value = None
+            if value is not None:
+                self._store(key, value)
+                with self._lock:
+                    self.shared_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value):
+        self._store(key, value)
+        if self.backend is not None:
+            try:
+                self.backend.set(key, value, self.ttl)
+            except Exception as e:
+                print(f"⚠️ {self.name} shared cache write failed:", e)
+
+    def _store(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+        if self.backend is not None:
+            try:
+                self.backend.delete(key)
+            except Exception as e:
+                print(f"⚠️ {self.name} shared cache delete failed:", e)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+            }
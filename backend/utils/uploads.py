@@ -0,0 +1,48 @@
+import tempfile
+from flask import Request
+from config import Config
+
+# Leading bytes of the accepted upload formats
+IMAGE_SIGNATURES = [
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"BM", "bmp"),
+    (b"II*\x00", "tiff"),
+    (b"MM\x00*", "tiff"),
+]
+ZIP_SIGNATURES = (b"PK\x03\x04", b"PK\x05\x06")
+
+
+def sniff_kind(stream):
+    """'jpeg' | 'png' | 'webp' | 'bmp' | 'tiff' | 'zip' | None from the first bytes; the stream is rewound."""
+    position = stream.tell()
+    head = stream.read(16)
+    stream.seek(position)
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head.startswith(ZIP_SIGNATURES):
+        return "zip"
+    for signature, kind in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return kind
+    return None
+
+
+def invalid_upload_fields(files, archive_fields=("archive",)):
+    """Names of uploaded file fields whose content is not an accepted image (or zip, for archive fields)."""
+    invalid = []
+    for field, file in files.items(multi=True):
+        kind = sniff_kind(file.stream)
+        allowed = kind == "zip" if field in archive_fields else kind not in (None, "zip")
+        if not allowed:
+            invalid.append(field)
+    return invalid
+
+
+class SpooledUploadRequest(Request):
+    """File parts larger than UPLOAD_SPOOL_MEMORY_BYTES spill to UPLOAD_SPOOL_DIR instead of staying in memory."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(
+            max_size=Config.UPLOAD_SPOOL_MEMORY_BYTES, mode="rb+", dir=Config.UPLOAD_SPOOL_DIR,
+        )